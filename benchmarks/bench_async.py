@@ -0,0 +1,54 @@
+"""Compare the sync and asyncio clients fetching many repositories.
+
+Usage: python benchmarks/bench_async.py [--repos 200] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import time
+
+from fake_github import FakeGitHubServer
+from github_metrics_api import GitHubMetricsAPI
+from github_metrics_api.async_api import AsyncGitHubMetricsAPI
+
+
+def bench_sync(base_url, repos):
+    api = GitHubMetricsAPI(access_token=None, base_url=base_url)
+    for owner, repo in repos:
+        api.get_repo_stats(owner, repo)
+
+
+async def bench_async(base_url, repos, concurrency):
+    async with AsyncGitHubMetricsAPI(
+        access_token=None, base_url=base_url, max_concurrency=concurrency
+    ) as api:
+        await asyncio.gather(
+            *(api.get_repo_stats(owner, repo) for owner, repo in repos)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    repos = [("bench", f"repo{i}") for i in range(args.repos)]
+    with FakeGitHubServer(latency=args.latency) as server:
+        start = time.perf_counter()
+        bench_sync(server.url, repos)
+        sync_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        asyncio.run(bench_async(server.url, repos, args.concurrency))
+        async_elapsed = time.perf_counter() - start
+
+    print(f"repos: {args.repos}, latency: {args.latency * 1000:.0f} ms")
+    print(f"sync:  {sync_elapsed:.2f}s ({args.repos / sync_elapsed:.0f} req/s)")
+    print(f"async: {async_elapsed:.2f}s ({args.repos / async_elapsed:.0f} req/s)")
+    print(f"speedup: {sync_elapsed / async_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
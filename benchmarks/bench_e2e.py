@@ -0,0 +1,280 @@
+"""End-to-end benchmarks of the client, formatters and CLI against a fake GitHub.
+
+Every scenario runs in a fresh subprocess against its own local fake server
+(see fake_github.py), so its peak RSS is its own. For each scenario the
+report records operations and HTTP requests per second, p50/p99 latency,
+the response bytes decoded, the HTTP statuses served and the peak RSS. The
+report is written as JSON to compare releases.
+
+Usage: python benchmarks/bench_e2e.py [--iterations 200] [--latency 0.002]
+       [--items 500] [--workers 10] [--scenario NAME ...] [--output FILE]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from fake_github import FakeGitHubServer, load_fixtures, synthetic_payload
+from github_metrics_api import (
+    GitHubMetricsAPI,
+    RateLimiter,
+    ResponseCache,
+    ValidatorStore,
+    __version__,
+)
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def _repos(count):
+    return [("bench", f"repo{i}") for i in range(count)]
+
+
+def get_repo(server, args, **options):
+    api = GitHubMetricsAPI(access_token=None, base_url=server.url, **options)
+    return [_timed(api.get_repo, "bench", "hello") for _ in range(args.iterations)]
+
+
+def get_repo_conditional(server, args):
+    """Repeat requests are revalidated and answered with 304."""
+    return get_repo(server, args, validator_store=ValidatorStore())
+
+
+def get_repo_cached(server, args):
+    return get_repo(server, args, cache=ResponseCache())
+
+
+def get_repo_rate_limited(server, args):
+    """Requests are paced by a RateLimiter reading X-RateLimit-* headers."""
+    return get_repo(server, args, rate_limiter=RateLimiter())
+
+
+def list_issues(server, args, stream=False):
+    """Page through ``--items`` issues, 100 per page."""
+    api = GitHubMetricsAPI(access_token=None, base_url=server.url)
+
+    def fetch():
+        for _ in api.iter_repo_issues("bench", "hello", stream=stream):
+            pass
+
+    return [_timed(fetch) for _ in range(max(args.iterations // 10, 1))]
+
+
+def list_issues_streamed(server, args):
+    return list_issues(server, args, stream=True)
+
+
+def fetch_many(server, args):
+    """get_repo_stats for ``--iterations`` repositories over ``--workers``."""
+    api = GitHubMetricsAPI(
+        access_token=None, base_url=server.url, pool_size=args.workers
+    )
+    latencies = []
+
+    def timed_stats(owner, repo):
+        start = time.perf_counter()
+        try:
+            return api.get_repo_stats(owner, repo)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    api.timed_stats = timed_stats
+    calls = [("timed_stats", pair) for pair in _repos(args.iterations)]
+    for result in api.fetch_many(calls, args.workers):
+        if result.error is not None:
+            raise result.error
+    return latencies
+
+
+def warm_stats(server, args):
+    """Poll statistics answered with 202 once; latency is time to each result."""
+    api = GitHubMetricsAPI(
+        access_token=None, base_url=server.url, pool_size=args.workers
+    )
+    repos = _repos(max(args.iterations // 5, 1))
+    start = time.perf_counter()
+    latencies = []
+    for result in api.warm_stats(repos, max_workers=args.workers, initial_delay=0.01):
+        if result.error is not None:
+            raise result.error
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def format_issues(server, args):
+    """Format ``--items`` issues; makes no requests."""
+    from github_metrics_api.formatters import format_repo_issues
+
+    issues = synthetic_payload("/repos/bench/hello/issues", args.items)
+    return [_timed(format_repo_issues, issues) for _ in range(args.iterations)]
+
+
+def cli_issues(server, args):
+    """Run ``github-metrics repo ... issues`` in process, output discarded.
+
+    Interpreter start-up is measured separately by bench_startup.py.
+    """
+    from github_metrics_api import cli
+
+    GitHubMetricsAPI.BASE_URL = server.url
+    argv = ["github-metrics", "--token", "bench", "repo", "bench", "hello", "issues"]
+    latencies = []
+    for _ in range(max(args.iterations // 10, 1)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            sys.argv = argv
+            latencies.append(_timed(cli.main))
+    return latencies
+
+
+SCENARIOS = {
+    "get_repo": get_repo,
+    "get_repo_conditional": get_repo_conditional,
+    "get_repo_cached": get_repo_cached,
+    "get_repo_rate_limited": get_repo_rate_limited,
+    "list_issues": list_issues,
+    "list_issues_streamed": list_issues_streamed,
+    "fetch_many": fetch_many,
+    "warm_stats": warm_stats,
+    "format_issues": format_issues,
+    "cli_issues": cli_issues,
+}
+
+
+def _percentile(values, q):
+    """Nearest-rank percentile of sorted ``values``."""
+    if not values:
+        return None
+    index = max(int(round(q / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_scenario(name, args):
+    """Run one scenario in this process and return its measurements."""
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else None
+    accepted = 1 if name == "warm_stats" else 0
+    with FakeGitHubServer(
+        latency=args.latency, fixtures=fixtures, items=args.items, accepted=accepted
+    ) as server:
+        start = time.perf_counter()
+        latencies = SCENARIOS[name](server, args)
+        elapsed = time.perf_counter() - start
+        counters = server.counters()
+    latencies.sort()
+    ms = [latency * 1000 for latency in latencies]
+    return {
+        "name": name,
+        "operations": len(latencies),
+        "seconds": round(elapsed, 4),
+        "operations_per_second": round(len(latencies) / elapsed, 1),
+        "requests": counters["requests"],
+        "requests_per_second": round(counters["requests"] / elapsed, 1),
+        "statuses": {str(k): v for k, v in sorted(counters["statuses"].items())},
+        "latency_ms": {
+            "p50": round(_percentile(ms, 50), 3),
+            "p99": round(_percentile(ms, 99), 3),
+            "max": round(ms[-1], 3),
+            "mean": round(sum(ms) / len(ms), 3),
+        },
+        "bytes": counters["bytes"],
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--fixtures", help="Directory of recorded responses")
+    parser.add_argument(
+        "--scenario",
+        nargs="+",
+        choices=sorted(SCENARIOS),
+        default=list(SCENARIOS),
+        help="Scenarios to run (default: all)",
+    )
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--run-scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        json.dump(run_scenario(args.run_scenario, args), sys.stdout)
+        return
+
+    config = {
+        "iterations": args.iterations,
+        "latency": args.latency,
+        "items": args.items,
+        "workers": args.workers,
+        "fixtures": args.fixtures,
+    }
+    results = []
+    for name in args.scenario:
+        command = [sys.executable, __file__, "--run-scenario", name]
+        for option, value in config.items():
+            if value is not None:
+                command += [f"--{option}", str(value)]
+        output = subprocess.run(command, capture_output=True, text=True, check=True)
+        result = json.loads(output.stdout)
+        results.append(result)
+        print(
+            f"{name:24} {result['requests_per_second']:9.1f} req/s"
+            f"  p50 {result['latency_ms']['p50']:8.3f} ms"
+            f"  p99 {result['latency_ms']['p99']:8.3f} ms"
+            f"  {result['bytes']:>10} B  {result['peak_rss_kb']} KB",
+            file=sys.stderr,
+        )
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "version": __version__,
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Compare string-concatenating formatters with the streaming ones.
+
+Usage: python benchmarks/bench_formatters.py [--issues 10000] [--weeks 520]
+       [--dates 100000]
+
+Each case is rendered three ways: with the former ``formatted += ...``
+implementation, with ``format_*`` (one ``"".join``) and with
+``write_formatted(iter_format_*(...))`` into a discarding stream. Time and
+peak traced memory are reported for each. Timestamp conversion is timed
+separately against plain ``strptime``/``strftime``.
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+from github_metrics_api.formatters import (
+    format_contributor_stats,
+    format_date,
+    format_dates,
+    format_punch_card,
+    format_repo_issues,
+    iter_format_contributor_stats,
+    iter_format_punch_card,
+    iter_format_repo_issues,
+    write_formatted,
+)
+
+
+def legacy_repo_issues(issues):
+    formatted = "Repository Issues:\n"
+    for issue in issues:
+        formatted += f"""- #{issue['number']}: {issue['title']}
+  State: {issue['state']}
+  Created: {format_date(issue['created_at'])}
+  Comments: {issue['comments']}
+  
+"""
+    return formatted
+
+
+def legacy_contributor_stats(stats):
+    formatted = "Contributor Statistics:\n"
+    for contributor in stats:
+        formatted += f"Username: {contributor['author']['login']}\n"
+        formatted += f"  Total Commits: {contributor['total']}\n"
+        formatted += "  Weekly Commits:\n"
+        for week in contributor["weeks"][-4:]:
+            date = datetime.fromtimestamp(week["w"]).strftime("%Y-%m-%d")
+            formatted += f"    Week of {date}: {week['c']} commits\n"
+        formatted += "\n"
+    return formatted
+
+
+def legacy_punch_card(punch_card):
+    days = [
+        "Sunday",
+        "Monday",
+        "Tuesday",
+        "Wednesday",
+        "Thursday",
+        "Friday",
+        "Saturday",
+    ]
+    formatted = "Commit Punch Card:\n"
+    for day, hour, count in punch_card:
+        formatted += f"{days[day]} {hour:02d}:00 - {hour:02d}:59: {count} commits\n"
+    return formatted
+
+
+def make_issues(count):
+    return [
+        {
+            "number": number,
+            "title": f"Issue number {number} with a reasonably long title",
+            "state": "open" if number % 3 else "closed",
+            "created_at": "2023-04-05T06:07:08Z",
+            "comments": number % 17,
+        }
+        for number in range(count)
+    ]
+
+
+def make_contributor_stats(count, weeks):
+    return [
+        {
+            "author": {"login": f"user{index}"},
+            "total": weeks * 3,
+            "weeks": [
+                {"w": 1_600_000_000 + week * 604_800, "c": 3} for week in range(weeks)
+            ],
+        }
+        for index in range(count)
+    ]
+
+
+def legacy_format_date(date_string):
+    return datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%SZ").strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+
+
+def make_timestamps(count):
+    # Roughly one distinct timestamp in four, as in listings where many items
+    # share creation and update times.
+    return [
+        datetime.fromtimestamp(1_600_000_000 + (index // 4) * 3_607).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+        for index in range(count)
+    ]
+
+
+def bench_dates(count):
+    timestamps = make_timestamps(count)
+    assert format_dates(timestamps) == [legacy_format_date(t) for t in timestamps]
+    print(f"timestamps ({count})")
+
+    def uncached():
+        for timestamp in timestamps:
+            format_date.__wrapped__(timestamp)
+
+    def cached():
+        format_date.cache_clear()
+        for timestamp in timestamps:
+            format_date(timestamp)
+
+    def batch():
+        format_date.cache_clear()
+        format_dates(timestamps)
+
+    for label, render in (
+        ("strptime", lambda: [legacy_format_date(t) for t in timestamps]),
+        ("fast path", uncached),
+        ("fast path + memo", cached),
+        ("format_dates", batch),
+    ):
+        start = time.perf_counter()
+        render()
+        print(f"  {label:18} {time.perf_counter() - start:7.3f}s")
+
+
+def measure(render):
+    tracemalloc.start()
+    start = time.perf_counter()
+    render()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--contributors", type=int, default=2000)
+    parser.add_argument("--weeks", type=int, default=520)
+    parser.add_argument("--punch-cards", type=int, default=200)
+    parser.add_argument("--dates", type=int, default=100000)
+    args = parser.parse_args()
+
+    cases = [
+        (
+            f"repo issues ({args.issues})",
+            make_issues(args.issues),
+            legacy_repo_issues,
+            format_repo_issues,
+            iter_format_repo_issues,
+        ),
+        (
+            f"contributor stats ({args.contributors} x {args.weeks} weeks)",
+            make_contributor_stats(args.contributors, args.weeks),
+            legacy_contributor_stats,
+            format_contributor_stats,
+            iter_format_contributor_stats,
+        ),
+        (
+            f"punch card ({args.punch_cards} x 168)",
+            [[day, hour, day * hour] for day in range(7) for hour in range(24)]
+            * args.punch_cards,
+            legacy_punch_card,
+            format_punch_card,
+            iter_format_punch_card,
+        ),
+    ]
+
+    with open(os.devnull, "w") as sink:
+        for name, data, legacy, joined, streamed in cases:
+            assert legacy(data) == joined(data)
+            print(name)
+            for label, render in (
+                ("+= concatenation", lambda: sink.write(legacy(data))),
+                ("format_* join", lambda: sink.write(joined(data))),
+                ("streamed", lambda: write_formatted(streamed(data), sink)),
+            ):
+                elapsed, peak = measure(render)
+                print(f"  {label:18} {elapsed:7.3f}s  peak {peak / 1024:10.1f} KiB")
+
+    bench_dates(args.dates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Compare the memory held by decoded repository dicts and Repo records.
+
+Usage: python benchmarks/bench_records.py [--repos 20000]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from github_metrics_api.records import Repo
+
+URL_FIELDS = (
+    "archive_url assignees_url blobs_url branches_url collaborators_url "
+    "comments_url commits_url compare_url contents_url contributors_url "
+    "deployments_url downloads_url events_url forks_url git_commits_url "
+    "git_refs_url git_tags_url git_url hooks_url html_url issue_comment_url "
+    "issue_events_url issues_url keys_url labels_url languages_url merges_url "
+    "milestones_url notifications_url pulls_url releases_url ssh_url "
+    "stargazers_url statuses_url subscribers_url subscription_url tags_url "
+    "teams_url trees_url clone_url mirror_url svn_url url"
+).split()
+
+OWNER_URL_FIELDS = (
+    "avatar_url events_url followers_url following_url gists_url html_url "
+    "organizations_url received_events_url repos_url starred_url "
+    "subscriptions_url url"
+).split()
+
+
+def make_payload(index):
+    """Return the JSON text of a repository as listed by /orgs/{org}/repos."""
+    owner = {"login": "bench", "id": 1, "node_id": "MDQ6VXNlcjE=", "type": "User"}
+    owner.update(
+        {
+            name: f"https://api.github.com/users/bench/{name}"
+            for name in OWNER_URL_FIELDS
+        }
+    )
+    repo = {
+        "id": index,
+        "node_id": f"MDEwOlJlcG9zaXRvcnk{index}",
+        "name": f"repo{index}",
+        "full_name": f"bench/repo{index}",
+        "private": False,
+        "owner": owner,
+        "description": f"Repository number {index}",
+        "fork": False,
+        "homepage": None,
+        "size": index * 10,
+        "stargazers_count": index % 1000,
+        "watchers_count": index % 1000,
+        "subscribers_count": index % 50,
+        "language": "Python",
+        "forks_count": index % 100,
+        "open_issues_count": index % 30,
+        "archived": False,
+        "default_branch": "main",
+        "topics": ["benchmark", "github"],
+        "permissions": {"admin": False, "push": False, "pull": True},
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": "2023-01-01T00:00:00Z",
+        "pushed_at": "2023-01-02T00:00:00Z",
+    }
+    repo.update(
+        {
+            name: f"https://api.github.com/repos/bench/repo{index}/{name}"
+            for name in URL_FIELDS
+        }
+    )
+    return json.dumps(repo)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return kept, held, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=20000)
+    args = parser.parse_args()
+
+    payloads = [make_payload(index) for index in range(args.repos)]
+    cases = (
+        ("dicts", lambda: [json.loads(payload) for payload in payloads]),
+        (
+            "records",
+            lambda: [Repo.from_dict(json.loads(payload)) for payload in payloads],
+        ),
+        (
+            "records (4 fields)",
+            lambda: [
+                Repo.from_dict(
+                    json.loads(payload),
+                    fields=["name", "stargazers_count", "forks_count", "language"],
+                )
+                for payload in payloads
+            ],
+        ),
+    )
+
+    print(f"{args.repos} repositories")
+    baseline = None
+    for label, build in cases:
+        kept, held, elapsed = measure(build)
+        baseline = baseline or held
+        start = time.perf_counter()
+        total = sum(repo["stargazers_count"] for repo in kept)
+        access = time.perf_counter() - start
+        print(
+            f"  {label:20} {held / 2**20:8.1f} MiB ({baseline / held:4.1f}x less)"
+            f"  build {elapsed:6.3f}s  sum {access * 1000:6.2f}ms ({total})"
+        )
+        del kept
+
+
+if __name__ == "__main__":
+    main()
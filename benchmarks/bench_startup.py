@@ -0,0 +1,77 @@
+"""Measure the start-up cost of the command-line interface.
+
+Runs ``python -X importtime`` on ``github_metrics_api.cli`` several times and
+reports the median import time, the slowest imported modules and the wall
+time of ``github-metrics --help``. Exits with status 1 if the median import
+time exceeds the budget, so regressions can be caught in CI.
+
+Usage: python benchmarks/bench_startup.py [--runs 10] [--budget-ms 50]
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+MODULE = "github_metrics_api.cli"
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_times(module):
+    """Return ``{module: (self_us, cumulative_us)}`` for one fresh import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for match in LINE.finditer(result.stderr):
+        times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+
+def help_seconds():
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", MODULE, "--help"],
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=50.0,
+        help="Largest acceptable median import time (default: 50)",
+    )
+    args = parser.parse_args()
+
+    runs = [import_times(MODULE) for _ in range(args.runs)]
+    median_ms = statistics.median(run[MODULE][1] for run in runs) / 1000
+    help_ms = statistics.median(help_seconds() for _ in range(args.runs)) * 1000
+
+    print(f"import {MODULE}: {median_ms:.1f} ms (median of {args.runs})")
+    print(f"github-metrics --help: {help_ms:.1f} ms wall time")
+    print("slowest modules (self time):")
+    slowest = sorted(runs[-1].items(), key=lambda item: -item[1][0])[:10]
+    for module, (self_us, _) in slowest:
+        print(f"  {self_us / 1000:7.2f} ms  {module}")
+    heavy = [name for name in ("requests", "aiohttp", "dotenv") if name in runs[-1]]
+    if heavy:
+        print(f"imported at start-up: {', '.join(heavy)}")
+
+    if median_ms > args.budget_ms:
+        print(f"over budget: {median_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
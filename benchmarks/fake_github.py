@@ -0,0 +1,366 @@
+"""A local stand-in for the GitHub REST API, used by the benchmarks.
+
+Responses come from fixtures: synthetic payloads generated for the common
+endpoints, optionally overridden by recorded responses (see
+:func:`load_fixtures`). The server behaves like GitHub where it matters to
+the client: list endpoints are paginated with ``per_page``/``page`` and
+``Link`` headers, every 200 carries an ``ETag`` and ``If-None-Match`` is
+answered with 304, ``/stats/*`` endpoints answer 202 while "computing", and
+every response carries ``X-RateLimit-*`` headers (403 once exhausted).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+WEEK = 7 * 24 * 3600
+FIRST_WEEK = 1577577600  # 2019-12-29, a Sunday
+
+
+def user_payload(login):
+    return {
+        "login": login,
+        "id": sum(map(ord, login)),
+        "type": "User",
+        "name": login.title(),
+        "company": None,
+        "blog": "",
+        "location": None,
+        "email": None,
+        "bio": None,
+        "public_repos": 10,
+        "followers": 100,
+        "following": 1,
+        "created_at": "2015-01-01T00:00:00Z",
+    }
+
+
+def repo_payload(owner, repo):
+    return {
+        "id": sum(map(ord, f"{owner}/{repo}")),
+        "name": repo,
+        "full_name": f"{owner}/{repo}",
+        "owner": {"login": owner},
+        "html_url": f"https://github.com/{owner}/{repo}",
+        "description": f"Synthetic repository {owner}/{repo}",
+        "stargazers_count": 1000,
+        "forks_count": 100,
+        "open_issues_count": 10,
+        "watchers_count": 1000,
+        "subscribers_count": 50,
+        "language": "Python",
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "pushed_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def _timestamp(index):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(FIRST_WEEK + index * 3600))
+
+
+def issue_payload(owner, repo, number, pull=False):
+    issue = {
+        "id": number,
+        "number": number,
+        "title": f"Synthetic {'pull request' if pull else 'issue'} #{number}",
+        "state": "open" if number % 3 else "closed",
+        "user": {"login": f"user{number % 17}"},
+        "labels": [{"name": "bug"}] if number % 5 == 0 else [],
+        "comments": number % 7,
+        "body": "Lorem ipsum dolor sit amet. " * 8,
+        "created_at": _timestamp(number),
+        "updated_at": _timestamp(number + 1),
+        "closed_at": None if number % 3 else _timestamp(number + 2),
+        "html_url": f"https://github.com/{owner}/{repo}/issues/{number}",
+    }
+    if pull:
+        issue["head"] = {"ref": f"feature-{number}"}
+        issue["base"] = {"ref": "main"}
+    return issue
+
+
+def commit_payload(owner, repo, index):
+    sha = hashlib.sha1(f"{owner}/{repo}/{index}".encode()).hexdigest()
+    author = {"name": f"User {index % 17}", "email": f"user{index % 17}@example.com"}
+    return {
+        "sha": sha,
+        "commit": {
+            "message": f"Synthetic commit {index}",
+            "author": dict(author, date=_timestamp(-index)),
+            "committer": dict(author, date=_timestamp(-index)),
+        },
+        "author": {"login": f"user{index % 17}"},
+        "html_url": f"https://github.com/{owner}/{repo}/commit/{sha}",
+    }
+
+
+def stats_payload(name, items):
+    weeks = [FIRST_WEEK + i * WEEK for i in range(52)]
+    if name == "commit_activity":
+        days = [[(w + d) % 5 for d in range(7)] for w in range(52)]
+        return [
+            {"days": days[w], "total": sum(days[w]), "week": week}
+            for w, week in enumerate(weeks)
+        ]
+    if name == "code_frequency":
+        return [[week, 100 + w, -(50 + w)] for w, week in enumerate(weeks)]
+    if name == "participation":
+        return {"all": [w % 9 for w in range(52)], "owner": [w % 3 for w in range(52)]}
+    if name == "punch_card":
+        return [[d, h, (d * h) % 11] for d in range(7) for h in range(24)]
+    if name == "contributors":
+        return [
+            {
+                "author": {"login": f"user{i}"},
+                "total": 52 * (i + 1),
+                "weeks": [
+                    {"w": week, "a": 10 * i, "d": i, "c": i + 1} for week in weeks
+                ],
+            }
+            for i in range(min(items, 100))
+        ]
+    return None
+
+
+def synthetic_payload(path, items):
+    """Return the payload for an API ``path`` (without query), or None."""
+    parts = path.strip("/").split("/")
+    if parts[0] == "repos" and len(parts) >= 3:
+        owner, repo, rest = parts[1], parts[2], parts[3:]
+        if not rest:
+            return repo_payload(owner, repo)
+        if rest == ["issues"]:
+            return [issue_payload(owner, repo, n) for n in range(1, items + 1)]
+        if rest == ["pulls"]:
+            return [issue_payload(owner, repo, n, True) for n in range(1, items + 1)]
+        if rest == ["commits"]:
+            return [commit_payload(owner, repo, i) for i in range(items)]
+        if rest == ["contributors"]:
+            return [
+                {"login": f"user{i}", "contributions": items - i} for i in range(items)
+            ]
+        if rest == ["languages"]:
+            return {"Python": 120000, "C": 40000, "Shell": 2000}
+        if len(rest) == 2 and rest[0] == "stats":
+            return stats_payload(rest[1], items)
+    elif parts[0] == "users" and len(parts) == 2:
+        return user_payload(parts[1])
+    elif parts[0] == "users" and parts[2:] == ["repos"]:
+        return [repo_payload(parts[1], f"repo{i}") for i in range(items)]
+    elif parts[0] == "orgs" and len(parts) == 2:
+        org = user_payload(parts[1])
+        org.update(type="Organization", public_repos=items)
+        return org
+    elif parts[0] == "orgs" and parts[2:] == ["repos"]:
+        return [repo_payload(parts[1], f"repo{i}") for i in range(items)]
+    elif parts == ["search", "repositories"]:
+        repos = [repo_payload("search", f"repo{i}") for i in range(items)]
+        return {"total_count": items, "incomplete_results": False, "items": repos}
+    elif parts == ["search", "issues"]:
+        issues = [issue_payload("search", "repo", n) for n in range(1, items + 1)]
+        return {"total_count": items, "incomplete_results": False, "items": issues}
+    return None
+
+
+def load_fixtures(directory):
+    """Load recorded responses from ``directory``.
+
+    Each ``<path>.json`` file below ``directory`` is the body GitHub returned
+    for ``/<path>``, e.g. ``repos/octo/hello/issues.json`` answers
+    ``GET /repos/octo/hello/issues``.
+    """
+    fixtures = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(".json"):
+                continue
+            file_path = os.path.join(root, name)
+            path = os.path.relpath(file_path, directory)[: -len(".json")]
+            with open(file_path, encoding="utf-8") as f:
+                fixtures["/" + path.replace(os.sep, "/")] = json.load(f)
+    return fixtures
+
+
+def _resource(path):
+    return "search" if path.startswith("/search/") else "core"
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+        url = urlsplit(self.path)
+        path = "/" + url.path.strip("/")
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        resource = _resource(path)
+
+        remaining = server.take_quota(resource)
+        headers = {
+            "X-RateLimit-Limit": str(server.rate_limit),
+            "X-RateLimit-Remaining": str(max(remaining, 0)),
+            "X-RateLimit-Reset": str(server.reset_at),
+            "X-RateLimit-Resource": resource,
+        }
+        if remaining < 0:
+            message = {"message": "API rate limit exceeded"}
+            return self._send(403, json.dumps(message).encode(), headers)
+
+        payload = server.payload(path)
+        if payload is None:
+            return self._send(404, b'{"message": "Not Found"}', headers)
+        if "/stats/" in path and server.still_computing(path):
+            return self._send(202, b"{}", headers)
+
+        body, links = server.page(path, payload, query, self.headers.get("Host"))
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        headers["ETag"] = etag
+        if links:
+            headers["Link"] = links
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", headers)
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record(status, len(body))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, fixtures, items, accepted, rate_limit):
+        super().__init__(address, FakeGitHubHandler)
+        self.latency = 0.0
+        self.fixtures = dict(fixtures or {})
+        self.items = items
+        self.accepted = accepted
+        self.rate_limit = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self.lock = threading.Lock()
+        self.payloads = {}
+        self.bodies = {}
+        self.stats_requests = {}
+        self.quota = {}
+        self.statuses = {}
+        self.bytes_sent = 0
+
+    def payload(self, path):
+        with self.lock:
+            if path not in self.payloads:
+                payload = self.fixtures.get(path)
+                if payload is None:
+                    payload = synthetic_payload(path, self.items)
+                self.payloads[path] = payload
+            return self.payloads[path]
+
+    def page(self, path, payload, query, host):
+        """Return the encoded body for ``query`` and its ``Link`` header."""
+        items = payload.get("items") if isinstance(payload, dict) else payload
+        if "/stats/" in path or not isinstance(items, list):
+            return self._encode((path, None), payload), None
+        per_page = min(int(query.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        number = max(int(query.get("page", 1)), 1)
+        last = max((len(items) + per_page - 1) // per_page, 1)
+        start = (number - 1) * per_page
+        chunk = items[start : start + per_page]
+        if isinstance(payload, dict):
+            chunk = dict(payload, items=chunk)
+        body = self._encode((path, per_page, number), chunk)
+        links = []
+        base = f"http://{host}{path}?per_page={per_page}"
+        if number < last:
+            links.append(f'<{base}&page={number + 1}>; rel="next"')
+            links.append(f'<{base}&page={last}>; rel="last"')
+        return body, ", ".join(links) or None
+
+    def _encode(self, key, payload):
+        with self.lock:
+            if key not in self.bodies:
+                self.bodies[key] = json.dumps(payload).encode()
+            return self.bodies[key]
+
+    def still_computing(self, path):
+        """Answer the first ``accepted`` requests of a statistic with 202."""
+        with self.lock:
+            count = self.stats_requests.get(path, 0)
+            self.stats_requests[path] = count + 1
+            return count < self.accepted
+
+    def take_quota(self, resource):
+        with self.lock:
+            remaining = self.quota.get(resource, self.rate_limit) - 1
+            self.quota[resource] = remaining
+            return remaining
+
+    def record(self, status, size):
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.bytes_sent += size
+
+
+class FakeGitHubServer:
+    """Serve the fake API on a background thread of a local port.
+
+    ``latency`` delays every response by that many seconds; ``items`` is the
+    length of every synthetic list; ``accepted`` is how many requests of each
+    ``/stats/*`` endpoint are answered with 202 before its data; and
+    ``rate_limit`` is the quota of each rate-limit resource. ``fixtures``
+    maps paths to recorded payloads that replace the synthetic ones.
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        host="127.0.0.1",
+        port=0,
+        fixtures=None,
+        items=DEFAULT_PER_PAGE,
+        accepted=0,
+        rate_limit=1_000_000,
+    ):
+        self.httpd = _Server((host, port), fixtures, items, accepted, rate_limit)
+        self.httpd.latency = latency
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def counters(self):
+        """Return the requests served per status and the body bytes sent."""
+        with self.httpd.lock:
+            return {
+                "requests": sum(self.httpd.statuses.values()),
+                "statuses": dict(self.httpd.statuses),
+                "bytes": self.httpd.bytes_sent,
+            }
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -1,11 +1,65 @@
-from .api import GitHubMetricsAPI
-from .errors import GitHubAPIError, RateLimitExceededError, AuthenticationError
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562), so importing
+# the package, or the CLI, does not pull in requests and aiohttp.
+_EXPORTS = {
+    "GitHubMetricsAPI": "api",
+    "AsyncGitHubMetricsAPI": "async_api",
+    "ResponseCache": "cache",
+    "RateLimiter": "ratelimit",
+    "RetryPolicy": "retry",
+    "TokenPool": "tokens",
+    "ValidatorStore": "conditional",
+    "RequestEvent": "api",
+    "MetricsCollector": "metrics",
+    "SingleFlight": "singleflight",
+    "Repo": "records",
+    "Issue": "records",
+    "PullRequest": "records",
+    "User": "records",
+    "Commit": "records",
+    "WorkflowRun": "records",
+    "GitHubAPIError": "errors",
+    "AcceptedError": "errors",
+    "RateLimitExceededError": "errors",
+    "AuthenticationError": "errors",
+}
 
 __all__ = [
     "GitHubMetricsAPI",
+    "AsyncGitHubMetricsAPI",
+    "ResponseCache",
+    "RateLimiter",
+    "RetryPolicy",
+    "TokenPool",
+    "ValidatorStore",
+    "RequestEvent",
+    "MetricsCollector",
+    "SingleFlight",
+    "Repo",
+    "Issue",
+    "PullRequest",
+    "User",
+    "Commit",
+    "WorkflowRun",
     "GitHubAPIError",
+    "AcceptedError",
     "RateLimitExceededError",
     "AuthenticationError",
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,58 +1,535 @@
 import os
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import requests
+from requests.adapters import HTTPAdapter
+from .conditional import request_key
+from .endpoints import endpoint_template
 from .errors import (
+    AcceptedError,
     GitHubAPIError,
     RateLimitExceededError,
-    AuthenticationError,
-    NotFoundError,
-    ServerError,
+    error_for_status,
+)
+from .graphql import MAX_REPOS_PER_QUERY, repo_stats_query, repo_stats_results
+from .ratelimit import is_rate_limited, resource_for
+from .records import (
+    Commit,
+    Issue,
+    PullRequest,
+    Repo,
+    User,
+    WorkflowRun,
+    convert,
+    convert_all,
 )
+from .singleflight import SingleFlight
+from .streaming import CHUNK_SIZE, iter_json_array
+
+_MISSING = object()
+
+MAX_PER_PAGE = 100
+
+# A decoded response body together with the URL of the following page, if any.
+Page = namedtuple("Page", ["body", "next_url"])
+
+# What a request hook learns about one request: the endpoint and its route
+# ``template``, the rate-limit ``resource``, the final HTTP ``status`` (None
+# when no response was received), ``latency`` in seconds, response body
+# ``bytes``, the ``rate_limit_remaining`` reported by GitHub, the ``cache``
+# outcome ("hit", "miss", "not_modified" or None without a cache or validator
+# store) and the ``error`` raised while sending, if any.
+RequestEvent = namedtuple(
+    "RequestEvent",
+    [
+        "method",
+        "endpoint",
+        "template",
+        "resource",
+        "status",
+        "latency",
+        "bytes",
+        "rate_limit_remaining",
+        "cache",
+        "error",
+    ],
+)
+
+# Outcome of one call of a batch: ``value`` on success, ``error`` otherwise.
+BatchResult = namedtuple("BatchResult", ["index", "call", "value", "error"])
+
+# Methods backed by the computed ``/stats/*`` endpoints, which answer 202
+# while GitHub builds the statistics.
+STATS_METHODS = (
+    "get_commit_activity",
+    "get_code_frequency",
+    "get_contributor_stats",
+    "get_weekly_commits",
+    "get_punch_card",
+)
+
+
+def _next_page_url(response):
+    return response.links.get("next", {}).get("url")
+
+
+def _stream_items(response, items_key):
+    try:
+        chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+        yield from iter_json_array(chunks, key=items_key)
+    finally:
+        response.close()
+
+
+def _query(**params):
+    """Return the query parameters that are set, or None if there are none."""
+    params = {name: value for name, value in params.items() if value is not None}
+    return params or None
+
+
+def _first_page_params(params, max_items):
+    params = dict(params or {})
+    params["per_page"] = MAX_PER_PAGE
+    if max_items is not None:
+        params["per_page"] = min(MAX_PER_PAGE, max_items)
+    return params
 
 
 class GitHubMetricsAPI:
     BASE_URL = "https://api.github.com"
 
-    def __init__(self, access_token=os.environ.get("GITHUB_API_TOKEN")):
+    def __init__(
+        self,
+        access_token=os.environ.get("GITHUB_API_TOKEN"),
+        validator_store=None,
+        cache=None,
+        base_url=None,
+        pool_size=10,
+        rate_limiter=None,
+        token_pool=None,
+        retry=None,
+        hooks=None,
+        coalesce=False,
+    ):
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.pool_size = pool_size
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         if access_token:
             self.session.headers.update({"Authorization": f"token {access_token}"})
         self.session.headers.update({"Accept": "application/vnd.github.v3+json"})
+        self.validator_store = validator_store
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.token_pool = token_pool
+        self.retry = retry
+        # Callables run with a RequestEvent after every request.
+        self.hooks = list(hooks or [])
+        # Concurrent identical GETs share one request; pass a SingleFlight to
+        # share it between clients using the same credentials.
+        if coalesce is True:
+            coalesce = SingleFlight()
+        self.singleflight = coalesce or None
 
     def _make_request(self, method, endpoint, params=None, data=None):
         url = f"{self.BASE_URL}/{endpoint}"
-        response = self.session.request(method, url, params=params, json=data)
+        return self._request(method, url, endpoint, params, data).body
+
+    def _request(self, method, url, endpoint, params=None, data=None):
+        """Send a request and return the decoded body with the next page URL."""
+        if method == "GET" and self.singleflight is not None:
+            key = (self.session.headers.get("Authorization"), request_key(url, params))
+            return self.singleflight.do(
+                key, lambda: self._fetch(method, url, endpoint, params, data)
+            )
+        return self._fetch(method, url, endpoint, params, data)
+
+    def _fetch(self, method, url, endpoint, params=None, data=None):
+        kwargs = {"params": params, "json": data}
+        started = time.perf_counter()
+
+        cache_key = None
+        if method == "GET" and self.cache is not None:
+            cache_key = request_key(url, params)
+            cached = self.cache.get(cache_key, _MISSING)
+            if cached is not _MISSING:
+                if self.hooks:
+                    self._emit(method, endpoint, started, cache="hit")
+                return cached
+
+        validators = None
+        validators_enabled = method == "GET" and self.validator_store is not None
+        if validators_enabled:
+            validators = self.validator_store.lookup(url, params)
+            if validators is not None:
+                kwargs["headers"] = validators.conditional_headers()
+
+        try:
+            response = self._send(method, url, endpoint, kwargs)
+        except requests.RequestException as e:
+            if self.hooks:
+                outcome = "miss" if cache_key or validators_enabled else None
+                self._emit(method, endpoint, started, cache=outcome, error=e)
+            raise
+        if self.hooks:
+            if response.status_code == 304 and validators is not None:
+                outcome = "not_modified"
+            else:
+                outcome = "miss" if cache_key or validators_enabled else None
+            self._emit(
+                method,
+                endpoint,
+                started,
+                response,
+                len(response.content),
+                outcome,
+            )
+
+        if response.status_code == 304 and validators is not None:
+            page = self.validator_store.not_modified(validators)
+            size = validators.size
+        else:
+            page = Page(self._handle_response(response), _next_page_url(response))
+            size = 0
+            if page.body is not None and (cache_key is not None or validators_enabled):
+                size = len(response.content)
+            if validators_enabled:
+                self.validator_store.store(
+                    url,
+                    params,
+                    response.headers,
+                    page,
+                    size=size,
+                    revalidated=validators is not None,
+                )
+
+        if cache_key is not None:
+            self.cache.set(cache_key, page, endpoint, size=size)
+        return page
+
+    def _send(self, method, url, endpoint, kwargs):
+        """Send a request, retrying transient failures per the retry policy."""
+        if self.retry is None:
+            return self._send_once(method, url, endpoint, kwargs)
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            kwargs["timeout"] = self.retry.attempt_timeout(started)
+            try:
+                response = self._send_once(method, url, endpoint, kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not self.retry.is_retryable(method):
+                    raise
+                delay = self.retry.next_delay(attempt, started, type(e).__name__)
+                if delay is None:
+                    raise
+            else:
+                status, headers = response.status_code, response.headers
+                if not self.retry.is_retryable(method, status, headers):
+                    return response
+                delay = self.retry.next_delay(attempt, started, str(status), headers)
+                if delay is None:
+                    return response
+                # Discarded responses must give their (streamed) connection back.
+                response.close()
+            time.sleep(delay)
+
+    def _send_once(self, method, url, endpoint, kwargs):
+        """Send one request over the session, pacing it against the rate limit.
+
+        With a token pool each attempt picks a credential; a credential that
+        is rejected or out of quota is benched and the request is resent
+        with the next one.
+        """
+        if self.rate_limiter is None and self.token_pool is None:
+            return self.session.request(method, url, **kwargs)
+
+        resource = resource_for(endpoint)
+        while True:
+            credential = key = None
+            if self.token_pool is not None:
+                credential = self._acquire_credential(resource)
+                key = credential.key
+                kwargs["headers"] = dict(kwargs.get("headers") or {})
+                kwargs["headers"].update(credential.headers)
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.delay(resource, key)
+                if delay:
+                    time.sleep(delay)
+
+            response = self.session.request(method, url, **kwargs)
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.update(response.headers, resource, key)
+            if credential is not None:
+                self.token_pool.update(credential, response.headers, resource)
+                if response.status_code == 401:
+                    response.close()
+                    self.token_pool.revoke(credential)
+                    continue
+            if not is_rate_limited(response.status_code, response.headers):
+                return response
+            if credential is not None:
+                response.close()
+                self.token_pool.bench(credential, resource)
+            elif self.rate_limiter is not None:
+                response.close()
+                time.sleep(self.rate_limiter.reset_delay(resource))
+            else:
+                return response
+
+    def _emit(
+        self,
+        method,
+        endpoint,
+        started,
+        response=None,
+        size=None,
+        cache=None,
+        error=None,
+    ):
+        """Run the request hooks with the RequestEvent of one request."""
+        status = remaining = None
+        if response is not None:
+            status = response.status_code
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            remaining = int(remaining) if remaining is not None else None
+        event = RequestEvent(
+            method,
+            endpoint,
+            endpoint_template(endpoint),
+            resource_for(endpoint),
+            status,
+            time.perf_counter() - started,
+            size,
+            remaining,
+            cache,
+            error,
+        )
+        for hook in self.hooks:
+            hook(event)
+
+    def _acquire_credential(self, resource):
+        while True:
+            try:
+                return self.token_pool.acquire(resource)
+            except RateLimitExceededError:
+                if self.rate_limiter is None:
+                    raise
+                wait = self.token_pool.reset_delay(resource)
+                time.sleep(self.rate_limiter.record_wait(wait))
+
+    def _paginate(
+        self, endpoint, params=None, max_items=None, items_key=None, stream=False
+    ):
+        """Yield the items of a list endpoint, following ``rel="next"`` links.
+
+        With ``stream=True`` each page is decoded incrementally as it arrives
+        instead of being buffered whole; streamed pages bypass the cache and
+        the validator store.
+        """
+        if max_items is not None and max_items <= 0:
+            return
+        params = _first_page_params(params, max_items)
+        url = f"{self.BASE_URL}/{endpoint}"
+        count = 0
+        while url:
+            if stream:
+                items, next_url = self._stream_page(url, endpoint, params, items_key)
+            else:
+                page = self._request("GET", url, endpoint, params)
+                items = page.body if items_key is None else page.body[items_key]
+                next_url = page.next_url
+            try:
+                for item in items:
+                    yield item
+                    count += 1
+                    if max_items is not None and count >= max_items:
+                        return
+            finally:
+                if stream:
+                    items.close()
+            # Next links may be id-based (/repositories/{id}/...); the first
+            # page's endpoint keeps every page in the same endpoint family for
+            # cache TTLs, invalidation, rate limits and hooks.
+            url, params = next_url, None
 
+    def _stream_page(self, url, endpoint, params, items_key=None):
+        """Send a streamed GET and return an item iterator and the next page URL."""
+        kwargs = {"params": params, "json": None, "stream": True}
+        started = time.perf_counter()
+        try:
+            response = self._send("GET", url, endpoint, kwargs)
+        except requests.RequestException as e:
+            if self.hooks:
+                self._emit("GET", endpoint, started, error=e)
+            raise
+        if self.hooks:
+            # The body is still unread; Content-Length is all that is known.
+            size = response.headers.get("Content-Length")
+            size = int(size) if size is not None else None
+            self._emit("GET", endpoint, started, response, size)
+        if response.status_code != 200:
+            try:
+                self._handle_response(response)
+            finally:
+                response.close()
+            return iter_json_array([b"[]"]), None
+        return _stream_items(response, items_key), _next_page_url(response)
+
+    def fetch_many(self, calls, max_workers=None):
+        """Run many API calls concurrently and yield results as they complete.
+
+        ``calls`` is an iterable of ``(method_name, args)`` or
+        ``(method_name, args, kwargs)`` tuples, e.g. ``("get_repo", ("o", "r"))``.
+        Each call yields a :class:`BatchResult`; a failing call sets its
+        ``error`` instead of aborting the batch. All calls share this client's
+        connection pool, so ``max_workers`` defaults to ``pool_size``.
+        """
+        max_workers = max_workers or self.pool_size
+        calls = iter(enumerate(calls))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+
+            def submit_next():
+                for index, call in calls:
+                    name, args, kwargs = (tuple(call) + ({},))[:3]
+                    func = getattr(self, name)
+                    future = executor.submit(func, *args, **kwargs)
+                    pending[future] = (index, call)
+                    return True
+                return False
+
+            while len(pending) < 2 * max_workers and submit_next():
+                pass
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, call = pending.pop(future)
+                        submit_next()
+                        try:
+                            yield BatchResult(index, call, future.result(), None)
+                        except (GitHubAPIError, requests.RequestException) as e:
+                            yield BatchResult(index, call, None, e)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def get_repo_stats_many(
+        self, repos, max_workers=None, graphql=False, batch_size=MAX_REPOS_PER_QUERY
+    ):
+        """Get statistics for many ``(owner, repo)`` pairs concurrently.
+
+        Yields a :class:`BatchResult` per repository as soon as it is ready;
+        ``call`` is the ``(owner, repo)`` pair. With ``graphql=True`` up to
+        ``batch_size`` repositories are fetched per aliased GraphQL query
+        (which requires a token), and each result additionally carries
+        ``languages`` and the default-branch ``commits`` count.
+        """
+        if not graphql:
+            results = self.fetch_many(
+                (("get_repo_stats", tuple(pair)) for pair in repos), max_workers
+            )
+            for result in results:
+                yield result._replace(call=result.call[1])
+            return
+
+        repos = [tuple(pair) for pair in repos]
+        batches = [
+            repos[start : start + batch_size]
+            for start in range(0, len(repos), batch_size)
+        ]
+        calls = (("_repo_stats_batch", (batch,)) for batch in batches)
+        for result in self.fetch_many(calls, max_workers):
+            batch = batches[result.index]
+            offset = result.index * batch_size
+            outcomes = result.value or [(None, result.error)] * len(batch)
+            for position, (pair, (value, error)) in enumerate(zip(batch, outcomes)):
+                yield BatchResult(offset + position, pair, value, error)
+
+    def _repo_stats_batch(self, repos):
+        """Fetch the stats of a few repositories with one GraphQL query."""
+        response = self._make_request("POST", "graphql", data=repo_stats_query(repos))
+        return repo_stats_results(repos, response)
+
+    def warm_stats(
+        self,
+        repos,
+        stats=STATS_METHODS,
+        max_workers=None,
+        initial_delay=1.0,
+        max_delay=30.0,
+        timeout=300.0,
+    ):
+        """Request ``/stats/*`` data for many repositories at once.
+
+        Every ``(owner, repo)`` and statistic in ``stats`` is requested
+        concurrently so GitHub computes them in parallel; requests answered
+        with 202 are polled again with exponential backoff. Yields a
+        :class:`BatchResult` with ``call`` set to ``(owner, repo, stat)`` as
+        soon as each statistic is ready. Statistics still pending after
+        ``timeout`` seconds are yielded with an :class:`AcceptedError`.
+        """
+        jobs = [(owner, repo, stat) for owner, repo in repos for stat in stats]
+        pending = list(range(len(jobs)))
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        while pending:
+            calls = [(jobs[i][2], jobs[i][:2]) for i in pending]
+            accepted = []
+            for result in self.fetch_many(calls, max_workers):
+                index = pending[result.index]
+                if isinstance(result.error, AcceptedError):
+                    accepted.append(index)
+                else:
+                    yield result._replace(index=index, call=jobs[index])
+            pending = sorted(accepted)
+            if not pending:
+                break
+            if time.monotonic() + delay > deadline:
+                for index in pending:
+                    yield BatchResult(index, jobs[index], None, AcceptedError())
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+    def invalidate(self, owner, repo=None):
+        """Drop cached responses for a repository, user or organization."""
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate(owner, repo)
+
+    def _handle_response(self, response):
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 204:
             return None
-        elif response.status_code == 401:
-            raise AuthenticationError()
-        elif (
-            response.status_code == 403
-            and "X-RateLimit-Remaining" in response.headers
-            and int(response.headers["X-RateLimit-Remaining"]) == 0
-        ):
-            raise RateLimitExceededError()
-        elif response.status_code == 404:
-            raise NotFoundError()
-        elif 500 <= response.status_code < 600:
-            raise ServerError()
-        else:
-            raise GitHubAPIError(
-                f"GitHub API request failed: {response.status_code}",
-                code="UNKNOWN_ERROR",
-            )
+        raise error_for_status(response.status_code, response.headers)
 
     # Repositories
-    def get_repo(self, owner, repo):
+    def get_repo(self, owner, repo, as_records=False, fields=None):
         """Get repository information."""
-        return self._make_request("GET", f"repos/{owner}/{repo}")
+        data = self._make_request("GET", f"repos/{owner}/{repo}")
+        return convert(data, Repo, as_records, fields)
 
     def list_repo_contributors(self, owner, repo):
         """List contributors for a repository."""
         return self._make_request("GET", f"repos/{owner}/{repo}/contributors")
 
+    def iter_repo_contributors(self, owner, repo, max_items=None, stream=False):
+        """Iterate over all contributors for a repository."""
+        return self._paginate(
+            f"repos/{owner}/{repo}/contributors", max_items=max_items, stream=stream
+        )
+
     def list_repo_languages(self, owner, repo):
         """List languages for a repository."""
         return self._make_request("GET", f"repos/{owner}/{repo}/languages")
@@ -62,11 +539,47 @@ class GitHubMetricsAPI:
         return self._make_request("GET", f"repos/{owner}/{repo}/readme")
 
     # Issues
-    def list_repo_issues(self, owner, repo, state="open"):
-        """List issues for a repository."""
-        return self._make_request(
-            "GET", f"repos/{owner}/{repo}/issues", params={"state": state}
+    def list_repo_issues(
+        self,
+        owner,
+        repo,
+        state="open",
+        since=None,
+        sort=None,
+        direction=None,
+        as_records=False,
+        fields=None,
+    ):
+        """List issues for a repository.
+
+        ``since`` (ISO 8601) limits the list to issues updated at or after
+        that time; ``sort`` is ``created``, ``updated`` or ``comments``.
+        """
+        params = _query(state=state, since=since, sort=sort, direction=direction)
+        data = self._make_request("GET", f"repos/{owner}/{repo}/issues", params=params)
+        return convert_all(data, Issue, as_records, fields)
+
+    def iter_repo_issues(
+        self,
+        owner,
+        repo,
+        state="open",
+        max_items=None,
+        stream=False,
+        since=None,
+        sort=None,
+        direction=None,
+        as_records=False,
+        fields=None,
+    ):
+        """Iterate over all issues for a repository."""
+        items = self._paginate(
+            f"repos/{owner}/{repo}/issues",
+            _query(state=state, since=since, sort=sort, direction=direction),
+            max_items=max_items,
+            stream=stream,
         )
+        return convert_all(items, Issue, as_records, fields)
 
     # def create_issue(self, owner, repo, title, body=None, labels=None):
     #     """Create an issue in a repository."""
@@ -74,33 +587,75 @@ class GitHubMetricsAPI:
     #     return self._make_request("POST", f"repos/{owner}/{repo}/issues", data=data)
 
     # Pull Requests
-    def list_pull_requests(self, owner, repo, state="open"):
+    def list_pull_requests(
+        self, owner, repo, state="open", as_records=False, fields=None
+    ):
         """List pull requests for a repository."""
-        return self._make_request(
+        data = self._make_request(
             "GET", f"repos/{owner}/{repo}/pulls", params={"state": state}
         )
+        return convert_all(data, PullRequest, as_records, fields)
+
+    def iter_pull_requests(
+        self,
+        owner,
+        repo,
+        state="open",
+        max_items=None,
+        stream=False,
+        as_records=False,
+        fields=None,
+    ):
+        """Iterate over all pull requests for a repository."""
+        items = self._paginate(
+            f"repos/{owner}/{repo}/pulls",
+            {"state": state},
+            max_items=max_items,
+            stream=stream,
+        )
+        return convert_all(items, PullRequest, as_records, fields)
 
-    def get_pull_request(self, owner, repo, pull_number):
+    def get_pull_request(self, owner, repo, pull_number, as_records=False, fields=None):
         """Get a specific pull request."""
-        return self._make_request("GET", f"repos/{owner}/{repo}/pulls/{pull_number}")
+        data = self._make_request("GET", f"repos/{owner}/{repo}/pulls/{pull_number}")
+        return convert(data, PullRequest, as_records, fields)
 
     # Users
-    def get_user(self, username):
+    def get_user(self, username, as_records=False, fields=None):
         """Get information about a user."""
-        return self._make_request("GET", f"users/{username}")
+        data = self._make_request("GET", f"users/{username}")
+        return convert(data, User, as_records, fields)
 
-    def list_user_repos(self, username):
+    def list_user_repos(self, username, as_records=False, fields=None):
         """List repositories for a user."""
-        return self._make_request("GET", f"users/{username}/repos")
+        data = self._make_request("GET", f"users/{username}/repos")
+        return convert_all(data, Repo, as_records, fields)
+
+    def iter_user_repos(
+        self, username, max_items=None, stream=False, as_records=False, fields=None
+    ):
+        """Iterate over all repositories for a user."""
+        items = self._paginate(
+            f"users/{username}/repos", max_items=max_items, stream=stream
+        )
+        return convert_all(items, Repo, as_records, fields)
 
     # Organizations
     def get_organization(self, org):
         """Get information about an organization."""
         return self._make_request("GET", f"orgs/{org}")
 
-    def list_org_repos(self, org):
+    def list_org_repos(self, org, as_records=False, fields=None):
         """List repositories for an organization."""
-        return self._make_request("GET", f"orgs/{org}/repos")
+        data = self._make_request("GET", f"orgs/{org}/repos")
+        return convert_all(data, Repo, as_records, fields)
+
+    def iter_org_repos(
+        self, org, max_items=None, stream=False, as_records=False, fields=None
+    ):
+        """Iterate over all repositories for an organization."""
+        items = self._paginate(f"orgs/{org}/repos", max_items=max_items, stream=stream)
+        return convert_all(items, Repo, as_records, fields)
 
     # Projects
     def list_repo_projects(self, owner, repo):
@@ -108,34 +663,152 @@ class GitHubMetricsAPI:
         return self._make_request("GET", f"repos/{owner}/{repo}/projects")
 
     # Search
-    def search_repositories(self, query, sort=None, order=None):
+    def search_repositories(
+        self, query, sort=None, order=None, as_records=False, fields=None
+    ):
         """Search for repositories."""
         params = {"q": query, "sort": sort, "order": order}
-        return self._make_request("GET", "search/repositories", params=params)
+        data = self._make_request("GET", "search/repositories", params=params)
+        if as_records or fields is not None:
+            data = dict(data)
+            data["items"] = convert_all(data["items"], Repo, as_records, fields)
+        return data
+
+    def iter_search_repositories(
+        self,
+        query,
+        sort=None,
+        order=None,
+        max_items=None,
+        stream=False,
+        as_records=False,
+        fields=None,
+    ):
+        """Iterate over all repositories matching a search."""
+        params = {"q": query, "sort": sort, "order": order}
+        items = self._paginate(
+            "search/repositories",
+            params,
+            max_items=max_items,
+            stream=stream,
+            items_key="items",
+        )
+        return convert_all(items, Repo, as_records, fields)
 
-    def search_issues(self, query, sort=None, order=None):
+    def search_issues(
+        self, query, sort=None, order=None, as_records=False, fields=None
+    ):
         """Search for issues and pull requests."""
         params = {"q": query, "sort": sort, "order": order}
-        return self._make_request("GET", "search/issues", params=params)
+        data = self._make_request("GET", "search/issues", params=params)
+        if as_records or fields is not None:
+            data = dict(data)
+            data["items"] = convert_all(data["items"], Issue, as_records, fields)
+        return data
+
+    def iter_search_issues(
+        self,
+        query,
+        sort=None,
+        order=None,
+        max_items=None,
+        stream=False,
+        as_records=False,
+        fields=None,
+    ):
+        """Iterate over all issues and pull requests matching a search."""
+        params = {"q": query, "sort": sort, "order": order}
+        items = self._paginate(
+            "search/issues",
+            params,
+            max_items=max_items,
+            stream=stream,
+            items_key="items",
+        )
+        return convert_all(items, Issue, as_records, fields)
 
     # Gists
     def list_user_gists(self, username):
         """List public gists for a user."""
         return self._make_request("GET", f"users/{username}/gists")
 
+    def iter_user_gists(self, username, max_items=None, stream=False):
+        """Iterate over all public gists for a user."""
+        return self._paginate(
+            f"users/{username}/gists", max_items=max_items, stream=stream
+        )
+
     # Git Data
-    def list_commits(self, owner, repo):
-        """List commits for a repository."""
-        return self._make_request("GET", f"repos/{owner}/{repo}/commits")
+    def list_commits(self, owner, repo, since=None, as_records=False, fields=None):
+        """List commits for a repository, optionally only those since ``since``."""
+        data = self._make_request(
+            "GET", f"repos/{owner}/{repo}/commits", params=_query(since=since)
+        )
+        return convert_all(data, Commit, as_records, fields)
+
+    def iter_commits(
+        self,
+        owner,
+        repo,
+        max_items=None,
+        stream=False,
+        since=None,
+        as_records=False,
+        fields=None,
+    ):
+        """Iterate over all commits for a repository."""
+        items = self._paginate(
+            f"repos/{owner}/{repo}/commits",
+            _query(since=since),
+            max_items=max_items,
+            stream=stream,
+        )
+        return convert_all(items, Commit, as_records, fields)
 
-    def get_commit(self, owner, repo, sha):
+    def get_commit(self, owner, repo, sha, as_records=False, fields=None):
         """Get a specific commit."""
-        return self._make_request("GET", f"repos/{owner}/{repo}/commits/{sha}")
+        data = self._make_request("GET", f"repos/{owner}/{repo}/commits/{sha}")
+        return convert(data, Commit, as_records, fields)
 
     # Actions
-    def list_workflow_runs(self, owner, repo):
-        """List workflow runs for a repository."""
-        return self._make_request("GET", f"repos/{owner}/{repo}/actions/runs")
+    def list_workflow_runs(
+        self, owner, repo, created=None, as_records=False, fields=None
+    ):
+        """List workflow runs for a repository.
+
+        ``created`` filters on the creation time, e.g. ``">=2024-01-01"``.
+        """
+        data = self._make_request(
+            "GET",
+            f"repos/{owner}/{repo}/actions/runs",
+            params=_query(created=created),
+        )
+        if as_records or fields is not None:
+            data = dict(data)
+            data["workflow_runs"] = convert_all(
+                data["workflow_runs"], WorkflowRun, as_records, fields
+            )
+        return data
+
+    def iter_workflow_runs(
+        self,
+        owner,
+        repo,
+        max_items=None,
+        stream=False,
+        created=None,
+        as_records=False,
+        fields=None,
+    ):
+        """Iterate over all workflow runs for a repository."""
+        items = self._paginate(
+            f"repos/{owner}/{repo}/actions/runs",
+            _query(created=created),
+            max_items=max_items,
+            stream=stream,
+            items_key="workflow_runs",
+        )
+        return convert_all(items, WorkflowRun, as_records, fields)
 
     # Webhooks
     def list_repo_webhooks(self, owner, repo):
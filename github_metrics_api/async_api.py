@@ -0,0 +1,488 @@
+import asyncio
+import json
+import os
+import time
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .api import Page, _MISSING, _first_page_params, _next_page_url, _query
+from .conditional import request_key
+from .errors import RateLimitExceededError, error_for_status
+from .ratelimit import is_rate_limited, resource_for
+from .singleflight import AsyncSingleFlight
+
+
+def _query_params(params):
+    # aiohttp rejects None values, which requests silently drops.
+    if not params:
+        return None
+    return {k: v for k, v in params.items() if v is not None}
+
+
+class AsyncGitHubMetricsAPI:
+    """asyncio counterpart of :class:`GitHubMetricsAPI`.
+
+    Every method of the synchronous client is available as a coroutine (and
+    every ``iter_*`` method as an async generator). Requests share one pooled
+    keep-alive connection and at most ``max_concurrency`` are in flight at a
+    time. Use the client as an async context manager, or call :meth:`close`.
+    """
+
+    BASE_URL = "https://api.github.com"
+
+    def __init__(
+        self,
+        access_token=os.environ.get("GITHUB_API_TOKEN"),
+        max_concurrency=10,
+        validator_store=None,
+        cache=None,
+        base_url=None,
+        rate_limiter=None,
+        token_pool=None,
+        retry=None,
+        coalesce=False,
+    ):
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncGitHubMetricsAPI requires aiohttp: "
+                "pip install github_metrics_api[async]"
+            )
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.headers = {"Accept": "application/vnd.github.v3+json"}
+        if access_token:
+            self.headers["Authorization"] = f"token {access_token}"
+        self.max_concurrency = max_concurrency
+        self.validator_store = validator_store
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.token_pool = token_pool
+        self.retry = retry
+        if coalesce is True:
+            coalesce = AsyncSingleFlight()
+        self.singleflight = coalesce or None
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _ensure_session(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self.session = aiohttp.ClientSession(
+                headers=self.headers, connector=connector
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.session
+
+    async def _make_request(self, method, endpoint, params=None, data=None):
+        url = f"{self.BASE_URL}/{endpoint}"
+        page = await self._request(method, url, endpoint, params, data)
+        return page.body
+
+    async def _request(self, method, url, endpoint, params=None, data=None):
+        """Send a request and return the decoded body with the next page URL."""
+        if method == "GET" and self.singleflight is not None:
+            key = (self.headers.get("Authorization"), request_key(url, params))
+            return await self.singleflight.do(
+                key, lambda: self._fetch(method, url, endpoint, params, data)
+            )
+        return await self._fetch(method, url, endpoint, params, data)
+
+    async def _fetch(self, method, url, endpoint, params=None, data=None):
+        kwargs = {"params": _query_params(params), "json": data}
+
+        cache_key = None
+        if method == "GET" and self.cache is not None:
+            cache_key = request_key(url, params)
+            cached = self.cache.get(cache_key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+
+        validators = None
+        validators_enabled = method == "GET" and self.validator_store is not None
+        if validators_enabled:
+            validators = self.validator_store.lookup(url, params)
+            if validators is not None:
+                kwargs["headers"] = validators.conditional_headers()
+
+        # The semaphore is created with the session, on first use.
+        self._ensure_session()
+        async with self._semaphore:
+            async with await self._send(method, url, endpoint, kwargs) as response:
+                if response.status == 304 and validators is not None:
+                    page = self.validator_store.not_modified(validators)
+                    size = validators.size
+                else:
+                    content = await self._handle_response(response)
+                    size = len(content) if content else 0
+                    page = Page(
+                        json.loads(content) if content else None,
+                        self._next_page_url(response),
+                    )
+                    if validators_enabled:
+                        self.validator_store.store(
+                            url,
+                            params,
+                            response.headers,
+                            page,
+                            size=size,
+                            revalidated=validators is not None,
+                        )
+
+        if cache_key is not None:
+            self.cache.set(cache_key, page, endpoint, size=size)
+        return page
+
+    async def _send(self, method, url, endpoint, kwargs):
+        """Send a request, retrying transient failures per the retry policy."""
+        if self.retry is None:
+            return await self._send_once(method, url, endpoint, kwargs)
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            timeout = self.retry.attempt_timeout(started)
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+            try:
+                response = await self._send_once(method, url, endpoint, kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if not self.retry.is_retryable(method):
+                    raise
+                delay = self.retry.next_delay(attempt, started, type(e).__name__)
+                if delay is None:
+                    raise
+            else:
+                status, headers = response.status, response.headers
+                if not self.retry.is_retryable(method, status, headers):
+                    return response
+                delay = self.retry.next_delay(attempt, started, str(status), headers)
+                if delay is None:
+                    return response
+                response.release()
+            await asyncio.sleep(delay)
+
+    async def _send_once(self, method, url, endpoint, kwargs):
+        """Send one request over the session, pacing it against the rate limit.
+
+        With a token pool each attempt picks a credential; a credential that
+        is rejected or out of quota is benched and the request is resent
+        with the next one.
+        """
+        session = self._ensure_session()
+        if self.rate_limiter is None and self.token_pool is None:
+            return await session.request(method, url, **kwargs)
+
+        resource = resource_for(endpoint)
+        while True:
+            credential = key = None
+            if self.token_pool is not None:
+                credential = await self._acquire_credential(resource)
+                key = credential.key
+                kwargs["headers"] = dict(kwargs.get("headers") or {})
+                kwargs["headers"].update(credential.headers)
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.delay(resource, key)
+                if delay:
+                    await asyncio.sleep(delay)
+
+            response = await session.request(method, url, **kwargs)
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.update(response.headers, resource, key)
+            if credential is not None:
+                self.token_pool.update(credential, response.headers, resource)
+                if response.status == 401:
+                    response.release()
+                    self.token_pool.revoke(credential)
+                    continue
+            if not is_rate_limited(response.status, response.headers):
+                return response
+            if credential is not None:
+                response.release()
+                self.token_pool.bench(credential, resource)
+            elif self.rate_limiter is not None:
+                response.release()
+                await asyncio.sleep(self.rate_limiter.reset_delay(resource))
+            else:
+                return response
+
+    async def _acquire_credential(self, resource):
+        while True:
+            try:
+                return self.token_pool.acquire(resource)
+            except RateLimitExceededError:
+                if self.rate_limiter is None:
+                    raise
+                wait = self.token_pool.reset_delay(resource)
+                await asyncio.sleep(self.rate_limiter.record_wait(wait))
+
+    @staticmethod
+    def _next_page_url(response):
+        url = _next_page_url(response)
+        return str(url) if url is not None else None
+
+    async def _handle_response(self, response):
+        if response.status == 200:
+            return await response.read()
+        elif response.status == 204:
+            return None
+        raise error_for_status(response.status, response.headers)
+
+    async def _paginate(self, endpoint, params=None, max_items=None, items_key=None):
+        """Yield the items of a list endpoint, following ``rel="next"`` links."""
+        if max_items is not None and max_items <= 0:
+            return
+        params = _first_page_params(params, max_items)
+        url = f"{self.BASE_URL}/{endpoint}"
+        count = 0
+        while url:
+            page = await self._request("GET", url, endpoint, params)
+            items = page.body if items_key is None else page.body[items_key]
+            for item in items:
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+            # Next links may be id-based (/repositories/{id}/...); the first
+            # page's endpoint keeps every page in the same endpoint family for
+            # cache TTLs, invalidation, rate limits and hooks.
+            url, params = page.next_url, None
+
+    def invalidate(self, owner, repo=None):
+        """Drop cached responses for a repository, user or organization."""
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate(owner, repo)
+
+    # Repositories
+    async def get_repo(self, owner, repo):
+        """Get repository information."""
+        return await self._make_request("GET", f"repos/{owner}/{repo}")
+
+    async def list_repo_contributors(self, owner, repo):
+        """List contributors for a repository."""
+        return await self._make_request("GET", f"repos/{owner}/{repo}/contributors")
+
+    def iter_repo_contributors(self, owner, repo, max_items=None):
+        """Iterate over all contributors for a repository."""
+        return self._paginate(f"repos/{owner}/{repo}/contributors", max_items=max_items)
+
+    async def list_repo_languages(self, owner, repo):
+        """List languages for a repository."""
+        return await self._make_request("GET", f"repos/{owner}/{repo}/languages")
+
+    async def get_repo_readme(self, owner, repo):
+        """Get the README for a repository."""
+        return await self._make_request("GET", f"repos/{owner}/{repo}/readme")
+
+    # Issues
+    async def list_repo_issues(
+        self, owner, repo, state="open", since=None, sort=None, direction=None
+    ):
+        """List issues for a repository.
+
+        ``since`` (ISO 8601) limits the list to issues updated at or after
+        that time; ``sort`` is ``created``, ``updated`` or ``comments``.
+        """
+        params = _query(state=state, since=since, sort=sort, direction=direction)
+        return await self._make_request(
+            "GET", f"repos/{owner}/{repo}/issues", params=params
+        )
+
+    def iter_repo_issues(
+        self,
+        owner,
+        repo,
+        state="open",
+        max_items=None,
+        since=None,
+        sort=None,
+        direction=None,
+    ):
+        """Iterate over all issues for a repository."""
+        return self._paginate(
+            f"repos/{owner}/{repo}/issues",
+            _query(state=state, since=since, sort=sort, direction=direction),
+            max_items=max_items,
+        )
+
+    # Pull Requests
+    async def list_pull_requests(self, owner, repo, state="open"):
+        """List pull requests for a repository."""
+        return await self._make_request(
+            "GET", f"repos/{owner}/{repo}/pulls", params={"state": state}
+        )
+
+    def iter_pull_requests(self, owner, repo, state="open", max_items=None):
+        """Iterate over all pull requests for a repository."""
+        return self._paginate(
+            f"repos/{owner}/{repo}/pulls", {"state": state}, max_items=max_items
+        )
+
+    async def get_pull_request(self, owner, repo, pull_number):
+        """Get a specific pull request."""
+        return await self._make_request(
+            "GET", f"repos/{owner}/{repo}/pulls/{pull_number}"
+        )
+
+    # Users
+    async def get_user(self, username):
+        """Get information about a user."""
+        return await self._make_request("GET", f"users/{username}")
+
+    async def list_user_repos(self, username):
+        """List repositories for a user."""
+        return await self._make_request("GET", f"users/{username}/repos")
+
+    def iter_user_repos(self, username, max_items=None):
+        """Iterate over all repositories for a user."""
+        return self._paginate(f"users/{username}/repos", max_items=max_items)
+
+    # Organizations
+    async def get_organization(self, org):
+        """Get information about an organization."""
+        return await self._make_request("GET", f"orgs/{org}")
+
+    async def list_org_repos(self, org):
+        """List repositories for an organization."""
+        return await self._make_request("GET", f"orgs/{org}/repos")
+
+    def iter_org_repos(self, org, max_items=None):
+        """Iterate over all repositories for an organization."""
+        return self._paginate(f"orgs/{org}/repos", max_items=max_items)
+
+    # Projects
+    async def list_repo_projects(self, owner, repo):
+        """List projects for a repository."""
+        return await self._make_request("GET", f"repos/{owner}/{repo}/projects")
+
+    # Search
+    async def search_repositories(self, query, sort=None, order=None):
+        """Search for repositories."""
+        params = {"q": query, "sort": sort, "order": order}
+        return await self._make_request("GET", "search/repositories", params=params)
+
+    def iter_search_repositories(self, query, sort=None, order=None, max_items=None):
+        """Iterate over all repositories matching a search."""
+        params = {"q": query, "sort": sort, "order": order}
+        return self._paginate(
+            "search/repositories", params, max_items=max_items, items_key="items"
+        )
+
+    async def search_issues(self, query, sort=None, order=None):
+        """Search for issues and pull requests."""
+        params = {"q": query, "sort": sort, "order": order}
+        return await self._make_request("GET", "search/issues", params=params)
+
+    def iter_search_issues(self, query, sort=None, order=None, max_items=None):
+        """Iterate over all issues and pull requests matching a search."""
+        params = {"q": query, "sort": sort, "order": order}
+        return self._paginate(
+            "search/issues", params, max_items=max_items, items_key="items"
+        )
+
+    # Gists
+    async def list_user_gists(self, username):
+        """List public gists for a user."""
+        return await self._make_request("GET", f"users/{username}/gists")
+
+    def iter_user_gists(self, username, max_items=None):
+        """Iterate over all public gists for a user."""
+        return self._paginate(f"users/{username}/gists", max_items=max_items)
+
+    # Git Data
+    async def list_commits(self, owner, repo, since=None):
+        """List commits for a repository, optionally only those since ``since``."""
+        return await self._make_request(
+            "GET", f"repos/{owner}/{repo}/commits", params=_query(since=since)
+        )
+
+    def iter_commits(self, owner, repo, max_items=None, since=None):
+        """Iterate over all commits for a repository."""
+        return self._paginate(
+            f"repos/{owner}/{repo}/commits", _query(since=since), max_items=max_items
+        )
+
+    async def get_commit(self, owner, repo, sha):
+        """Get a specific commit."""
+        return await self._make_request("GET", f"repos/{owner}/{repo}/commits/{sha}")
+
+    # Actions
+    async def list_workflow_runs(self, owner, repo, created=None):
+        """List workflow runs for a repository.
+
+        ``created`` filters on the creation time, e.g. ``">=2024-01-01"``.
+        """
+        return await self._make_request(
+            "GET",
+            f"repos/{owner}/{repo}/actions/runs",
+            params=_query(created=created),
+        )
+
+    def iter_workflow_runs(self, owner, repo, max_items=None, created=None):
+        """Iterate over all workflow runs for a repository."""
+        return self._paginate(
+            f"repos/{owner}/{repo}/actions/runs",
+            _query(created=created),
+            max_items=max_items,
+            items_key="workflow_runs",
+        )
+
+    # Webhooks
+    async def list_repo_webhooks(self, owner, repo):
+        """List webhooks for a repository."""
+        return await self._make_request("GET", f"repos/{owner}/{repo}/hooks")
+
+    # Additional repository statistics
+    async def get_repo_stats(self, owner, repo):
+        """Get repository statistics."""
+        data = await self.get_repo(owner, repo)
+        return {
+            "stars": data["stargazers_count"],
+            "forks": data["forks_count"],
+            "open_issues": data["open_issues_count"],
+            "watchers": data["subscribers_count"],
+        }
+
+    async def get_commit_activity(self, owner, repo):
+        """Get commit activity for a repository."""
+        return await self._make_request(
+            "GET", f"repos/{owner}/{repo}/stats/commit_activity"
+        )
+
+    async def get_code_frequency(self, owner, repo):
+        """Get code frequency statistics for a repository."""
+        return await self._make_request(
+            "GET", f"repos/{owner}/{repo}/stats/code_frequency"
+        )
+
+    async def get_contributor_stats(self, owner, repo):
+        """Get contributor statistics for a repository."""
+        return await self._make_request(
+            "GET", f"repos/{owner}/{repo}/stats/contributors"
+        )
+
+    async def get_weekly_commits(self, owner, repo):
+        """Get weekly commit counts for a repository."""
+        return await self._make_request(
+            "GET", f"repos/{owner}/{repo}/stats/participation"
+        )
+
+    async def get_punch_card(self, owner, repo):
+        """Get commit punch card data for a repository."""
+        return await self._make_request("GET", f"repos/{owner}/{repo}/stats/punch_card")
@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import OrderedDict
+
+from .endpoints import endpoint_owner, endpoint_template
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# Time-to-live in seconds per endpoint family. Metadata that rarely changes
+# is kept for a long time, activity listings only briefly.
+DEFAULT_TTLS = {
+    "repos/{owner}/{repo}": HOUR,
+    "repos/{owner}/{repo}/languages": HOUR,
+    "repos/{owner}/{repo}/readme": HOUR,
+    "repos/{owner}/{repo}/contributors": 15 * MINUTE,
+    "repos/{owner}/{repo}/stats/commit_activity": HOUR,
+    "repos/{owner}/{repo}/stats/code_frequency": HOUR,
+    "repos/{owner}/{repo}/stats/contributors": HOUR,
+    "repos/{owner}/{repo}/stats/participation": HOUR,
+    "repos/{owner}/{repo}/stats/punch_card": HOUR,
+    "repos/{owner}/{repo}/issues": MINUTE,
+    "repos/{owner}/{repo}/pulls": MINUTE,
+    "repos/{owner}/{repo}/actions/runs": 30,
+    "users/{username}": HOUR,
+    "orgs/{org}": HOUR,
+    "search/repositories": MINUTE,
+    "search/issues": MINUTE,
+}
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size", "endpoint")
+
+    def __init__(self, value, expires_at, size, endpoint):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.endpoint = endpoint
+
+
+class ResponseCache:
+    """In-process LRU cache of decoded GET responses with per-endpoint TTLs.
+
+    The cache is bounded both by number of entries and by the total size of
+    the cached response bodies; the least recently used entries are evicted
+    first. Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        max_entries=1024,
+        max_bytes=64 * 1024 * 1024,
+        ttls=None,
+        default_ttl=5 * MINUTE,
+        clock=time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.updates = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, endpoint):
+        """Return the time-to-live in seconds for an endpoint path."""
+        return self.ttls.get(endpoint_template(endpoint), self.default_ttl)
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key``, or ``default`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry.expires_at <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key, value, endpoint, size=0):
+        """Cache ``value`` under ``key`` using the TTL of ``endpoint``."""
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, self.clock() + ttl, size, endpoint)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, owner, repo=None, templates=None):
+        """Drop every cached response for a repository, user or organization.
+
+        With ``repo`` only the ``repos/{owner}/{repo}`` endpoints are dropped;
+        without it everything scoped to ``owner`` is. ``templates`` narrows
+        this to the given endpoint families, e.g.
+        ``{"repos/{owner}/{repo}/issues"}``.
+        """
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if self._belongs_to(entry.endpoint, owner, repo)
+                and (
+                    templates is None or endpoint_template(entry.endpoint) in templates
+                )
+            ]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def update(self, endpoint, func):
+        """Replace every cached value of ``endpoint`` with ``func(value)``.
+
+        Entries keep their expiry time. ``func`` must return a new value
+        rather than mutate the shared one. Returns the number of entries
+        updated.
+        """
+        endpoint = endpoint.strip("/").lower()
+        with self._lock:
+            entries = [
+                entry
+                for entry in self._entries.values()
+                if entry.endpoint.strip("/").lower() == endpoint
+            ]
+            for entry in entries:
+                entry.value = func(entry.value)
+            self.updates += len(entries)
+            return len(entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Return hit ratio, eviction and size counters as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "updates": self.updates,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+
+    @staticmethod
+    def _belongs_to(endpoint, owner, repo):
+        entry_owner, entry_repo = endpoint_owner(endpoint)
+        if entry_owner is None or entry_owner.lower() != owner.lower():
+            return False
+        return repo is None or (
+            entry_repo is not None and entry_repo.lower() == repo.lower()
+        )
@@ -1,35 +1,72 @@
 import argparse
 import json
 import os
-from dotenv import load_dotenv
-from .api import GitHubMetricsAPI
+import sys
+
+from .commands import resolve
 from .errors import GitHubAPIError
-from .formatters import (
-    format_repo_info,
-    format_repo_contributors,
-    format_repo_languages,
-    format_repo_readme,
-    format_repo_issues,
-    format_pull_requests,
-    format_user_info,
-    format_user_repos,
-    format_user_gists,
-    format_org_info,
-    format_org_repos,
-    format_search_repos,
-    format_search_issues,
-    format_repo_stats,
-    format_commit_activity,
-    format_code_frequency,
-    format_contributor_stats,
-    format_weekly_commits,
-    format_punch_card,
-)
-
-load_dotenv()
 
+# Heavy modules (requests, dotenv, the formatters, ...) are imported by
+# main() only once it knows which command runs, to keep start-up fast.
 
-def main():
+
+def _run_batch(api, lines, out, ordered=False, max_workers=None):
+    """Run a JSON-lines batch of commands and write one JSON result per line.
+
+    Every command runs concurrently through ``api.fetch_many``. Results are
+    written as they complete, or in input order with ``ordered``; each one
+    carries the input ``line`` number and either a ``result`` or an ``error``.
+    """
+    jobs, records = [], []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            params = json.loads(line)
+            name, args, kwargs, _ = resolve(params)
+        except ValueError as e:
+            error = {"message": str(e), "code": "INVALID_COMMAND"}
+            records.append({"line": number, "error": error})
+        else:
+            jobs.append((number, params, (name, args, kwargs)))
+
+    def completed():
+        yield from records
+        for result in api.fetch_many([call for _, _, call in jobs], max_workers):
+            number, params, _ = jobs[result.index]
+            record = {"line": number, "command": params}
+            if result.error is None:
+                record["result"] = result.value
+            else:
+                message = getattr(result.error, "message", None) or str(result.error)
+                code = getattr(result.error, "code", None)
+                record["error"] = {"message": message, "code": code}
+            yield record
+
+    def write(record):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    lines = sorted([record["line"] for record in records] + [j[0] for j in jobs])
+    order = iter(lines)
+    expected = next(order, None)
+    ready = {}
+    for record in completed():
+        if not ordered:
+            write(record)
+            continue
+        ready[record["line"]] = record
+        while expected in ready:
+            write(ready.pop(expected))
+            expected = next(order, None)
+
+
+def _report_progress(done, total):
+    sys.stderr.write(f"\rFetched {done}/{total}")
+    sys.stderr.flush()
+
+
+def _build_parser():
     parser = argparse.ArgumentParser(description="Fetch GitHub metrics and data")
     parser.add_argument(
         "--token", help="GitHub API token", default=os.getenv("GITHUB_API_TOKEN")
@@ -40,6 +77,10 @@ def main():
         default="pretty",
         help="Output format (default: pretty)",
     )
+    parser.add_argument(
+        "--db",
+        help="SQLite warehouse: answer queries from it offline, or fill it with fetch",
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
@@ -80,9 +121,21 @@ def main():
     org_parser.add_argument("org", help="Organization name")
     org_parser.add_argument(
         "action",
-        choices=["info", "repos"],
+        choices=["info", "repos", "stats"],
         help="Action to perform on the organization",
     )
+    org_parser.add_argument(
+        "--workers",
+        type=int,
+        default=10,
+        help="Concurrent requests for the stats action (default: 10)",
+    )
+    org_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=300.0,
+        help="Seconds to wait for GitHub to compute commit activity (default: 300)",
+    )
 
     # Search commands
     search_parser = subparsers.add_parser("search", help="Search-related commands")
@@ -93,104 +146,200 @@ def main():
     search_parser.add_argument("--sort", help="Sort parameter")
     search_parser.add_argument("--order", choices=["asc", "desc"], help="Sort order")
 
+    # Warehouse commands
+    fetch_parser = subparsers.add_parser(
+        "fetch", help="Store a repository's data in the --db warehouse"
+    )
+    fetch_parser.add_argument("owner", help="Repository owner")
+    fetch_parser.add_argument("repo", help="Repository name")
+    fetch_parser.add_argument(
+        "--resources",
+        nargs="+",
+        metavar="RESOURCE",
+        help="Resources to fetch, e.g. repo issues commits (default: all)",
+    )
+    fetch_parser.add_argument(
+        "--max-items",
+        type=int,
+        help="Most issues, pull requests and commits to fetch",
+    )
+
+    # Batch commands
+    batch_parser = subparsers.add_parser(
+        "batch", help="Run a JSON-lines file of commands, writing JSON lines"
+    )
+    batch_parser.add_argument(
+        "file",
+        nargs="?",
+        type=argparse.FileType("r"),
+        default="-",
+        help="File of commands, one JSON object per line (default: stdin)",
+    )
+    batch_parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Write results in input order instead of completion order",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=10,
+        help="Concurrent requests (default: 10)",
+    )
+
+    # Server commands
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve the commands as JSON over HTTP from one shared client"
+    )
+    serve_parser.add_argument(
+        "--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)"
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=8000, help="Port to listen on (default: 8000)"
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=10,
+        help="Connections to GitHub in the shared pool (default: 10)",
+    )
+    serve_parser.add_argument(
+        "--webhook-secret",
+        default=os.getenv("GITHUB_WEBHOOK_SECRET"),
+        help="Accept signed webhooks on POST /webhooks to keep the cache fresh",
+    )
+
+    return parser
+
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
+    if args.command is None:
+        parser.print_help()
+        return
+    if args.token is None:
+        # Only read .env when the token is not already given.
+        from dotenv import load_dotenv
 
-    api = GitHubMetricsAPI(access_token=args.token)
+        load_dotenv()
+        args.token = os.getenv("GITHUB_API_TOKEN")
+    if args.command == "fetch" and not args.db:
+        parser.error("fetch requires --db")
+    if args.db and args.command == "org" and args.action == "stats":
+        parser.error("org stats is not available with --db")
+    if args.db and args.command == "batch":
+        parser.error("batch is not available with --db")
 
-    try:
-        if args.command == "repo":
-            if args.action == "info":
-                data = api.get_repo(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_repo_info(data)
-            elif args.action == "contributors":
-                data = api.list_repo_contributors(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_repo_contributors(data)
-            elif args.action == "languages":
-                data = api.list_repo_languages(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_repo_languages(data)
-            elif args.action == "readme":
-                data = api.get_repo_readme(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_repo_readme(data)
-            elif args.action == "issues":
-                data = api.list_repo_issues(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_repo_issues(data)
-            elif args.action == "pulls":
-                data = api.list_pull_requests(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_pull_requests(data)
-            elif args.action == "stats":
-                data = api.get_repo_stats(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_repo_stats(data)
-            elif args.action == "commit_activity":
-                data = api.get_commit_activity(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_commit_activity(data)
-            elif args.action == "code_frequency":
-                data = api.get_code_frequency(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_code_frequency(data)
-            elif args.action == "contributors_stats":
-                data = api.get_contributor_stats(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_contributor_stats(data)
-            elif args.action == "weekly_commits":
-                data = api.get_weekly_commits(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_weekly_commits(data)
-            elif args.action == "punch_card":
-                data = api.get_punch_card(args.owner, args.repo)
-                if args.format == "pretty":
-                    data = format_punch_card(data)
-
-        elif args.command == "user":
-            if args.action == "info":
-                data = api.get_user(args.username)
-                if args.format == "pretty":
-                    data = format_user_info(data)
-            elif args.action == "repos":
-                data = api.list_user_repos(args.username)
-                if args.format == "pretty":
-                    data = format_user_repos(data)
-            elif args.action == "gists":
-                data = api.list_user_gists(args.username)
-                if args.format == "pretty":
-                    data = format_user_gists(data)
-
-        elif args.command == "org":
-            if args.action == "info":
-                data = api.get_organization(args.org)
-                if args.format == "pretty":
-                    data = format_org_info(data)
-            elif args.action == "repos":
-                data = api.list_org_repos(args.org)
-                if args.format == "pretty":
-                    data = format_org_repos(data)
-
-        elif args.command == "search":
-            if args.type == "repos":
-                data = api.search_repositories(
-                    args.query, sort=args.sort, order=args.order
+    if args.command == "serve":
+        from .server import create_server, serve
+
+        if args.db and args.webhook_secret:
+            parser.error("webhooks are not available with --db")
+
+        warehouse = None
+        if args.db:
+            from .warehouse import Warehouse
+
+            # Answer every request offline from the warehouse.
+            warehouse = Warehouse(args.db)
+        server = create_server(
+            args.host,
+            args.port,
+            api=warehouse,
+            access_token=args.token,
+            pool_size=args.workers,
+            webhook_secret=args.webhook_secret,
+        )
+        sys.stderr.write(f"Serving on {server.url}\n")
+        try:
+            serve(server)
+        finally:
+            if warehouse is not None:
+                warehouse.close()
+        return
+
+    from . import formatters
+    from .api import GitHubMetricsAPI
+
+    if args.command == "batch" or (args.command == "org" and args.action == "stats"):
+        # The limiter only paces requests once the quota runs low, so crawls
+        # well within the budget run at full concurrency.
+        from .ratelimit import RateLimiter
+        from .retry import RetryPolicy
+
+        api = GitHubMetricsAPI(
+            access_token=args.token,
+            pool_size=args.workers,
+            rate_limiter=RateLimiter(),
+            retry=RetryPolicy(),
+        )
+    else:
+        api = GitHubMetricsAPI(access_token=args.token)
+    warehouse = None
+    if args.db:
+        from .warehouse import RESOURCES, Warehouse
+
+        if args.command == "fetch":
+            invalid = sorted(set(args.resources or ()) - set(RESOURCES))
+            if invalid:
+                parser.error(
+                    f"invalid resources: {', '.join(invalid)} "
+                    f"(choose from {', '.join(RESOURCES)})"
                 )
-                if args.format == "pretty":
-                    data = format_search_repos(data)
-            elif args.type == "issues":
-                data = api.search_issues(args.query, sort=args.sort, order=args.order)
-                if args.format == "pretty":
-                    data = format_search_issues(data)
+        warehouse = Warehouse(args.db)
+
+    try:
+        if args.command == "fetch":
+            data = warehouse.ingest(
+                api,
+                args.owner,
+                args.repo,
+                resources=args.resources or RESOURCES,
+                max_items=args.max_items,
+            )
+            formatter = "iter_format_ingest"
+        elif args.command == "batch":
+            _run_batch(
+                api,
+                args.file,
+                sys.stdout,
+                ordered=args.ordered,
+                max_workers=args.workers,
+            )
+            return
+        elif args.command == "org" and args.action == "stats":
+            from .org import aggregate_org_metrics
+
+            data = aggregate_org_metrics(
+                api,
+                args.org,
+                max_workers=args.workers,
+                timeout=args.timeout,
+                progress=_report_progress if sys.stderr.isatty() else None,
+            )
+            if sys.stderr.isatty():
+                sys.stderr.write("\n")
+            formatter = "iter_format_org_stats"
+        else:
+            if warehouse is not None:
+                # Every other command is answered from the warehouse.
+                api = warehouse
+            name, call_args, kwargs, formatter = resolve(vars(args))
+            data = getattr(api, name)(*call_args, **kwargs)
 
         if args.format == "json":
-            print(json.dumps(data, indent=2))
+            json.dump(data, sys.stdout, indent=2)
         else:
-            print(data)
+            formatted = getattr(formatters, formatter)(data)
+            formatters.write_formatted(formatted, sys.stdout)
+        sys.stdout.write("\n")
 
     except GitHubAPIError as e:
         print(f"Error: {e.message} (Code: {e.code})")
+    finally:
+        if warehouse is not None:
+            warehouse.close()
 
 
 if __name__ == "__main__":
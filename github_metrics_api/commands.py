@@ -0,0 +1,108 @@
+"""The commands shared by the command line, batch files and the server."""
+
+# (command, action) -> (API method, positional arguments, keyword arguments,
+# name of the pretty formatter). Search commands are keyed by their type.
+COMMANDS = {
+    ("repo", "info"): ("get_repo", ("owner", "repo"), (), "format_repo_info"),
+    ("repo", "contributors"): (
+        "list_repo_contributors",
+        ("owner", "repo"),
+        (),
+        "iter_format_repo_contributors",
+    ),
+    ("repo", "languages"): (
+        "list_repo_languages",
+        ("owner", "repo"),
+        (),
+        "iter_format_repo_languages",
+    ),
+    ("repo", "readme"): (
+        "get_repo_readme",
+        ("owner", "repo"),
+        (),
+        "format_repo_readme",
+    ),
+    ("repo", "issues"): (
+        "list_repo_issues",
+        ("owner", "repo"),
+        (),
+        "iter_format_repo_issues",
+    ),
+    ("repo", "pulls"): (
+        "list_pull_requests",
+        ("owner", "repo"),
+        (),
+        "iter_format_pull_requests",
+    ),
+    ("repo", "stats"): ("get_repo_stats", ("owner", "repo"), (), "format_repo_stats"),
+    ("repo", "commit_activity"): (
+        "get_commit_activity",
+        ("owner", "repo"),
+        (),
+        "iter_format_commit_activity",
+    ),
+    ("repo", "code_frequency"): (
+        "get_code_frequency",
+        ("owner", "repo"),
+        (),
+        "iter_format_code_frequency",
+    ),
+    ("repo", "contributors_stats"): (
+        "get_contributor_stats",
+        ("owner", "repo"),
+        (),
+        "iter_format_contributor_stats",
+    ),
+    ("repo", "weekly_commits"): (
+        "get_weekly_commits",
+        ("owner", "repo"),
+        (),
+        "format_weekly_commits",
+    ),
+    ("repo", "punch_card"): (
+        "get_punch_card",
+        ("owner", "repo"),
+        (),
+        "iter_format_punch_card",
+    ),
+    ("user", "info"): ("get_user", ("username",), (), "format_user_info"),
+    ("user", "repos"): ("list_user_repos", ("username",), (), "iter_format_user_repos"),
+    ("user", "gists"): ("list_user_gists", ("username",), (), "iter_format_user_gists"),
+    ("org", "info"): ("get_organization", ("org",), (), "format_org_info"),
+    ("org", "repos"): ("list_org_repos", ("org",), (), "iter_format_org_repos"),
+    ("search", "repos"): (
+        "search_repositories",
+        ("query",),
+        ("sort", "order"),
+        "iter_format_search_repos",
+    ),
+    ("search", "issues"): (
+        "search_issues",
+        ("query",),
+        ("sort", "order"),
+        "iter_format_search_issues",
+    ),
+}
+
+
+def resolve(params):
+    """Look up the command described by ``params`` in :data:`COMMANDS`.
+
+    ``params`` is a dict of parsed arguments or of one line of a batch file.
+    Returns ``(method, args, kwargs, formatter_name)``; raises ValueError for
+    unknown commands and missing arguments.
+    """
+    if not isinstance(params, dict):
+        raise ValueError("command must be a JSON object")
+    command = params.get("command")
+    action = params.get("type" if command == "search" else "action")
+    try:
+        name, arg_names, kwarg_names, formatter = COMMANDS[(command, action)]
+    except (KeyError, TypeError):
+        raise ValueError(f"unknown command: {command} {action}") from None
+    missing = [arg for arg in arg_names if params.get(arg) is None]
+    if missing:
+        raise ValueError(f"missing arguments: {', '.join(missing)}")
+    args = tuple(params[arg] for arg in arg_names)
+    kwargs = {key: params.get(key) for key in kwarg_names}
+    return name, args, kwargs, formatter
@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+
+
+def request_key(url, params=None):
+    """Build a hashable key for a GET request from its URL and query params."""
+    if not params:
+        return (url, ())
+    return (
+        url,
+        tuple(sorted((k, str(v)) for k, v in params.items() if v is not None)),
+    )
+
+
+class Validators:
+    """Validators and decoded body remembered for a single GET request."""
+
+    __slots__ = ("etag", "last_modified", "body", "size")
+
+    def __init__(self, etag, last_modified, body, size=0):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.size = size
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ValidatorStore:
+    """Remembers ETag / Last-Modified validators for GET requests.
+
+    Repeat requests are sent with ``If-None-Match`` / ``If-Modified-Since``
+    and a ``304 Not Modified`` reply is answered from the stored body, so the
+    body is neither downloaded nor decoded again. GitHub does not count 304
+    responses against the rate limit.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.revalidations = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, url, params=None):
+        """Return the stored validators for a request, or None."""
+        key = request_key(url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.revalidations += 1
+            return entry
+
+    def not_modified(self, entry):
+        """Record a 304 reply for ``entry`` and return its stored body."""
+        with self._lock:
+            self.hits += 1
+        return entry.body
+
+    def store(self, url, params, headers, body, size=0, revalidated=False):
+        """Remember the validators of a 200 reply, if it carries any."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        key = request_key(url, params)
+        with self._lock:
+            if revalidated:
+                self.misses += 1
+            if not etag and not last_modified:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = Validators(etag, last_modified, body, size)
+            self._entries.move_to_end(key)
+            self.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return the hit/revalidation counters as a dict."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "revalidations": self.revalidations,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+            }
@@ -0,0 +1,39 @@
+_ITEM_PLACEHOLDERS = {
+    "pulls": "{pull_number}",
+    "issues": "{issue_number}",
+    "commits": "{sha}",
+}
+
+
+def endpoint_template(endpoint):
+    """Return the route template of an endpoint path.
+
+    ``repos/pytorch/pytorch/pulls/42`` becomes
+    ``repos/{owner}/{repo}/pulls/{pull_number}``, which lets per-endpoint
+    policies be keyed on the route rather than on concrete names.
+    """
+    parts = endpoint.split("?", 1)[0].strip("/").split("/")
+    if parts[0] == "repos" and len(parts) >= 3:
+        rest = parts[3:]
+        if len(rest) == 2 and rest[0] in _ITEM_PLACEHOLDERS:
+            rest = [rest[0], _ITEM_PLACEHOLDERS[rest[0]]]
+        return "/".join(["repos", "{owner}", "{repo}"] + rest)
+    if parts[0] == "users" and len(parts) >= 2:
+        return "/".join(["users", "{username}"] + parts[2:])
+    if parts[0] == "orgs" and len(parts) >= 2:
+        return "/".join(["orgs", "{org}"] + parts[2:])
+    return "/".join(parts)
+
+
+def endpoint_owner(endpoint):
+    """Return the ``(owner, repo)`` an endpoint path belongs to.
+
+    ``repo`` is None for user and organization endpoints, and both are None
+    for endpoints that are not scoped to an owner (search, graphql).
+    """
+    parts = endpoint.split("?", 1)[0].strip("/").split("/")
+    if parts[0] == "repos" and len(parts) >= 3:
+        return parts[1], parts[2]
+    if parts[0] in ("users", "orgs") and len(parts) >= 2:
+        return parts[1], None
+    return None, None
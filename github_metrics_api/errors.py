@@ -7,6 +7,17 @@ class GitHubAPIError(Exception):
         super().__init__(self.message)
 
 
+class AcceptedError(GitHubAPIError):
+    """Raised when GitHub accepted the request but is still computing the data
+
+    The ``/stats/*`` endpoints answer 202 while GitHub builds the statistics
+    in the background; repeating the request later returns them.
+    """
+
+    def __init__(self, message="GitHub is still computing the requested data"):
+        super().__init__(message, code="ACCEPTED")
+
+
 class RateLimitExceededError(GitHubAPIError):
     """Raised when the GitHub API rate limit is exceeded"""
 
@@ -33,3 +44,31 @@ class ServerError(GitHubAPIError):
 
     def __init__(self, message="GitHub API server error"):
         super().__init__(message, code="SERVER_ERROR")
+
+
+class InvalidSignatureError(GitHubAPIError):
+    """Raised when a webhook delivery's signature does not match its payload"""
+
+    def __init__(self, message="Invalid webhook signature"):
+        super().__init__(message, code="INVALID_SIGNATURE")
+
+
+def error_for_status(status_code, headers):
+    """Return the exception to raise for an unsuccessful response."""
+    if status_code == 202:
+        return AcceptedError()
+    elif status_code == 401:
+        return AuthenticationError()
+    elif (
+        status_code == 403
+        and "X-RateLimit-Remaining" in headers
+        and int(headers["X-RateLimit-Remaining"]) == 0
+    ):
+        return RateLimitExceededError()
+    elif status_code == 404:
+        return NotFoundError()
+    elif 500 <= status_code < 600:
+        return ServerError()
+    return GitHubAPIError(
+        f"GitHub API request failed: {status_code}", code="UNKNOWN_ERROR"
+    )
@@ -1,4 +1,6 @@
+import re
 from datetime import datetime
+from functools import lru_cache
 
 
 def format_repo_info(repo):
@@ -16,19 +18,25 @@ Last Updated: {format_date(repo['updated_at'])}
 
 
 def format_repo_contributors(contributors):
-    formatted = "Repository Contributors:\n"
+    return "".join(iter_format_repo_contributors(contributors))
+
+
+def iter_format_repo_contributors(contributors):
+    yield "Repository Contributors:\n"
     for contributor in contributors:
-        formatted += f"- {contributor['login']} (Contributions: {contributor['contributions']})\n"
-    return formatted
+        yield f"- {contributor['login']} (Contributions: {contributor['contributions']})\n"
 
 
 def format_repo_languages(languages):
+    return "".join(iter_format_repo_languages(languages))
+
+
+def iter_format_repo_languages(languages):
     total = sum(languages.values())
-    formatted = "Repository Languages:\n"
+    yield "Repository Languages:\n"
     for language, bytes in languages.items():
         percentage = (bytes / total) * 100
-        formatted += f"- {language}: {percentage:.1f}% ({bytes} bytes)\n"
-    return formatted
+        yield f"- {language}: {percentage:.1f}% ({bytes} bytes)\n"
 
 
 def format_repo_readme(readme):
@@ -42,27 +50,33 @@ Content:
 
 
 def format_repo_issues(issues):
-    formatted = "Repository Issues:\n"
+    return "".join(iter_format_repo_issues(issues))
+
+
+def iter_format_repo_issues(issues):
+    yield "Repository Issues:\n"
     for issue in issues:
-        formatted += f"""- #{issue['number']}: {issue['title']}
+        yield f"""- #{issue['number']}: {issue['title']}
   State: {issue['state']}
   Created: {format_date(issue['created_at'])}
   Comments: {issue['comments']}
   
 """
-    return formatted
 
 
 def format_pull_requests(prs):
-    formatted = "Pull Requests:\n"
+    return "".join(iter_format_pull_requests(prs))
+
+
+def iter_format_pull_requests(prs):
+    yield "Pull Requests:\n"
     for pr in prs:
-        formatted += f"""- #{pr['number']}: {pr['title']}
+        yield f"""- #{pr['number']}: {pr['title']}
   State: {pr['state']}
   Created: {format_date(pr['created_at'])}
   User: {pr['user']['login']}
   
 """
-    return formatted
 
 
 def format_user_info(user):
@@ -79,29 +93,35 @@ Created: {format_date(user['created_at'])}
 
 
 def format_user_repos(repos):
-    formatted = "User Repositories:\n"
+    return "".join(iter_format_user_repos(repos))
+
+
+def iter_format_user_repos(repos):
+    yield "User Repositories:\n"
     for repo in repos:
-        formatted += f"""- {repo['name']}
+        yield f"""- {repo['name']}
   Description: {repo['description'] or 'N/A'}
   Stars: {repo['stargazers_count']}
   Forks: {repo['forks_count']}
   Language: {repo['language'] or 'N/A'}
   
 """
-    return formatted
 
 
 def format_user_gists(gists):
-    formatted = "User Gists:\n"
+    return "".join(iter_format_user_gists(gists))
+
+
+def iter_format_user_gists(gists):
+    yield "User Gists:\n"
     for gist in gists:
-        formatted += f"""- {list(gist['files'].keys())[0]}
+        yield f"""- {list(gist['files'].keys())[0]}
   Description: {gist['description'] or 'N/A'}
   Created: {format_date(gist['created_at'])}
   Updated: {format_date(gist['updated_at'])}
   Comments: {gist['comments']}
   
 """
-    return formatted
 
 
 def format_org_info(org):
@@ -121,30 +141,66 @@ def format_org_repos(repos):
     return format_user_repos(repos)  # The format is the same as user repos
 
 
+def iter_format_org_repos(repos):
+    return iter_format_user_repos(repos)
+
+
+def format_org_stats(stats):
+    return "".join(iter_format_org_stats(stats))
+
+
+def iter_format_org_stats(stats):
+    yield f"""Organization Statistics:
+Organization: {stats['org']}
+Repositories: {stats['repos']}
+Stars: {stats['stars']}
+Forks: {stats['forks']}
+Open Issues: {stats['open_issues']}
+Watchers: {stats['watchers']}
+"""
+    yield "Languages:\n"
+    for language, share in stats["languages"].items():
+        yield f"- {language}: {share['share']:.1f}% ({share['bytes']} bytes)\n"
+    yield "Weekly Commits:\n"
+    for week in stats["commits_per_week"]:
+        date = datetime.fromtimestamp(week["week"]).strftime("%Y-%m-%d")
+        yield f"Week of {date}: {week['total']} commits\n"
+    if stats["errors"]:
+        yield f"Errors ({len(stats['errors'])}):\n"
+        for error in stats["errors"]:
+            yield f"- {error['repo']} ({error['call']}): {error['error']}\n"
+
+
 def format_search_repos(search_results):
-    formatted = f"Search Results (Total: {search_results['total_count']}):\n"
+    return "".join(iter_format_search_repos(search_results))
+
+
+def iter_format_search_repos(search_results):
+    yield f"Search Results (Total: {search_results['total_count']}):\n"
     for repo in search_results["items"]:
-        formatted += f"""- {repo['full_name']}
+        yield f"""- {repo['full_name']}
   Description: {repo['description'] or 'N/A'}
   Stars: {repo['stargazers_count']}
   Forks: {repo['forks_count']}
   Language: {repo['language'] or 'N/A'}
   
 """
-    return formatted
 
 
 def format_search_issues(search_results):
-    formatted = f"Search Results (Total: {search_results['total_count']}):\n"
+    return "".join(iter_format_search_issues(search_results))
+
+
+def iter_format_search_issues(search_results):
+    yield f"Search Results (Total: {search_results['total_count']}):\n"
     for issue in search_results["items"]:
-        formatted += f"""- {issue['title']} (#{issue['number']})
+        yield f"""- {issue['title']} (#{issue['number']})
   Repository: {issue['repository_url'].split('/')[-2]}/{issue['repository_url'].split('/')[-1]}
   State: {issue['state']}
   Created: {format_date(issue['created_at'])}
   Comments: {issue['comments']}
   
 """
-    return formatted
 
 
 def format_repo_stats(stats):
@@ -157,35 +213,44 @@ Watchers: {stats['watchers']}
 
 
 def format_commit_activity(activity):
-    formatted = "Weekly Commit Activity:\n"
+    return "".join(iter_format_commit_activity(activity))
+
+
+def iter_format_commit_activity(activity):
+    yield "Weekly Commit Activity:\n"
     for week in activity:
         date = datetime.fromtimestamp(week["week"]).strftime("%Y-%m-%d")
-        formatted += f"Week of {date}: {week['total']} commits\n"
-        formatted += "  Sun: {0}, Mon: {1}, Tue: {2}, Wed: {3}, Thu: {4}, Fri: {5}, Sat: {6}\n".format(
+        yield f"Week of {date}: {week['total']} commits\n"
+        yield "  Sun: {0}, Mon: {1}, Tue: {2}, Wed: {3}, Thu: {4}, Fri: {5}, Sat: {6}\n".format(
             *week["days"]
         )
-    return formatted
 
 
 def format_code_frequency(frequency):
-    formatted = "Weekly Code Frequency:\n"
+    return "".join(iter_format_code_frequency(frequency))
+
+
+def iter_format_code_frequency(frequency):
+    yield "Weekly Code Frequency:\n"
     for week in frequency:
         date = datetime.fromtimestamp(week[0]).strftime("%Y-%m-%d")
-        formatted += f"Week of {date}: +{week[1]} additions, -{week[2]} deletions\n"
-    return formatted
+        yield f"Week of {date}: +{week[1]} additions, -{week[2]} deletions\n"
 
 
 def format_contributor_stats(stats):
-    formatted = "Contributor Statistics:\n"
+    return "".join(iter_format_contributor_stats(stats))
+
+
+def iter_format_contributor_stats(stats):
+    yield "Contributor Statistics:\n"
     for contributor in stats:
-        formatted += f"Username: {contributor['author']['login']}\n"
-        formatted += f"  Total Commits: {contributor['total']}\n"
-        formatted += "  Weekly Commits:\n"
+        yield f"Username: {contributor['author']['login']}\n"
+        yield f"  Total Commits: {contributor['total']}\n"
+        yield "  Weekly Commits:\n"
         for week in contributor["weeks"][-4:]:  # Show only last 4 weeks
             date = datetime.fromtimestamp(week["w"]).strftime("%Y-%m-%d")
-            formatted += f"    Week of {date}: {week['c']} commits\n"
-        formatted += "\n"
-    return formatted
+            yield f"    Week of {date}: {week['c']} commits\n"
+        yield "\n"
 
 
 def format_weekly_commits(commits):
@@ -196,6 +261,10 @@ def format_weekly_commits(commits):
 
 
 def format_punch_card(punch_card):
+    return "".join(iter_format_punch_card(punch_card))
+
+
+def iter_format_punch_card(punch_card):
     days = [
         "Sunday",
         "Monday",
@@ -205,13 +274,69 @@ def format_punch_card(punch_card):
         "Friday",
         "Saturday",
     ]
-    formatted = "Commit Punch Card:\n"
+    yield "Commit Punch Card:\n"
     for day, hour, count in punch_card:
-        formatted += f"{days[day]} {hour:02d}:00 - {hour:02d}:59: {count} commits\n"
-    return formatted
+        yield f"{days[day]} {hour:02d}:00 - {hour:02d}:59: {count} commits\n"
+
+
+def format_ingest(result):
+    return "".join(iter_format_ingest(result))
+
 
+def iter_format_ingest(result):
+    yield "Stored in warehouse:\n"
+    for resource, rows in result["stored"].items():
+        yield f"- {resource}: {rows} rows\n"
+    if result["errors"]:
+        yield f"Errors ({len(result['errors'])}):\n"
+        for resource, message in result["errors"].items():
+            yield f"- {resource}: {message}\n"
 
+
+def write_formatted(formatted, stream):
+    """Write formatter output, a string or an iterable of chunks, to ``stream``."""
+    if isinstance(formatted, str):
+        stream.write(formatted)
+        return
+    write = stream.write
+    for chunk in formatted:
+        write(chunk)
+
+
+# GitHub's timestamp shape, e.g. 2011-01-26T19:01:12Z. Years below 1000 are
+# left to strptime, whose strftime output drops their leading zeros.
+_TIMESTAMP = re.compile(r"[1-9]\d{3}-\d\d-\d\dT\d\d:\d\d:\d\dZ", re.ASCII)
+
+
+@lru_cache(maxsize=4096)
 def format_date(date_string):
+    if _TIMESTAMP.fullmatch(date_string):
+        try:
+            # Only validates the fields; the output is a slice of the input.
+            datetime(
+                int(date_string[0:4]),
+                int(date_string[5:7]),
+                int(date_string[8:10]),
+                int(date_string[11:13]),
+                int(date_string[14:16]),
+                int(date_string[17:19]),
+            )
+        except ValueError:
+            pass  # let strptime raise its usual error
+        else:
+            return f"{date_string[:10]} {date_string[11:19]}"
     return datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%SZ").strftime(
         "%Y-%m-%d %H:%M:%S"
     )
+
+
+def format_dates(date_strings):
+    """Return ``format_date`` of every timestamp in ``date_strings`` as a list."""
+    formatted = {}
+    result = []
+    for date_string in date_strings:
+        value = formatted.get(date_string)
+        if value is None:
+            value = formatted[date_string] = format_date(date_string)
+        result.append(value)
+    return result
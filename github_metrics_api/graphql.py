@@ -0,0 +1,93 @@
+from .errors import GitHubAPIError, NotFoundError
+
+# Largest number of repositories fetched by one aliased query. GitHub limits
+# the node count and cost of a query; fifty repositories stay well below.
+MAX_REPOS_PER_QUERY = 50
+
+REPO_STATS_FIELDS = """
+    stargazerCount
+    forkCount
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+    watchers { totalCount }
+    languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+      edges { size node { name } }
+    }
+    defaultBranchRef {
+      target { ... on Commit { history { totalCount } } }
+    }
+"""
+
+
+def repo_stats_query(repos):
+    """Build one aliased GraphQL query for the stats of ``(owner, repo)`` pairs.
+
+    Returns the ``{"query": ..., "variables": ...}`` payload; repository ``i``
+    is aliased ``r{i}``. Names are passed as variables, never interpolated.
+    """
+    declarations, selections, variables = [], [], {}
+    for index, (owner, repo) in enumerate(repos):
+        declarations.append(f"$o{index}: String!, $n{index}: String!")
+        selections.append(
+            f"  r{index}: repository(owner: $o{index}, name: $n{index}) "
+            f"{{{REPO_STATS_FIELDS}  }}"
+        )
+        variables[f"o{index}"] = owner
+        variables[f"n{index}"] = repo
+    query = "query({}) {{\n{}\n}}".format(
+        ", ".join(declarations), "\n".join(selections)
+    )
+    return {"query": query, "variables": variables}
+
+
+def parse_repo_stats(node):
+    """Map a repository node to the dict returned by ``get_repo_stats``.
+
+    ``open_issues`` counts open issues and pull requests, matching the REST
+    ``open_issues_count``. ``languages`` (bytes per language) and ``commits``
+    (commits on the default branch) are only available from this query.
+    """
+    branch = node.get("defaultBranchRef") or {}
+    history = (branch.get("target") or {}).get("history") or {}
+    return {
+        "stars": node["stargazerCount"],
+        "forks": node["forkCount"],
+        "open_issues": node["issues"]["totalCount"]
+        + node["pullRequests"]["totalCount"],
+        "watchers": node["watchers"]["totalCount"],
+        "languages": {
+            edge["node"]["name"]: edge["size"] for edge in node["languages"]["edges"]
+        },
+        "commits": history.get("totalCount", 0),
+    }
+
+
+def repo_stats_results(repos, response):
+    """Split a batch response into a ``(stats, error)`` pair per repository."""
+    errors = {}
+    for error in response.get("errors") or []:
+        path = error.get("path") or []
+        if path:
+            errors[path[0]] = error
+    data = response.get("data")
+    if data is None:
+        messages = "; ".join(e.get("message", "") for e in response.get("errors") or [])
+        raise GitHubAPIError(
+            f"GraphQL query failed: {messages or 'no data returned'}",
+            code="GRAPHQL_ERROR",
+        )
+
+    results = []
+    for index in range(len(repos)):
+        alias = f"r{index}"
+        node = data.get(alias)
+        if node is not None:
+            results.append((parse_repo_stats(node), None))
+            continue
+        error = errors.get(alias, {})
+        message = error.get("message", "Requested resource not found")
+        if error.get("type", "NOT_FOUND") == "NOT_FOUND":
+            results.append((None, NotFoundError(message)))
+        else:
+            results.append((None, GitHubAPIError(message, code="GRAPHQL_ERROR")))
+    return results
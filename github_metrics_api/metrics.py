@@ -0,0 +1,160 @@
+import threading
+from bisect import bisect_left
+
+# Upper bounds in seconds of the latency histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value, buckets):
+        self.counts[bisect_left(buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(**labels):
+    escaped = (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in labels.values()
+    )
+    return ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped))
+
+
+class MetricsCollector:
+    """Aggregate request events into counters and latency histograms.
+
+    Pass the collector as a request hook, ``GitHubMetricsAPI(hooks=[collector])``.
+    Requests are grouped by endpoint family (the route template, e.g.
+    ``repos/{owner}/{repo}/issues``), so metrics stay bounded however many
+    repositories are queried. :meth:`export` renders them in the Prometheus
+    text exposition format.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="github_api"):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}  # (template, method, status) -> count
+            self.latencies = {}  # template -> _Histogram
+            self.bytes = {}  # template -> response body bytes
+            self.cache = {}  # (template, outcome) -> count
+            self.rate_limit_remaining = {}  # resource -> last reported value
+
+    def __call__(self, event):
+        self.observe(event)
+
+    def observe(self, event):
+        """Record one :class:`~github_metrics_api.api.RequestEvent`."""
+        status = "error" if event.status is None and event.error else event.status
+        with self._lock:
+            if event.cache != "hit":
+                # Cache hits never reach GitHub; they only count as cache outcomes.
+                key = (event.template, event.method, str(status))
+                self.requests[key] = self.requests.get(key, 0) + 1
+                histogram = self.latencies.get(event.template)
+                if histogram is None:
+                    histogram = self.latencies[event.template] = _Histogram(
+                        self.buckets
+                    )
+                histogram.observe(event.latency, self.buckets)
+            if event.bytes:
+                self.bytes[event.template] = (
+                    self.bytes.get(event.template, 0) + event.bytes
+                )
+            if event.cache is not None:
+                key = (event.template, event.cache)
+                self.cache[key] = self.cache.get(key, 0) + 1
+            if event.rate_limit_remaining is not None:
+                self.rate_limit_remaining[event.resource] = event.rate_limit_remaining
+
+    def stats(self):
+        """Return request counts, mean latency and bytes per endpoint family."""
+        with self._lock:
+            families = {}
+            for (template, _, status), count in self.requests.items():
+                family = families.setdefault(
+                    template, {"requests": 0, "errors": 0, "bytes": 0}
+                )
+                family["requests"] += count
+                if status == "error" or status.isdigit() and int(status) >= 400:
+                    family["errors"] += count
+            for template, family in families.items():
+                histogram = self.latencies.get(template)
+                family["bytes"] = self.bytes.get(template, 0)
+                family["mean_latency"] = (
+                    histogram.sum / histogram.count if histogram else 0.0
+                )
+            return {
+                "endpoints": families,
+                "rate_limit_remaining": dict(self.rate_limit_remaining),
+            }
+
+    def export(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        name = self.prefix
+        lines = []
+        with self._lock:
+            lines.append(f"# HELP {name}_requests_total Requests sent to GitHub.")
+            lines.append(f"# TYPE {name}_requests_total counter")
+            for (template, method, status), count in sorted(self.requests.items()):
+                labels = _labels(endpoint=template, method=method, status=status)
+                lines.append(f"{name}_requests_total{{{labels}}} {count}")
+
+            lines.append(
+                f"# HELP {name}_request_duration_seconds "
+                "Latency of requests that reached GitHub."
+            )
+            lines.append(f"# TYPE {name}_request_duration_seconds histogram")
+            for template, histogram in sorted(self.latencies.items()):
+                cumulative = 0
+                bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    labels = _labels(endpoint=template, le=bound)
+                    lines.append(
+                        f"{name}_request_duration_seconds_bucket{{{labels}}} "
+                        f"{cumulative}"
+                    )
+                labels = _labels(endpoint=template)
+                lines.append(
+                    f"{name}_request_duration_seconds_sum{{{labels}}} {histogram.sum}"
+                )
+                lines.append(
+                    f"{name}_request_duration_seconds_count{{{labels}}} "
+                    f"{histogram.count}"
+                )
+
+            lines.append(f"# HELP {name}_response_bytes_total Response body bytes.")
+            lines.append(f"# TYPE {name}_response_bytes_total counter")
+            for template, size in sorted(self.bytes.items()):
+                labels = _labels(endpoint=template)
+                lines.append(f"{name}_response_bytes_total{{{labels}}} {size}")
+
+            lines.append(
+                f"# HELP {name}_cache_requests_total Requests by cache outcome."
+            )
+            lines.append(f"# TYPE {name}_cache_requests_total counter")
+            for (template, outcome), count in sorted(self.cache.items()):
+                labels = _labels(endpoint=template, outcome=outcome)
+                lines.append(f"{name}_cache_requests_total{{{labels}}} {count}")
+
+            lines.append(
+                f"# HELP {name}_rate_limit_remaining "
+                "Remaining rate-limit quota last reported by GitHub."
+            )
+            lines.append(f"# TYPE {name}_rate_limit_remaining gauge")
+            for resource, remaining in sorted(self.rate_limit_remaining.items()):
+                labels = _labels(resource=resource)
+                lines.append(f"{name}_rate_limit_remaining{{{labels}}} {remaining}")
+        return "\n".join(lines) + "\n"
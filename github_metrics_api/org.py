@@ -0,0 +1,113 @@
+import requests
+
+from .errors import AcceptedError, GitHubAPIError
+
+# Calls made for every repository of the organization.
+REPO_CALLS = ("get_repo_stats", "list_repo_languages")
+ACTIVITY_CALL = "get_commit_activity"
+
+
+def aggregate_org_metrics(
+    api, org, max_workers=None, commit_activity=True, timeout=300.0, progress=None
+):
+    """Crawl every repository of ``org`` and aggregate their metrics.
+
+    Lists all repositories, then fetches ``get_repo_stats``,
+    ``list_repo_languages`` and (with ``commit_activity``) the weekly commit
+    activity of each one concurrently through ``api.fetch_many``. Activity
+    still being computed by GitHub is polled with ``api.warm_stats`` for up to
+    ``timeout`` seconds. ``progress(done, total)`` is called after every
+    completed call.
+
+    Failures do not abort the crawl: the totals cover whatever succeeded and
+    each failed call is listed under ``errors``.
+    """
+    metrics = _OrgMetrics(org)
+    repos = []
+    try:
+        for repo in api.iter_org_repos(org, as_records=True, fields=["name", "owner"]):
+            repos.append((repo.owner.login, repo.name))
+    except (GitHubAPIError, requests.RequestException) as e:
+        if not repos:
+            raise
+        metrics.failed(org, "list_org_repos", e)
+    metrics.repos = len(repos)
+
+    names = REPO_CALLS + ((ACTIVITY_CALL,) if commit_activity else ())
+    calls = [(name, pair) for pair in repos for name in names]
+    total, done = len(calls), 0
+    pending = []
+    for result in api.fetch_many(calls, max_workers):
+        name, (owner, repo) = result.call
+        if isinstance(result.error, AcceptedError):
+            pending.append((owner, repo))
+            continue
+        metrics.add(owner, repo, name, result.value, result.error)
+        done += 1
+        if progress is not None:
+            progress(done, total)
+
+    if pending:
+        results = api.warm_stats(
+            pending, stats=(ACTIVITY_CALL,), max_workers=max_workers, timeout=timeout
+        )
+        for result in results:
+            owner, repo, name = result.call
+            metrics.add(owner, repo, name, result.value, result.error)
+            done += 1
+            if progress is not None:
+                progress(done, total)
+    return metrics.result()
+
+
+class _OrgMetrics:
+    """Running totals of an organization crawl."""
+
+    def __init__(self, org):
+        self.org = org
+        self.repos = 0
+        self.totals = {"stars": 0, "forks": 0, "open_issues": 0, "watchers": 0}
+        self.languages = {}
+        self.weeks = {}
+        self.errors = []
+
+    def failed(self, name, call, error):
+        message = getattr(error, "message", None) or str(error)
+        self.errors.append({"repo": name, "call": call, "error": message})
+
+    def add(self, owner, repo, call, value, error):
+        if error is not None:
+            self.failed(f"{owner}/{repo}", call, error)
+        elif call == "get_repo_stats":
+            for key in self.totals:
+                self.totals[key] += value[key]
+        elif call == "list_repo_languages":
+            for language, size in value.items():
+                self.languages[language] = self.languages.get(language, 0) + size
+        elif call == ACTIVITY_CALL:
+            for week in value or []:
+                self.weeks[week["week"]] = (
+                    self.weeks.get(week["week"], 0) + week["total"]
+                )
+
+    def result(self):
+        total_bytes = sum(self.languages.values())
+        languages = {
+            language: {
+                "bytes": size,
+                "share": size / total_bytes * 100,
+            }
+            for language, size in sorted(
+                self.languages.items(), key=lambda item: (-item[1], item[0])
+            )
+        }
+        return {
+            "org": self.org,
+            "repos": self.repos,
+            **self.totals,
+            "languages": languages,
+            "commits_per_week": [
+                {"week": week, "total": self.weeks[week]} for week in sorted(self.weeks)
+            ],
+            "errors": self.errors,
+        }
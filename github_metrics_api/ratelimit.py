@@ -0,0 +1,167 @@
+import threading
+import time
+
+from .errors import RateLimitExceededError
+
+
+def resource_for(endpoint):
+    """Return the GitHub rate-limit resource an endpoint path counts against."""
+    path = endpoint.split("?", 1)[0].strip("/")
+    if path.startswith("search/"):
+        return "search"
+    if path == "graphql":
+        return "graphql"
+    return "core"
+
+
+def is_rate_limited(status_code, headers):
+    """Return True if a response was rejected for an exhausted primary quota."""
+    return (
+        status_code in (403, 429)
+        and "X-RateLimit-Remaining" in headers
+        and int(headers["X-RateLimit-Remaining"]) == 0
+    )
+
+
+class _Bucket:
+    __slots__ = ("limit", "remaining", "reset", "rate", "tokens", "updated")
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+        self.rate = 0.0
+        self.tokens = 0.0
+        self.updated = 0.0
+
+
+class RateLimiter:
+    """Paces requests so each rate-limit budget lasts until its reset.
+
+    One token bucket is kept per resource (``core``, ``search``, ``graphql``)
+    and per credential, fed from the ``X-RateLimit-*`` headers of every
+    response. Requests go out unthrottled while more than ``low_water`` (a
+    fraction of the limit) of the budget is left. Below that the bucket
+    refills at ``remaining / seconds_until_reset``: short bursts of up to
+    ``burst`` requests go out immediately while a long crawl is slowed down
+    instead of failing with ``RateLimitExceededError``.
+
+    The limiter never sleeps itself: :meth:`delay` returns how long the caller
+    should wait, which lets the sync and asyncio clients share it.
+    """
+
+    def __init__(
+        self, burst=50, reserve=0, max_wait=None, low_water=0.2, clock=time.time
+    ):
+        self.burst = burst
+        self.low_water = low_water
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.waited = 0.0
+
+    def delay(self, resource, key=None):
+        """Take a token for ``resource`` and return the seconds to wait first."""
+        with self._lock:
+            bucket = self._buckets.get((key, resource))
+            now = self.clock()
+            if bucket is None or bucket.reset is None or now >= bucket.reset:
+                return 0.0
+            if bucket.remaining <= self.reserve:
+                wait = self._until_reset(bucket, now)
+            elif bucket.remaining - self.reserve > self.low_water * bucket.limit:
+                # Plenty of budget left: no need to pace yet.
+                bucket.remaining -= 1
+                wait = 0.0
+            else:
+                bucket.tokens = min(
+                    self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate
+                )
+                bucket.updated = now
+                bucket.tokens -= 1
+                bucket.remaining -= 1
+                wait = 0.0 if bucket.tokens >= 0 else -bucket.tokens / bucket.rate
+            return self.record_wait(wait)
+
+    def reset_delay(self, resource, key=None):
+        """Return the seconds until the budget of ``resource`` resets.
+
+        Used after a request was rejected because the quota is exhausted.
+        """
+        with self._lock:
+            bucket = self._buckets.get((key, resource))
+            if bucket is None or bucket.reset is None:
+                raise RateLimitExceededError()
+            bucket.remaining = 0
+            return self.record_wait(self._until_reset(bucket, self.clock()))
+
+    def update(self, headers, resource="core", key=None):
+        """Feed the ``X-RateLimit-*`` headers of a response into its bucket."""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        resource = headers.get("X-RateLimit-Resource") or resource
+        remaining = int(headers["X-RateLimit-Remaining"])
+        reset = float(headers.get("X-RateLimit-Reset", 0))
+        with self._lock:
+            bucket = self._buckets.get((key, resource))
+            if bucket is None:
+                bucket = self._buckets[(key, resource)] = _Bucket()
+            now = self.clock()
+            if bucket.reset != reset:
+                bucket.tokens = min(self.burst, remaining)
+                bucket.updated = now
+            if "X-RateLimit-Limit" in headers:
+                bucket.limit = int(headers["X-RateLimit-Limit"])
+            elif bucket.limit is None or remaining > bucket.limit:
+                bucket.limit = remaining
+            bucket.remaining = remaining
+            bucket.reset = reset
+            bucket.rate = max(remaining - self.reserve, 0) / max(reset - now, 1.0)
+
+    def remaining(self, resource="core", key=None):
+        """Return the last known remaining budget, or None if unknown."""
+        with self._lock:
+            bucket = self._buckets.get((key, resource))
+            if bucket is None or bucket.reset is None:
+                return None
+            if self.clock() >= bucket.reset:
+                return bucket.limit
+            return bucket.remaining
+
+    def record_wait(self, wait):
+        """Account for a wait of ``wait`` seconds and return it.
+
+        Raises ``RateLimitExceededError`` if the wait is longer than
+        ``max_wait``.
+        """
+        if self.max_wait is not None and wait > self.max_wait:
+            raise RateLimitExceededError(
+                f"GitHub API rate limit exceeded; resets in {wait:.0f}s"
+            )
+        if wait > 0:
+            self.waits += 1
+            self.waited += wait
+        return wait
+
+    def stats(self):
+        """Return the wait counters and a snapshot of every bucket."""
+        with self._lock:
+            return {
+                "waits": self.waits,
+                "waited_seconds": self.waited,
+                "buckets": {
+                    resource if key is None else f"{key}:{resource}": {
+                        "limit": bucket.limit,
+                        "remaining": bucket.remaining,
+                        "reset": bucket.reset,
+                    }
+                    for (key, resource), bucket in self._buckets.items()
+                },
+            }
+
+    def _until_reset(self, bucket, now):
+        # One extra second absorbs clock skew between us and GitHub.
+        return max(bucket.reset - now, 0.0) + 1.0
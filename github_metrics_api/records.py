@@ -0,0 +1,233 @@
+class Record:
+    """A compact, typed view of a decoded API object.
+
+    Only the fields listed in ``__slots__`` are kept; everything else GitHub
+    sends (URL templates, nested permissions, ...) is dropped. Records also
+    support ``record["field"]`` and ``record.get("field")`` so they can be
+    passed to the formatters in place of dicts. Fields that are missing from
+    the payload, or not selected with ``fields``, are None.
+    """
+
+    __slots__ = ()
+    # field -> Record subclass of a nested object
+    nested = {}
+
+    @classmethod
+    def from_dict(cls, data, fields=None):
+        """Build a record from a decoded object, keeping only ``fields`` if given."""
+        if fields is None:
+            fields = cls.__slots__
+        else:
+            unknown = set(fields).difference(cls.__slots__)
+            if unknown:
+                raise ValueError(
+                    f"Unknown {cls.__name__} fields: {', '.join(sorted(unknown))}"
+                )
+        data = cls._flatten(data)
+        record = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(record, name, None)
+        for name in fields:
+            value = data.get(name)
+            if value is not None and name in cls.nested:
+                value = cls.nested[name].from_dict(value)
+            setattr(record, name, value)
+        return record
+
+    @classmethod
+    def _flatten(cls, data):
+        """Map a payload onto the record's field names."""
+        return data
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except (AttributeError, TypeError):
+            raise KeyError(name) from None
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def to_dict(self):
+        """Return the record as a plain dict, nested records included."""
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, Record):
+                value = value.to_dict()
+            result[name] = value
+        return result
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self):
+        values = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        )
+        return f"{type(self).__name__}({values})"
+
+
+class User(Record):
+    """A user or organization account, full or as nested in other objects."""
+
+    __slots__ = (
+        "id",
+        "login",
+        "type",
+        "name",
+        "bio",
+        "location",
+        "public_repos",
+        "followers",
+        "following",
+        "created_at",
+    )
+
+
+class Repo(Record):
+    """A repository."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "full_name",
+        "owner",
+        "description",
+        "language",
+        "fork",
+        "archived",
+        "stargazers_count",
+        "forks_count",
+        "open_issues_count",
+        "watchers_count",
+        "subscribers_count",
+        "size",
+        "created_at",
+        "updated_at",
+        "pushed_at",
+    )
+    nested = {"owner": User}
+
+
+class Issue(Record):
+    """An issue; pull requests listed as issues have ``pull_request`` set."""
+
+    __slots__ = (
+        "id",
+        "number",
+        "title",
+        "state",
+        "user",
+        "comments",
+        "repository_url",
+        "pull_request",
+        "created_at",
+        "updated_at",
+        "closed_at",
+    )
+    nested = {"user": User}
+
+    @classmethod
+    def _flatten(cls, data):
+        if data.get("pull_request") is not None:
+            data = dict(data, pull_request=True)
+        return data
+
+
+class PullRequest(Record):
+    """A pull request."""
+
+    __slots__ = (
+        "id",
+        "number",
+        "title",
+        "state",
+        "user",
+        "draft",
+        "comments",
+        "created_at",
+        "updated_at",
+        "closed_at",
+        "merged_at",
+    )
+    nested = {"user": User}
+
+
+class Commit(Record):
+    """A commit; the git author and message are lifted from ``commit``."""
+
+    __slots__ = (
+        "sha",
+        "message",
+        "author",
+        "author_name",
+        "author_email",
+        "date",
+        "additions",
+        "deletions",
+    )
+    nested = {"author": User}
+
+    @classmethod
+    def _flatten(cls, data):
+        commit = data.get("commit") or {}
+        git_author = commit.get("author") or {}
+        stats = data.get("stats") or {}
+        return {
+            "sha": data.get("sha"),
+            "message": commit.get("message"),
+            "author": data.get("author"),
+            "author_name": git_author.get("name"),
+            "author_email": git_author.get("email"),
+            "date": git_author.get("date"),
+            "additions": stats.get("additions"),
+            "deletions": stats.get("deletions"),
+        }
+
+
+class WorkflowRun(Record):
+    """A GitHub Actions workflow run."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "run_number",
+        "event",
+        "status",
+        "conclusion",
+        "head_branch",
+        "head_sha",
+        "actor",
+        "created_at",
+        "updated_at",
+        "run_started_at",
+    )
+    nested = {"actor": User}
+
+
+def convert(data, record_type, as_records=False, fields=None):
+    """Return one decoded object as a record, a projected dict, or unchanged.
+
+    Without ``as_records``, ``fields`` keeps only the given keys of the dict.
+    """
+    if as_records:
+        return record_type.from_dict(data, fields)
+    if fields is not None:
+        return {name: data[name] for name in fields if name in data}
+    return data
+
+
+def convert_all(items, record_type, as_records=False, fields=None):
+    """Apply :func:`convert` to a list, or lazily to any other iterable."""
+    if not as_records and fields is None:
+        return items
+    if isinstance(items, list):
+        return [convert(item, record_type, as_records, fields) for item in items]
+    return (convert(item, record_type, as_records, fields) for item in items)
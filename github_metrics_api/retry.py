@@ -0,0 +1,116 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+def retry_after(headers):
+    """Return the delay in seconds requested by a ``Retry-After`` header."""
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    Only idempotent methods are retried: on connection errors, on the
+    ``statuses`` listed (transient 5xx by default) and on secondary rate
+    limits (403/429 carrying ``Retry-After``). The wait honours
+    ``Retry-After`` and otherwise backs off exponentially from ``backoff``
+    up to ``max_backoff``, with full jitter. Each attempt is sent with a
+    ``timeout`` in seconds, cut to the time left when ``deadline`` bounds the
+    total time spent on one call, waits included.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff=0.5,
+        max_backoff=30.0,
+        jitter=True,
+        deadline=None,
+        timeout=30.0,
+        statuses=(500, 502, 503, 504),
+        methods=("GET", "HEAD", "OPTIONS"),
+    ):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.deadline = deadline
+        self.timeout = timeout
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.gave_up = 0
+        self.retries_by_reason = {}
+
+    def is_retryable(self, method, status_code=None, headers=None):
+        """Return True if a response (or, without status, an error) may be retried."""
+        if method not in self.methods:
+            return False
+        if status_code is None or status_code in self.statuses:
+            return True
+        return status_code in (403, 429) and retry_after(headers) is not None
+
+    def delay(self, attempt, headers=None):
+        """Return the seconds to wait before attempt number ``attempt + 1``."""
+        if headers is not None:
+            requested = retry_after(headers)
+            if requested is not None:
+                return requested
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def attempt_timeout(self, started):
+        """Return the timeout for an attempt of a call begun at ``started``."""
+        if self.deadline is None:
+            return self.timeout
+        # next_delay never sleeps past the deadline, so some time is left.
+        left = max(self.deadline - (time.monotonic() - started), 0.001)
+        return left if self.timeout is None else min(self.timeout, left)
+
+    def next_delay(self, attempt, started, reason, headers=None):
+        """Return the wait before retrying, or None if the call should give up.
+
+        ``attempt`` is the number of attempts made so far and ``started`` the
+        ``time.monotonic()`` at which the call began.
+        """
+        delay = None
+        if attempt < self.max_attempts:
+            delay = self.delay(attempt, headers)
+            if (
+                self.deadline is not None
+                and time.monotonic() + delay - started > self.deadline
+            ):
+                delay = None
+        with self._lock:
+            if delay is None:
+                self.gave_up += 1
+            else:
+                self.retries += 1
+                self.retries_by_reason[reason] = (
+                    self.retries_by_reason.get(reason, 0) + 1
+                )
+        return delay
+
+    def stats(self):
+        """Return retry counters for monitoring."""
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+                "retries_by_reason": dict(self.retries_by_reason),
+            }
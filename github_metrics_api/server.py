@@ -0,0 +1,275 @@
+import io
+import json
+import signal
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+
+from . import formatters
+from .api import GitHubMetricsAPI
+from .cache import ResponseCache
+from .commands import resolve
+from .errors import GitHubAPIError, InvalidSignatureError
+from .metrics import MetricsCollector
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .webhooks import WebhookReceiver
+
+# HTTP status answered for each GitHubAPIError code; anything else is 502.
+ERROR_STATUSES = {
+    "ACCEPTED": 202,
+    "NOT_FOUND": 404,
+    "NOT_STORED": 404,
+    "RATE_LIMIT_EXCEEDED": 429,
+}
+
+# GitHub caps webhook payloads at 25 MB.
+MAX_WEBHOOK_BYTES = 25 * 1024 * 1024
+
+
+def _command(parts, query):
+    """Map a URL path to the parameters of a CLI command, or None."""
+    kind = parts[0] if parts else None
+    if kind == "repos" and len(parts) in (3, 4):
+        action = parts[3] if len(parts) == 4 else "info"
+        return {
+            "command": "repo",
+            "owner": parts[1],
+            "repo": parts[2],
+            "action": action,
+        }
+    if kind == "users" and len(parts) in (2, 3):
+        action = parts[2] if len(parts) == 3 else "info"
+        return {"command": "user", "username": parts[1], "action": action}
+    if kind == "orgs" and len(parts) in (2, 3):
+        action = parts[2] if len(parts) == 3 else "info"
+        return {"command": "org", "org": parts[1], "action": action}
+    if kind == "search" and len(parts) == 2:
+        return {
+            "command": "search",
+            "type": parts[1],
+            "query": query.get("q"),
+            "sort": query.get("sort"),
+            "order": query.get("order"),
+        }
+    return None
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Answer ``GET`` requests with the JSON (or pretty) output of a command.
+
+    Routes follow the command line: ``/repos/{owner}/{repo}/{action}``,
+    ``/users/{username}/{action}``, ``/orgs/{org}/{action}`` and
+    ``/search/{repos,issues}?q=...``, plus ``/healthz``, ``/stats`` and
+    ``/metrics``. Add ``?format=pretty`` for the formatted text. Webhook
+    deliveries are accepted with ``POST /webhooks``.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "github-metrics"
+    # Idle keep-alive connections are dropped, so shutdown is not held up.
+    timeout = 5
+
+    def do_GET(self):
+        try:
+            self._route()
+        except Exception as e:
+            # One bad request must not take the connection down unanswered.
+            self.log_error("Error answering %s: %r", self.path, e)
+            self._send_error(500, "Internal server error", "INTERNAL_ERROR")
+
+    def _route(self):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if parts == ["healthz"]:
+            return self._send_json(200, {"status": "ok"})
+        if parts == ["stats"]:
+            return self._send_json(200, self.server.stats())
+        if parts == ["metrics"]:
+            if self.server.metrics is None:
+                return self._send_error(404, "Metrics are not collected", "NOT_FOUND")
+            body = self.server.metrics.export().encode()
+            return self._send(200, body, "text/plain; version=0.0.4; charset=utf-8")
+
+        params = _command(parts, query)
+        if params is None:
+            return self._send_error(404, f"No route for {url.path}", "NOT_FOUND")
+        try:
+            name, args, kwargs, formatter = resolve(params)
+        except ValueError as e:
+            return self._send_error(400, str(e), "INVALID_COMMAND")
+        try:
+            data = getattr(self.server.api, name)(*args, **kwargs)
+        except GitHubAPIError as e:
+            status = ERROR_STATUSES.get(e.code, 502)
+            return self._send_error(status, e.message, e.code)
+        except requests.RequestException as e:
+            return self._send_error(502, str(e), "REQUEST_FAILED")
+
+        if query.get("format") == "pretty":
+            out = io.StringIO()
+            formatters.write_formatted(getattr(formatters, formatter)(data), out)
+            return self._send(200, out.getvalue().encode(), "text/plain; charset=utf-8")
+        self._send_json(200, data)
+
+    def do_POST(self):
+        try:
+            self._receive()
+        except Exception as e:
+            self.log_error("Error answering %s: %r", self.path, e)
+            self._send_error(500, "Internal server error", "INTERNAL_ERROR")
+
+    def _receive(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_WEBHOOK_BYTES:
+            self.close_connection = True
+            return self._send_error(413, "Payload too large", "PAYLOAD_TOO_LARGE")
+        body = self.rfile.read(length)
+        path = urlsplit(self.path).path.rstrip("/")
+        if path != "/webhooks" or self.server.webhooks is None:
+            return self._send_error(404, f"No route for {path}", "NOT_FOUND")
+        try:
+            result = self.server.webhooks.handle(
+                self.headers.get("X-GitHub-Event"),
+                body,
+                self.headers.get("X-Hub-Signature-256"),
+            )
+        except InvalidSignatureError as e:
+            return self._send_error(401, e.message, e.code)
+        except ValueError as e:
+            return self._send_error(400, str(e), "INVALID_PAYLOAD")
+        self._send_json(200, result)
+
+    def _send_error(self, status, message, code):
+        self._send_json(status, {"error": {"message": message, "code": code}})
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode(), "application/json")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.stopping:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.log_requests:
+            super().log_message(format, *args)
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """A threaded HTTP server answering every request from one shared client.
+
+    All consumers share the client's cache, connection pool, rate-limit
+    budget and request coalescing. :meth:`server_close` waits for in-flight
+    requests to finish.
+    """
+
+    daemon_threads = False
+    block_on_close = True
+
+    def __init__(self, address, api, metrics=None, webhooks=None, log_requests=True):
+        super().__init__(address, MetricsRequestHandler)
+        self.api = api
+        self.metrics = metrics
+        self.webhooks = webhooks
+        self.log_requests = log_requests
+        self.stopping = False
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stats(self):
+        """Return cache, coalescing and request statistics as a dict."""
+        stats = {}
+        cache = getattr(self.api, "cache", None)
+        if cache is not None:
+            stats["cache"] = cache.stats()
+        singleflight = getattr(self.api, "singleflight", None)
+        if singleflight is not None:
+            stats["coalescing"] = singleflight.stats()
+        if self.metrics is not None:
+            stats["requests"] = self.metrics.stats()
+        if self.webhooks is not None:
+            stats["webhooks"] = self.webhooks.stats()
+        return stats
+
+    def server_close(self):
+        self.stopping = True
+        super().server_close()
+
+
+def create_server(
+    host="127.0.0.1",
+    port=8000,
+    api=None,
+    access_token=None,
+    pool_size=10,
+    webhook_secret=None,
+    log_requests=True,
+):
+    """Create a :class:`MetricsServer` listening on ``host:port``.
+
+    Without ``api`` a client is built for the service: a response cache,
+    request coalescing, rate limiting, retries and a
+    :class:`~github_metrics_api.metrics.MetricsCollector` served on
+    ``/metrics``. A given ``api`` is used as is; a ``MetricsCollector`` among
+    its hooks is served on ``/metrics``. With ``webhook_secret``, deliveries
+    to ``POST /webhooks`` keep the client's cache fresh through a
+    :class:`~github_metrics_api.webhooks.WebhookReceiver`.
+    """
+    if api is None:
+        metrics = MetricsCollector()
+        api = GitHubMetricsAPI(
+            access_token=access_token,
+            cache=ResponseCache(),
+            pool_size=pool_size,
+            rate_limiter=RateLimiter(),
+            retry=RetryPolicy(),
+            hooks=[metrics],
+            coalesce=True,
+        )
+    else:
+        hooks = getattr(api, "hooks", ())
+        metrics = next((h for h in hooks if isinstance(h, MetricsCollector)), None)
+    webhooks = None
+    if webhook_secret:
+        cache = getattr(api, "cache", None)
+        if cache is None:
+            raise ValueError("webhooks need a client with a response cache")
+        webhooks = WebhookReceiver(webhook_secret, cache)
+    return MetricsServer((host, port), api, metrics, webhooks, log_requests)
+
+
+def serve(server, handle_signals=True):
+    """Serve until SIGINT or SIGTERM, then finish in-flight requests.
+
+    Signal handlers can only be installed from the main thread; pass
+    ``handle_signals=False`` elsewhere and call ``server.shutdown()`` to stop.
+    """
+
+    def stop(signum, frame):
+        # shutdown() waits for serve_forever() to return, so it cannot run
+        # in the thread serving (where the handler runs).
+        threading.Thread(target=server.shutdown).start()
+
+    previous = {}
+    if handle_signals:
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous[signum] = signal.signal(signum, stop)
+    try:
+        server.serve_forever()
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        server.server_close()
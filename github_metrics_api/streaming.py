@@ -0,0 +1,112 @@
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+_decoder = json.JSONDecoder()
+
+# Bytes read from the socket at a time when streaming a response body.
+CHUNK_SIZE = 64 * 1024
+
+
+class _Reader:
+    """A text buffer over an iterator of byte or text chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Append the next chunk to the buffer; return False at the end."""
+        for chunk in self.chunks:
+            if isinstance(chunk, bytes):
+                chunk = self.utf8.decode(chunk)
+            if not chunk:
+                continue
+            if self.pos > CHUNK_SIZE:
+                self.buffer = self.buffer[self.pos :]
+                self.pos = 0
+            self.buffer += chunk
+            return True
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at the end)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Expected one of {chars!r}", self.buffer, self.pos
+            )
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number may continue in the next chunk ("1." then "5e3"), so
+            # only accept it once something other than a number follows.
+            if (
+                isinstance(value, (int, float))
+                and _NUMBER_TAIL.match(self.buffer, end).end() == len(self.buffer)
+                and not self.eof
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks, key=None):
+    """Yield the elements of a JSON array as they are parsed from ``chunks``.
+
+    ``chunks`` is an iterable of ``bytes`` (UTF-8) or ``str`` pieces of a JSON
+    document, e.g. ``response.iter_content()``. Without ``key`` the document
+    must be an array; with ``key`` it must be an object and the elements of
+    its ``key`` member are yielded (``"items"`` for search results). Only the
+    element being parsed is held in memory, besides one chunk of input.
+    """
+    reader = _Reader(chunks)
+    if key is not None and not _seek_member(reader, key):
+        return
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            return
+
+
+def _seek_member(reader, key):
+    """Advance ``reader`` to the value of the top-level member ``key``."""
+    reader.expect("{")
+    if reader.peek() == "}":
+        return False
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name == key:
+            return True
+        reader.value()
+        if reader.expect(",}") == "}":
+            return False
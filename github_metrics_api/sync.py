@@ -0,0 +1,174 @@
+import json
+import os
+import tempfile
+import threading
+
+
+class SyncState:
+    """High-water marks of incremental syncs, persisted as a JSON file.
+
+    Marks are kept per repository and resource. The file is rewritten
+    atomically by :meth:`save`, so an interrupted job leaves either the old
+    or the new marks behind, never a partial file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.marks = json.load(f)
+        except FileNotFoundError:
+            self.marks = {}
+
+    def get(self, owner, repo, resource):
+        """Return the mark of ``resource`` in ``owner/repo``, or None."""
+        with self._lock:
+            return self.marks.get(f"{owner}/{repo}", {}).get(resource)
+
+    def set(self, owner, repo, resource, mark):
+        with self._lock:
+            self.marks.setdefault(f"{owner}/{repo}", {})[resource] = mark
+
+    def reset(self, owner, repo, resource=None):
+        """Forget the marks of a repository (or one of its resources)."""
+        with self._lock:
+            if resource is None:
+                self.marks.pop(f"{owner}/{repo}", None)
+            else:
+                self.marks.get(f"{owner}/{repo}", {}).pop(resource, None)
+
+    def save(self):
+        """Write the marks to ``path`` atomically."""
+        with self._lock:
+            data = json.dumps(self.marks, indent=2, sort_keys=True)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".sync-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _sync(state, owner, repo, resource, items, key, timestamp, pending=None):
+    """Yield ``items`` not seen by the previous sync and advance the mark.
+
+    The mark is the newest ``timestamp`` seen together with the keys of the
+    items at exactly that time, since GitHub's ``since`` filters include the
+    boundary. Items for which ``pending(item)`` is true hold the mark back to
+    their timestamp, so they are fetched again next time; the keys of the
+    other items from there on are kept in the mark (up to ``until``) so they
+    are not yielded twice. The mark only advances once ``items`` is exhausted.
+    """
+    mark = state.get(owner, repo, resource) or {}
+    since = mark.get("since")
+    until = mark.get("until", since)
+    seen = set(mark.get("seen", ()))
+    newest, newest_keys = until, set(seen) if until == since else set()
+    oldest_pending, done = None, []
+    for item in items:
+        item_key, stamp = key(item), timestamp(item)
+        if newest is None or stamp > newest:
+            newest, newest_keys = stamp, {item_key}
+        elif stamp == newest:
+            newest_keys.add(item_key)
+        if pending is not None and pending(item):
+            if oldest_pending is None or stamp < oldest_pending:
+                oldest_pending = stamp
+        else:
+            done.append((stamp, item_key))
+        if item_key in seen and since <= stamp <= until:
+            continue
+        yield item
+    if oldest_pending is not None:
+        keys = sorted(k for stamp, k in done if stamp >= oldest_pending)
+        state.set(
+            owner,
+            repo,
+            resource,
+            {"since": oldest_pending, "until": newest, "seen": keys},
+        )
+    elif newest is not None:
+        state.set(owner, repo, resource, {"since": newest, "seen": sorted(newest_keys)})
+
+
+def sync_commits(api, state, owner, repo):
+    """Yield the commits pushed since the last sync of ``owner/repo``."""
+    mark = state.get(owner, repo, "commits") or {}
+    items = api.iter_commits(owner, repo, since=mark.get("since"))
+    return _sync(
+        state,
+        owner,
+        repo,
+        "commits",
+        items,
+        key=lambda commit: commit["sha"],
+        timestamp=lambda commit: commit["commit"]["committer"]["date"],
+    )
+
+
+def sync_issues(api, state, owner, repo):
+    """Yield the issues (and pull requests) updated since the last sync."""
+    mark = state.get(owner, repo, "issues") or {}
+    items = api.iter_repo_issues(
+        owner,
+        repo,
+        state="all",
+        since=mark.get("since"),
+        sort="updated",
+        direction="asc",
+    )
+    return _sync(
+        state,
+        owner,
+        repo,
+        "issues",
+        items,
+        key=lambda issue: issue["id"],
+        timestamp=lambda issue: issue["updated_at"],
+    )
+
+
+def sync_workflow_runs(api, state, owner, repo):
+    """Yield the workflow runs created since the last sync.
+
+    GitHub can only filter runs by creation time, so runs that had not
+    completed are yielded again by later syncs until they have. Completed
+    runs are yielded once.
+    """
+    mark = state.get(owner, repo, "workflow_runs") or {}
+    since = mark.get("since")
+    items = api.iter_workflow_runs(owner, repo, created=f">={since}" if since else None)
+    return _sync(
+        state,
+        owner,
+        repo,
+        "workflow_runs",
+        items,
+        key=lambda run: run["id"],
+        timestamp=lambda run: run["created_at"],
+        pending=lambda run: run["status"] != "completed",
+    )
+
+
+SYNCS = {
+    "commits": sync_commits,
+    "issues": sync_issues,
+    "workflow_runs": sync_workflow_runs,
+}
+
+
+def sync_repo(api, state, owner, repo, resources=tuple(SYNCS)):
+    """Yield ``(resource, item)`` for everything changed since the last sync.
+
+    The marks in ``state`` are saved after each resource is synced in full.
+    """
+    for resource in resources:
+        for item in SYNCS[resource](api, state, owner, repo):
+            yield resource, item
+        state.save()
@@ -0,0 +1,15 @@
+from unittest.mock import Mock
+
+
+def mock_response(status=200, payload=None, headers=None, content=b"{}", links=None):
+    """Return a stand-in for a ``requests.Response`` from ``session.request``.
+
+    ``payload`` is what ``json()`` returns and ``content`` the raw body.
+    """
+    response = Mock()
+    response.status_code = status
+    response.headers = {} if headers is None else headers
+    response.links = {} if links is None else links
+    response.content = content
+    response.json.return_value = payload
+    return response
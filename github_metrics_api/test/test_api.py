@@ -1,7 +1,13 @@
 import pytest
 from unittest.mock import patch, Mock
 from github_metrics_api.api import GitHubMetricsAPI
-from github_metrics_api.errors import GitHubAPIError, AuthenticationError
+from github_metrics_api.conditional import ValidatorStore
+from github_metrics_api.errors import (
+    GitHubAPIError,
+    AcceptedError,
+    AuthenticationError,
+    NotFoundError,
+)
 
 
 @pytest.fixture
@@ -365,3 +371,222 @@ def test_get_punch_card_failure(api):
 
         with pytest.raises(GitHubAPIError):
             api.get_punch_card("test_owner", "test_repo")
+
+
+def test_conditional_request_served_from_validator_store():
+    api = GitHubMetricsAPI(access_token="test_token", validator_store=ValidatorStore())
+    with patch.object(api.session, "request") as mock_request:
+        first = Mock()
+        first.status_code = 200
+        first.headers = {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024"}
+        first.json.return_value = {"name": "test_repo"}
+        first.content = b'{"name": "test_repo"}'
+        second = Mock()
+        second.status_code = 304
+        second.headers = {}
+        mock_request.side_effect = [first, second]
+
+        assert api.get_repo("test_owner", "test_repo") == {"name": "test_repo"}
+        assert api.get_repo("test_owner", "test_repo") == {"name": "test_repo"}
+
+        mock_request.assert_called_with(
+            "GET",
+            "https://api.github.com/repos/test_owner/test_repo",
+            params=None,
+            json=None,
+            headers={
+                "If-None-Match": '"abc"',
+                "If-Modified-Since": "Mon, 01 Jan 2024",
+            },
+        )
+        second.json.assert_not_called()
+
+    stats = api.validator_store.stats()
+    assert stats["revalidations"] == 1
+    assert stats["hits"] == 1
+
+
+def test_conditional_request_refreshes_changed_body():
+    api = GitHubMetricsAPI(access_token="test_token", validator_store=ValidatorStore())
+    with patch.object(api.session, "request") as mock_request:
+        first = Mock()
+        first.status_code = 200
+        first.headers = {"ETag": '"v1"'}
+        first.json.return_value = [{"title": "Issue 1"}]
+        first.content = b'[{"title": "Issue 1"}]'
+        second = Mock()
+        second.status_code = 200
+        second.headers = {"ETag": '"v2"'}
+        second.json.return_value = [{"title": "Issue 2"}]
+        second.content = b'[{"title": "Issue 2"}]'
+        mock_request.side_effect = [first, second]
+
+        api.list_repo_issues("test_owner", "test_repo")
+        assert api.list_repo_issues("test_owner", "test_repo") == [{"title": "Issue 2"}]
+
+    assert api.validator_store.stats()["misses"] == 1
+    entry = api.validator_store.lookup(
+        "https://api.github.com/repos/test_owner/test_repo/issues", {"state": "open"}
+    )
+    assert entry.etag == '"v2"'
+
+
+def test_iter_repo_issues_follows_next_links(api):
+    with patch.object(api.session, "request") as mock_request:
+        next_url = "https://api.github.com/repositories/1/issues?state=open&page=2"
+        first = Mock()
+        first.status_code = 200
+        first.json.return_value = [{"number": 1}, {"number": 2}]
+        first.links = {"next": {"url": next_url}}
+        second = Mock()
+        second.status_code = 200
+        second.json.return_value = [{"number": 3}]
+        second.links = {}
+        mock_request.side_effect = [first, second]
+
+        issues = list(api.iter_repo_issues("test_owner", "test_repo"))
+        assert [issue["number"] for issue in issues] == [1, 2, 3]
+
+        assert mock_request.call_args_list[0] == (
+            ("GET", "https://api.github.com/repos/test_owner/test_repo/issues"),
+            {"params": {"state": "open", "per_page": 100}, "json": None},
+        )
+        assert mock_request.call_args_list[1] == (
+            ("GET", next_url),
+            {"params": None, "json": None},
+        )
+
+
+def test_iter_workflow_runs_respects_max_items(api):
+    with patch.object(api.session, "request") as mock_request:
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "total_count": 3,
+            "workflow_runs": [{"id": 1}, {"id": 2}, {"id": 3}],
+        }
+        mock_response.links = {"next": {"url": "https://api.github.com/next"}}
+        mock_request.return_value = mock_response
+
+        runs = list(api.iter_workflow_runs("test_owner", "test_repo", max_items=2))
+        assert runs == [{"id": 1}, {"id": 2}]
+        mock_request.assert_called_once_with(
+            "GET",
+            "https://api.github.com/repos/test_owner/test_repo/actions/runs",
+            params={"per_page": 2},
+            json=None,
+        )
+
+
+def test_get_repo_stats_many_reports_errors_per_item(api):
+    def fake_request(method, url, params=None, json=None):
+        response = Mock()
+        if url.endswith("/missing"):
+            response.status_code = 404
+        else:
+            response.status_code = 200
+            response.json.return_value = {
+                "stargazers_count": 1,
+                "forks_count": 2,
+                "open_issues_count": 3,
+                "subscribers_count": 4,
+            }
+        return response
+
+    with patch.object(api.session, "request", side_effect=fake_request):
+        repos = [("test_owner", f"repo{i}") for i in range(5)]
+        repos.append(("test_owner", "missing"))
+        results = list(api.get_repo_stats_many(repos, max_workers=3))
+
+    assert len(results) == 6
+    by_repo = {result.call: result for result in results}
+    assert by_repo[("test_owner", "repo0")].value == {
+        "stars": 1,
+        "forks": 2,
+        "open_issues": 3,
+        "watchers": 4,
+    }
+    assert isinstance(by_repo[("test_owner", "missing")].error, NotFoundError)
+    assert by_repo[("test_owner", "missing")].value is None
+
+
+def test_fetch_many_mixed_calls(api):
+    with patch.object(api.session, "request") as mock_request:
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"login": "octocat"}
+        mock_request.return_value = mock_response
+
+        results = list(
+            api.fetch_many(
+                [
+                    ("get_user", ("octocat",)),
+                    ("list_repo_issues", ("o", "r"), {"state": "closed"}),
+                ]
+            )
+        )
+
+    assert sorted(result.index for result in results) == [0, 1]
+    assert all(result.error is None for result in results)
+
+
+def test_stats_endpoint_202_raises_accepted_error(api):
+    with patch.object(api.session, "request") as mock_request:
+        mock_response = Mock()
+        mock_response.status_code = 202
+        mock_request.return_value = mock_response
+
+        with pytest.raises(AcceptedError):
+            api.get_commit_activity("test_owner", "test_repo")
+
+
+def test_warm_stats_polls_until_ready(api):
+    calls = {}
+
+    def fake_request(method, url, params=None, json=None):
+        calls[url] = calls.get(url, 0) + 1
+        response = Mock()
+        if url.endswith("slow/stats/punch_card") and calls[url] < 3:
+            response.status_code = 202
+        else:
+            response.status_code = 200
+            response.json.return_value = [[0, 0, calls[url]]]
+        return response
+
+    with patch.object(api.session, "request", side_effect=fake_request), patch(
+        "github_metrics_api.api.time.sleep"
+    ) as mock_sleep:
+        results = list(
+            api.warm_stats(
+                [("test_owner", "fast"), ("test_owner", "slow")],
+                stats=["get_punch_card"],
+                initial_delay=1,
+            )
+        )
+
+    assert [result.call for result in results] == [
+        ("test_owner", "fast", "get_punch_card"),
+        ("test_owner", "slow", "get_punch_card"),
+    ]
+    assert results[1].value == [[0, 0, 3]]
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2]
+
+
+def test_warm_stats_times_out(api):
+    with patch.object(api.session, "request") as mock_request, patch(
+        "github_metrics_api.api.time.sleep"
+    ):
+        mock_response = Mock()
+        mock_response.status_code = 202
+        mock_request.return_value = mock_response
+
+        results = list(
+            api.warm_stats(
+                [("test_owner", "test_repo")],
+                stats=["get_code_frequency"],
+                timeout=0,
+            )
+        )
+
+    assert len(results) == 1
+    assert isinstance(results[0].error, AcceptedError)
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from github_metrics_api.async_api import AsyncGitHubMetricsAPI
+from github_metrics_api.errors import NotFoundError
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        base = f"http://{self.headers['Host']}"
+        headers = {}
+        if self.path == "/repos/test_owner/test_repo":
+            status, body = 200, {
+                "stargazers_count": 1000,
+                "forks_count": 500,
+                "open_issues_count": 50,
+                "subscribers_count": 1500,
+            }
+        elif self.path == "/repos/test_owner/test_repo/issues?state=open&per_page=100":
+            status, body = 200, [{"number": 1}, {"number": 2}]
+            headers["Link"] = f'<{base}/issues-page-2>; rel="next"'
+        elif self.path == "/issues-page-2":
+            status, body = 200, [{"number": 3}]
+        elif self.path.startswith("/repos/test_owner/test_repo/commits?"):
+            status, body = 200, [{"path": self.path}]
+        else:
+            status, body = 404, {"message": "Not Found"}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield "http://%s:%d" % httpd.server_address[:2]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def run(coro_factory, base_url):
+    async def main():
+        async with AsyncGitHubMetricsAPI(
+            access_token="test_token", base_url=base_url, max_concurrency=4
+        ) as api:
+            return await coro_factory(api)
+
+    return asyncio.run(main())
+
+
+def test_get_repo_stats(server_url):
+    stats = run(lambda api: api.get_repo_stats("test_owner", "test_repo"), server_url)
+    assert stats == {"stars": 1000, "forks": 500, "open_issues": 50, "watchers": 1500}
+
+
+def test_concurrent_requests(server_url):
+    async def fetch(api):
+        return await asyncio.gather(
+            *(api.get_repo("test_owner", "test_repo") for _ in range(10))
+        )
+
+    repos = run(fetch, server_url)
+    assert len(repos) == 10
+
+
+def test_not_found_maps_to_shared_error(server_url):
+    with pytest.raises(NotFoundError):
+        run(lambda api: api.get_repo("test_owner", "missing"), server_url)
+
+
+def test_iter_repo_issues_follows_next_links(server_url):
+    async def collect(api):
+        return [
+            i["number"] async for i in api.iter_repo_issues("test_owner", "test_repo")
+        ]
+
+    assert run(collect, server_url) == [1, 2, 3]
+
+
+def test_client_without_context_manager(server_url):
+    async def main():
+        api = AsyncGitHubMetricsAPI(access_token="test_token", base_url=server_url)
+        try:
+            return await api.get_repo_stats("test_owner", "test_repo")
+        finally:
+            await api.close()
+
+    assert asyncio.run(main())["stars"] == 1000
+
+
+def test_incremental_sync_params(server_url):
+    async def collect(api):
+        return [c async for c in api.iter_commits("test_owner", "test_repo", since="T")]
+
+    assert run(collect, server_url) == [
+        {"path": "/repos/test_owner/test_repo/commits?since=T&per_page=100"}
+    ]
@@ -0,0 +1,125 @@
+from unittest.mock import patch
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.cache import ResponseCache
+from github_metrics_api.endpoints import endpoint_template
+
+from .helpers import mock_response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_endpoint_template():
+    assert endpoint_template("repos/pytorch/pytorch") == "repos/{owner}/{repo}"
+    assert (
+        endpoint_template("repos/pytorch/pytorch/pulls/42")
+        == "repos/{owner}/{repo}/pulls/{pull_number}"
+    )
+    assert endpoint_template("users/torvalds/repos") == "users/{username}/repos"
+    assert endpoint_template("search/issues") == "search/issues"
+
+
+def test_cache_serves_repeat_get_without_request():
+    api = GitHubMetricsAPI(access_token="test_token", cache=ResponseCache())
+    with patch.object(api.session, "request") as mock_request:
+        mock_request.return_value = mock_response(payload={"name": "test_repo"})
+
+        assert api.get_repo("test_owner", "test_repo") == {"name": "test_repo"}
+        assert api.get_repo("test_owner", "test_repo") == {"name": "test_repo"}
+
+        assert mock_request.call_count == 1
+    stats = api.cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_cache_ttl_per_endpoint_family():
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    cache.set("repo", {}, "repos/o/r")
+    cache.set("issues", [], "repos/o/r/issues")
+
+    clock.now = 120
+    assert cache.get("repo") == {}
+    assert cache.get("issues") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2, max_bytes=100)
+    cache.set("a", 1, "repos/o/a", size=10)
+    cache.set("b", 2, "repos/o/b", size=10)
+    cache.get("a")
+    cache.set("c", 3, "repos/o/c", size=10)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("d", 4, "repos/o/d", size=95)
+    assert len(cache) == 1
+    assert cache.stats()["evictions"] == 3
+
+
+def test_cache_invalidate_repo():
+    api = GitHubMetricsAPI(access_token="test_token", cache=ResponseCache())
+    with patch.object(api.session, "request") as mock_request:
+        mock_request.return_value = mock_response(payload={"Python": 10})
+        api.list_repo_languages("test_owner", "test_repo")
+        api.list_repo_languages("test_owner", "other_repo")
+
+        assert api.invalidate("test_owner", "test_repo") == 1
+        api.list_repo_languages("test_owner", "test_repo")
+        api.list_repo_languages("test_owner", "other_repo")
+
+        assert mock_request.call_count == 3
+
+
+def test_cache_invalidate_endpoint_families():
+    cache = ResponseCache()
+    cache.set("repo", 1, "repos/o/r")
+    cache.set("issues", 2, "repos/o/r/issues")
+    cache.set("issue", 3, "repos/o/r/issues/7")
+    cache.set("other", 4, "repos/o/other/issues")
+
+    assert cache.invalidate("O", "r", {"repos/{owner}/{repo}/issues"}) == 1
+    assert cache.get("issues") is None
+    assert cache.get("issue") == 3
+    assert cache.get("other") == 4
+
+
+def test_cache_update_keeps_expiry():
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    cache.set("repo", {"stars": 1}, "repos/o/r")
+    clock.now = 1800
+    assert cache.update("repos/O/r", lambda value: dict(value, stars=2)) == 1
+    assert cache.get("repo") == {"stars": 2}
+    assert cache.update("repos/o/missing", lambda value: value) == 0
+    clock.now = 3600
+    assert cache.get("repo") is None
+    assert cache.stats()["updates"] == 1
+
+
+def test_cache_keeps_id_based_pages_in_their_endpoint_family():
+    clock = FakeClock()
+    api = GitHubMetricsAPI(access_token="t", cache=ResponseCache(clock=clock))
+    first = mock_response(payload=[{"number": 1}])
+    first.links = {
+        "next": {"url": "https://api.github.com/repositories/1/issues?page=2"}
+    }
+    second = mock_response(payload=[{"number": 2}])
+    second.links = {}
+    with patch.object(api.session, "request") as mock_request:
+        mock_request.side_effect = [first, second] * 2
+        assert len(list(api.iter_repo_issues("o", "r"))) == 2
+        # Both pages expire with the issues TTL, not the default one.
+        clock.now = 120
+        assert len(list(api.iter_repo_issues("o", "r"))) == 2
+        assert mock_request.call_count == 4
+    # And both are dropped with the repository.
+    assert api.invalidate("o", "r") == 2
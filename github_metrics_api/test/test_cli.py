@@ -0,0 +1,207 @@
+import io
+import json
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import github_metrics_api
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.cli import _run_batch, main
+from github_metrics_api.commands import resolve
+from github_metrics_api.errors import NotFoundError
+from github_metrics_api.formatters import format_repo_stats
+from github_metrics_api.warehouse import Warehouse
+
+from .helpers import mock_response
+
+
+def run(capsys, *argv):
+    with patch("sys.argv", ["github-metrics", *argv]):
+        main()
+    return capsys.readouterr().out
+
+
+def test_offline_queries_from_warehouse(tmp_path, capsys):
+    path = str(tmp_path / "metrics.db")
+    with Warehouse(path) as warehouse:
+        warehouse.store_repo(
+            "octo",
+            "hello",
+            {
+                "stargazers_count": 1,
+                "forks_count": 2,
+                "open_issues_count": 3,
+                "subscribers_count": 4,
+            },
+        )
+    with patch("requests.Session.request") as request:
+        out = run(capsys, "--db", path, "repo", "octo", "hello", "stats")
+        request.assert_not_called()
+    stats = {"stars": 1, "forks": 2, "open_issues": 3, "watchers": 4}
+    assert out == format_repo_stats(stats) + "\n"
+
+    out = run(capsys, "--db", path, "repo", "octo", "hello", "punch_card")
+    assert out.startswith("Error: No punch_card stored for octo/hello")
+
+
+def test_commands_dispatch_through_table(capsys):
+    stats = {"stars": 1, "forks": 2, "open_issues": 3, "watchers": 4}
+    with patch.object(GitHubMetricsAPI, "get_repo_stats", return_value=stats) as get:
+        out = run(capsys, "--format", "json", "repo", "octo", "hello", "stats")
+    get.assert_called_once_with("octo", "hello")
+    assert json.loads(out) == stats
+
+    with patch.object(GitHubMetricsAPI, "search_issues", return_value={}) as search:
+        run(capsys, "--format", "json", "search", "issues", "bug", "--sort", "created")
+    search.assert_called_once_with("bug", sort="created", order=None)
+
+
+class ReleasingOutput(io.StringIO):
+    """Set ``event`` once the result of ``line`` has been written."""
+
+    def __init__(self, line, event):
+        super().__init__()
+        self.line, self.event = line, event
+
+    def write(self, text):
+        super().write(text)
+        if json.loads(text)["line"] == self.line:
+            self.event.set()
+
+
+def batch_api(release_on_return=True):
+    api = GitHubMetricsAPI(pool_size=4)
+    first_started = threading.Event()
+    release_first = threading.Event()
+
+    def get_repo_stats(owner, repo):
+        if repo == "slow":
+            first_started.set()
+            release_first.wait(5)
+        return {"repo": repo}
+
+    def get_user(username):
+        # The slow call is in flight before the others complete.
+        first_started.wait(5)
+        if username == "ghost":
+            raise NotFoundError("Not Found")
+        if release_on_return:
+            release_first.set()
+        return {"login": username}
+
+    api.get_repo_stats = get_repo_stats
+    api.get_user = get_user
+    return api, release_first
+
+
+BATCH = [
+    '{"command": "repo", "action": "stats", "owner": "o", "repo": "slow"}\n',
+    "\n",
+    '{"command": "user", "action": "info", "username": "ghost"}\n',
+    "[1, 2]\n",
+    '{"command": "user", "action": "info", "username": "octocat"}\n',
+]
+
+
+def test_batch_writes_results_in_completion_order():
+    # The slow call only returns once the others have been written out.
+    api, release_first = batch_api(release_on_return=False)
+    out = ReleasingOutput(5, release_first)
+    _run_batch(api, BATCH, out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0] == {
+        "line": 4,
+        "error": {
+            "message": "command must be a JSON object",
+            "code": "INVALID_COMMAND",
+        },
+    }
+    assert records[-1]["line"] == 1
+    assert records[-1]["result"] == {"repo": "slow"}
+    by_line = {record["line"]: record for record in records}
+    assert by_line[3]["error"]["code"] == "NOT_FOUND"
+    assert by_line[5]["command"]["username"] == "octocat"
+    assert by_line[5]["result"] == {"login": "octocat"}
+
+
+def test_batch_ordered_writes_results_in_input_order():
+    out = io.StringIO()
+    api, _ = batch_api()
+    _run_batch(api, BATCH, out, ordered=True)
+    lines = [json.loads(line)["line"] for line in out.getvalue().splitlines()]
+    assert lines == [1, 3, 4, 5]
+
+
+def test_resolve_rejects_incomplete_commands():
+    with pytest.raises(ValueError, match="missing arguments: repo"):
+        resolve({"command": "repo", "action": "info", "owner": "o"})
+    with pytest.raises(ValueError, match="unknown command"):
+        resolve({"command": "search", "type": "code", "query": "x"})
+
+
+def test_imports_are_lazy():
+    code = (
+        "import sys, github_metrics_api, github_metrics_api.cli;"
+        "assert 'requests' not in sys.modules, 'requests';"
+        "assert 'dotenv' not in sys.modules, 'dotenv';"
+        "assert 'github_metrics_api.formatters' not in sys.modules, 'formatters';"
+        "from github_metrics_api import GitHubMetricsAPI;"
+        "assert 'requests' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    with pytest.raises(AttributeError):
+        github_metrics_api.NoSuchThing
+    assert "GitHubMetricsAPI" in dir(github_metrics_api)
+
+
+def ample_quota(method, url, **kwargs):
+    """Answer any request like GitHub with most of the hourly quota left."""
+    headers = {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "4000",
+        "X-RateLimit-Reset": str(int(time.time()) + 3600),
+    }
+    path = url.split("api.github.com/", 1)[1]
+    if path == "orgs/octo/repos":
+        payload = [{"name": f"r{i}", "owner": {"login": "octo"}} for i in range(100)]
+    elif path.endswith("/languages"):
+        payload = {"C": 1}
+    elif path.endswith("/stats/commit_activity"):
+        payload = []
+    else:
+        payload = {
+            "stargazers_count": 1,
+            "forks_count": 1,
+            "open_issues_count": 1,
+            "subscribers_count": 1,
+        }
+    return mock_response(200, payload, headers)
+
+
+def test_org_stats_is_not_paced_with_ample_quota(capsys):
+    with patch("requests.Session.request", side_effect=ample_quota), patch(
+        "time.sleep", side_effect=AssertionError("paced")
+    ):
+        out = run(capsys, "--format", "json", "org", "octo", "stats")
+    result = json.loads(out)
+    assert (result["repos"], result["stars"], result["errors"]) == (100, 100, [])
+
+
+def test_batch_is_not_paced_with_ample_quota(tmp_path, capsys):
+    path = tmp_path / "commands.jsonl"
+    commands = (
+        {"command": "repo", "owner": "octo", "repo": f"r{i}", "action": "stats"}
+        for i in range(200)
+    )
+    path.write_text("".join(json.dumps(command) + "\n" for command in commands))
+    with patch("requests.Session.request", side_effect=ample_quota), patch(
+        "time.sleep", side_effect=AssertionError("paced")
+    ):
+        out = run(capsys, "batch", str(path))
+    records = [json.loads(line) for line in out.splitlines()]
+    assert len(records) == 200
+    assert all(record["result"]["stars"] == 1 for record in records)
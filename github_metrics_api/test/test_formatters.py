@@ -0,0 +1,146 @@
+import io
+from datetime import datetime
+
+import pytest
+
+from github_metrics_api.formatters import (
+    format_date,
+    format_dates,
+    format_punch_card,
+    format_repo_issues,
+    format_search_issues,
+    iter_format_contributor_stats,
+    iter_format_repo_issues,
+    write_formatted,
+)
+
+ISSUES = [
+    {
+        "number": 1,
+        "title": "First",
+        "state": "open",
+        "created_at": "2023-01-02T03:04:05Z",
+        "comments": 2,
+    },
+    {
+        "number": 2,
+        "title": "Second",
+        "state": "closed",
+        "created_at": "2023-06-07T08:09:10Z",
+        "comments": 0,
+    },
+]
+
+
+def test_format_repo_issues_output():
+    assert format_repo_issues(ISSUES) == (
+        "Repository Issues:\n"
+        "- #1: First\n  State: open\n  Created: 2023-01-02 03:04:05\n"
+        "  Comments: 2\n  \n"
+        "- #2: Second\n  State: closed\n  Created: 2023-06-07 08:09:10\n"
+        "  Comments: 0\n  \n"
+    )
+
+
+def test_iter_format_consumes_items_lazily():
+    consumed = []
+
+    def issues():
+        for issue in ISSUES:
+            consumed.append(issue["number"])
+            yield issue
+
+    chunks = iter_format_repo_issues(issues())
+    assert next(chunks) == "Repository Issues:\n"
+    assert consumed == []
+    assert next(chunks).startswith("- #1: First")
+    assert consumed == [1]
+    assert "".join(chunks).startswith("- #2: Second")
+
+
+def test_format_search_issues_accepts_iterator():
+    results = {
+        "total_count": 1,
+        "items": iter(
+            [
+                {
+                    "title": "Bug",
+                    "number": 7,
+                    "repository_url": "https://api.github.com/repos/octo/hello",
+                    "state": "open",
+                    "created_at": "2023-01-02T03:04:05Z",
+                    "comments": 1,
+                }
+            ]
+        ),
+    }
+    formatted = format_search_issues(results)
+    assert formatted.startswith("Search Results (Total: 1):\n- Bug (#7)\n")
+    assert "  Repository: octo/hello\n" in formatted
+
+
+def test_write_formatted_matches_format():
+    punch_card = [[day, hour, day + hour] for day in range(7) for hour in range(24)]
+    stream = io.StringIO()
+    write_formatted(format_punch_card(punch_card), stream)
+    assert stream.getvalue() == format_punch_card(punch_card)
+    assert stream.getvalue().count("\n") == 1 + 7 * 24
+
+
+def test_write_formatted_streams_chunks():
+    stats = [
+        {
+            "author": {"login": "octocat"},
+            "total": 5,
+            "weeks": [{"w": 0, "c": 1}] * 6,
+        }
+    ]
+    stream = io.StringIO()
+    write_formatted(iter_format_contributor_stats(stats), stream)
+    output = stream.getvalue()
+    assert output.startswith("Contributor Statistics:\nUsername: octocat\n")
+    assert output.count("    Week of ") == 4
+    assert output.endswith("commits\n\n")
+
+
+def strptime_format(date_string):
+    return datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%SZ").strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+
+
+@pytest.mark.parametrize(
+    "date_string",
+    [
+        "2023-04-05T06:07:08Z",
+        "2024-02-29T23:59:59Z",
+        "1999-12-31T00:00:00Z",
+        "0999-01-01T00:00:00Z",
+        "2023-1-2T3:4:5Z",
+    ],
+)
+def test_format_date_matches_strptime(date_string):
+    assert format_date(date_string) == strptime_format(date_string)
+
+
+@pytest.mark.parametrize(
+    "date_string",
+    [
+        "2023-02-29T00:00:00Z",
+        "2023-01-01T24:00:00Z",
+        "2023-01-01",
+        "2023-13-01T00:00:00Z",
+    ],
+)
+def test_format_date_rejects_invalid(date_string):
+    with pytest.raises(ValueError) as fast:
+        format_date(date_string)
+    with pytest.raises(ValueError) as slow:
+        strptime_format(date_string)
+    assert str(fast.value) == str(slow.value)
+
+
+def test_format_dates():
+    dates = ["2023-01-02T03:04:05Z", "2023-06-07T08:09:10Z"] * 3
+    assert format_dates(dates) == [strptime_format(date) for date in dates]
+    assert format_dates([]) == []
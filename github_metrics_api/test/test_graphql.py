@@ -0,0 +1,89 @@
+from unittest.mock import patch
+
+import pytest
+
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.errors import GitHubAPIError, NotFoundError
+from github_metrics_api.graphql import repo_stats_query, repo_stats_results
+
+from .helpers import mock_response
+
+
+def repo_node(stars):
+    return {
+        "stargazerCount": stars,
+        "forkCount": 5,
+        "issues": {"totalCount": 3},
+        "pullRequests": {"totalCount": 2},
+        "watchers": {"totalCount": 7},
+        "languages": {
+            "edges": [
+                {"size": 1000, "node": {"name": "Python"}},
+                {"size": 10, "node": {"name": "C"}},
+            ]
+        },
+        "defaultBranchRef": {"target": {"history": {"totalCount": 42}}},
+    }
+
+
+def test_repo_stats_query_uses_aliases_and_variables():
+    payload = repo_stats_query([("o1", "r1"), ("o2", 'evil") { x }')])
+    assert "r0: repository(owner: $o0, name: $n0)" in payload["query"]
+    assert "r1: repository(owner: $o1, name: $n1)" in payload["query"]
+    assert "evil" not in payload["query"]
+    assert payload["variables"] == {
+        "o0": "o1",
+        "n0": "r1",
+        "o1": "o2",
+        "n1": 'evil") { x }',
+    }
+
+
+def test_repo_stats_results_maps_rest_shape_and_errors():
+    repos = [("o", "a"), ("o", "missing")]
+    response = {
+        "data": {"r0": repo_node(100), "r1": None},
+        "errors": [{"type": "NOT_FOUND", "path": ["r1"], "message": "Not found"}],
+    }
+    (stats, error), (missing, missing_error) = repo_stats_results(repos, response)
+    assert error is None
+    assert stats == {
+        "stars": 100,
+        "forks": 5,
+        "open_issues": 5,
+        "watchers": 7,
+        "languages": {"Python": 1000, "C": 10},
+        "commits": 42,
+    }
+    assert missing is None
+    assert isinstance(missing_error, NotFoundError)
+
+
+def test_repo_stats_results_query_failure():
+    with pytest.raises(GitHubAPIError):
+        repo_stats_results([("o", "a")], {"errors": [{"message": "Parse error"}]})
+    with pytest.raises(GitHubAPIError, match="no data returned"):
+        repo_stats_results([("o", "a")], {})
+
+
+def test_get_repo_stats_many_graphql_batches():
+    api = GitHubMetricsAPI(access_token="test_token")
+    repos = [("o", f"repo{i}") for i in range(5)]
+
+    def fake_request(method, url, params=None, json=None):
+        count = len(json["variables"]) // 2
+        return mock_response(
+            payload={"data": {f"r{i}": repo_node(10) for i in range(count)}}
+        )
+
+    with patch.object(api.session, "request", side_effect=fake_request) as mock:
+        results = list(api.get_repo_stats_many(repos, graphql=True, batch_size=2))
+
+    assert mock.call_count == 3
+    assert all(
+        c.args == ("POST", "https://api.github.com/graphql")
+        for c in mock.call_args_list
+    )
+    assert sorted(result.index for result in results) == [0, 1, 2, 3, 4]
+    assert {result.call for result in results} == set(repos)
+    assert all(result.value["stars"] == 10 for result in results)
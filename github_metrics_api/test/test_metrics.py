@@ -0,0 +1,154 @@
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from github_metrics_api.api import GitHubMetricsAPI, RequestEvent
+from github_metrics_api.cache import ResponseCache
+from github_metrics_api.conditional import ValidatorStore
+from github_metrics_api.errors import NotFoundError
+from github_metrics_api.metrics import MetricsCollector
+
+from .helpers import mock_response
+
+
+def event(template="repos/{owner}/{repo}", status=200, latency=0.02, **fields):
+    values = dict(
+        method="GET",
+        endpoint="repos/o/r",
+        template=template,
+        resource="core",
+        status=status,
+        latency=latency,
+        bytes=100,
+        rate_limit_remaining=4999,
+        cache=None,
+        error=None,
+    )
+    values.update(fields)
+    return RequestEvent(**values)
+
+
+def test_hooks_receive_request_events():
+    events = []
+    api = GitHubMetricsAPI(access_token="t", hooks=[events.append])
+    with patch.object(api.session, "request") as request:
+        request.side_effect = [
+            mock_response(
+                200,
+                content=b'{"name": "r"}',
+                headers={"X-RateLimit-Remaining": "4999"},
+            ),
+            mock_response(404),
+            requests.ConnectionError("down"),
+        ]
+        api.get_repo("octo", "hello")
+        with pytest.raises(NotFoundError):
+            api.get_pull_request("octo", "hello", 7)
+        with pytest.raises(requests.ConnectionError):
+            api.get_user("octo")
+
+    ok, missing, failed = events
+    assert ok.template == "repos/{owner}/{repo}"
+    assert (ok.status, ok.bytes, ok.rate_limit_remaining) == (200, 13, 4999)
+    assert ok.cache is None and ok.error is None and ok.latency >= 0
+    assert missing.template == "repos/{owner}/{repo}/pulls/{pull_number}"
+    assert missing.status == 404
+    assert failed.status is None
+    assert isinstance(failed.error, requests.ConnectionError)
+
+
+def test_hooks_report_cache_outcomes():
+    events = []
+    api = GitHubMetricsAPI(
+        access_token="t",
+        cache=ResponseCache(),
+        validator_store=ValidatorStore(),
+        hooks=[events.append],
+    )
+    with patch.object(api.session, "request") as request:
+        request.side_effect = [
+            mock_response(
+                200, {"name": "r"}, {"ETag": '"v1"'}, content=b'{"name": "r"}'
+            ),
+            mock_response(304, content=b""),
+        ]
+        api.get_repo("octo", "hello")
+        api.get_repo("octo", "hello")
+        api.invalidate("octo", "hello")
+        api.get_repo("octo", "hello")
+    assert [e.cache for e in events] == ["miss", "hit", "not_modified"]
+    assert events[1].status is None
+
+
+def test_collector_groups_by_endpoint_family():
+    collector = MetricsCollector(buckets=(0.01, 0.1))
+    collector(event(latency=0.005))
+    collector(event(latency=0.05, status=404, rate_limit_remaining=4990))
+    collector(
+        event(
+            status=None,
+            latency=0.5,
+            error=OSError("x"),
+            bytes=None,
+            rate_limit_remaining=None,
+        )
+    )
+    collector(
+        event(
+            template="search/issues",
+            resource="search",
+            cache="hit",
+            bytes=None,
+            rate_limit_remaining=None,
+        )
+    )
+
+    stats = collector.stats()
+    assert stats["endpoints"]["repos/{owner}/{repo}"]["requests"] == 3
+    assert stats["endpoints"]["repos/{owner}/{repo}"]["errors"] == 2
+    assert stats["endpoints"]["repos/{owner}/{repo}"]["bytes"] == 200
+    assert stats["rate_limit_remaining"] == {"core": 4990}
+
+    text = collector.export()
+    assert "# TYPE github_api_request_duration_seconds histogram" in text
+    family = 'endpoint="repos/{owner}/{repo}"'
+    assert f'github_api_request_duration_seconds_bucket{{{family},le="0.01"}} 1' in text
+    assert f'github_api_request_duration_seconds_bucket{{{family},le="0.1"}} 2' in text
+    assert f'github_api_request_duration_seconds_bucket{{{family},le="+Inf"}} 3' in text
+    assert f"github_api_request_duration_seconds_count{{{family}}} 3" in text
+    assert (
+        'github_api_requests_total{endpoint="repos/{owner}/{repo}",'
+        'method="GET",status="error"} 1'
+    ) in text
+    # Cache hits never reached GitHub, so they are only counted as cache outcomes.
+    assert 'duration_seconds_count{endpoint="search/issues"}' not in text
+    assert 'github_api_requests_total{endpoint="search/issues"' not in text
+    assert "search/issues" not in stats["endpoints"]
+    assert (
+        'github_api_cache_requests_total{endpoint="search/issues",outcome="hit"} 1'
+    ) in text
+    assert 'github_api_rate_limit_remaining{resource="core"} 4990' in text
+
+
+def test_collector_escapes_label_values():
+    collector = MetricsCollector()
+    collector(event(template='odd"path\\'))
+    assert 'endpoint="odd\\"path\\\\"' in collector.export()
+
+
+def test_cache_hits_are_not_counted_as_requests():
+    collector = MetricsCollector()
+    api = GitHubMetricsAPI(access_token="t", cache=ResponseCache(), hooks=[collector])
+    with patch.object(api.session, "request") as request:
+        request.return_value = mock_response(
+            200, {"name": "r"}, content=b'{"name": "r"}'
+        )
+        api.get_repo("octo", "hello")
+        api.get_repo("octo", "hello")
+
+    text = collector.export()
+    assert 'status="200"} 1' in text
+    assert 'status="None"' not in text
+    assert collector.stats()["endpoints"]["repos/{owner}/{repo}"]["requests"] == 1
+    assert 'outcome="hit"} 1' in text
@@ -0,0 +1,97 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from github_metrics_api.api import GitHubMetricsAPI, Page
+from github_metrics_api.errors import AcceptedError, NotFoundError
+from github_metrics_api.formatters import format_org_stats
+from github_metrics_api.org import aggregate_org_metrics
+
+REPOS = {
+    "alpha": {"stars": 10, "forks": 1, "issues": 2, "subscribers": 3},
+    "beta": {"stars": 5, "forks": 4, "issues": 0, "subscribers": 1},
+}
+
+
+class FakeGitHub:
+    """Answers _request calls for a two-repository organization."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.activity_requests = 0
+
+    def __call__(self, method, url, endpoint, params=None, data=None):
+        return Page(self.body(endpoint), None)
+
+    def body(self, endpoint):
+        parts = endpoint.split("/")
+        if parts[0] == "orgs":
+            return [
+                {"name": name, "owner": {"login": "acme"}, "url": "..."}
+                for name in REPOS
+            ]
+        repo = REPOS[parts[2]]
+        if parts[3:] == []:
+            return {
+                "stargazers_count": repo["stars"],
+                "forks_count": repo["forks"],
+                "open_issues_count": repo["issues"],
+                "subscribers_count": repo["subscribers"],
+            }
+        if parts[3] == "languages":
+            if parts[2] == "beta":
+                raise NotFoundError()
+            return {"Python": 300, "C": 100}
+        if parts[4] == "commit_activity":
+            if parts[2] == "beta":
+                with self.lock:
+                    self.activity_requests += 1
+                    if self.activity_requests == 1:
+                        raise AcceptedError()
+            return [{"week": 0, "total": 2}, {"week": 604800, "total": 3}]
+        raise AssertionError(endpoint)
+
+
+@pytest.fixture
+def api():
+    api = GitHubMetricsAPI(access_token="test_token")
+    with patch.object(api, "_request", side_effect=FakeGitHub()), patch(
+        "github_metrics_api.api.time.sleep"
+    ):
+        yield api
+
+
+def test_aggregate_org_metrics(api):
+    progress = []
+    stats = aggregate_org_metrics(
+        api, "acme", progress=lambda done, total: progress.append((done, total))
+    )
+    assert stats["org"] == "acme"
+    assert stats["repos"] == 2
+    assert (stats["stars"], stats["forks"], stats["watchers"]) == (15, 5, 4)
+    assert stats["languages"] == {
+        "Python": {"bytes": 300, "share": 75.0},
+        "C": {"bytes": 100, "share": 25.0},
+    }
+    assert stats["commits_per_week"] == [
+        {"week": 0, "total": 4},
+        {"week": 604800, "total": 6},
+    ]
+    assert stats["errors"] == [
+        {
+            "repo": "acme/beta",
+            "call": "list_repo_languages",
+            "error": "Requested resource not found",
+        }
+    ]
+    assert progress[-1] == (6, 6)
+    assert len(progress) == 6
+
+
+def test_format_org_stats(api):
+    stats = aggregate_org_metrics(api, "acme", commit_activity=False)
+    formatted = format_org_stats(stats)
+    assert formatted.startswith("Organization Statistics:\nOrganization: acme\n")
+    assert "- Python: 75.0% (300 bytes)\n" in formatted
+    assert "Errors (1):\n- acme/beta (list_repo_languages): " in formatted
@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+import pytest
+
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.errors import RateLimitExceededError
+from github_metrics_api.ratelimit import RateLimiter, resource_for
+
+from .helpers import mock_response
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def headers(remaining, reset, resource="core", limit=5000):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def test_resource_for():
+    assert resource_for("repos/o/r") == "core"
+    assert resource_for("search/issues") == "search"
+    assert resource_for("graphql") == "graphql"
+
+
+def test_unknown_budget_does_not_wait():
+    limiter = RateLimiter()
+    assert limiter.delay("core") == 0.0
+
+
+def test_burst_then_paced_to_reset():
+    clock = FakeClock()
+    limiter = RateLimiter(burst=2, clock=clock)
+    limiter.update(headers(remaining=10, reset=1100), "core")
+
+    assert limiter.delay("core") == 0.0
+    assert limiter.delay("core") == 0.0
+    # 10 requests left for 100 seconds: one request every 10 seconds.
+    assert limiter.delay("core") == pytest.approx(10.0)
+    assert limiter.stats()["waits"] == 1
+
+
+def test_ample_quota_is_not_paced():
+    clock = FakeClock()
+    limiter = RateLimiter(burst=2, clock=clock)
+    limiter.update(headers(remaining=4000, reset=1100), "core")
+
+    assert [limiter.delay("core") for _ in range(100)] == [0.0] * 100
+    assert limiter.stats()["waits"] == 0
+
+    # Pacing starts once the budget is down to the low-water mark.
+    limiter.update(headers(remaining=1000, reset=1100), "core")
+    assert [limiter.delay("core") for _ in range(3)][-1] == pytest.approx(0.1)
+
+
+def test_buckets_are_separate_per_resource():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    limiter.update(headers(remaining=0, reset=1030, resource="search"), "search")
+    limiter.update(headers(remaining=4000, reset=4000), "core")
+
+    assert limiter.delay("core") == 0.0
+    assert limiter.delay("search") == pytest.approx(31.0)
+
+
+def test_max_wait_raises():
+    clock = FakeClock()
+    limiter = RateLimiter(max_wait=10, clock=clock)
+    limiter.update(headers(remaining=0, reset=2000), "core")
+    with pytest.raises(RateLimitExceededError):
+        limiter.delay("core")
+
+
+def test_exhausted_quota_waits_for_reset_instead_of_raising():
+    clock = FakeClock()
+    api = GitHubMetricsAPI(
+        access_token="test_token", rate_limiter=RateLimiter(clock=clock)
+    )
+    limited = mock_response(403, headers=headers(remaining=0, reset=1060))
+    ok = mock_response(200, {"login": "octocat"}, headers(remaining=4999, reset=4600))
+
+    with patch.object(api.session, "request", side_effect=[limited, ok]), patch(
+        "github_metrics_api.api.time.sleep", side_effect=clock.sleep
+    ) as mock_sleep:
+        assert api.get_user("octocat") == {"login": "octocat"}
+
+    mock_sleep.assert_called_once_with(61.0)
+    assert api.rate_limiter.remaining("core") == 4999
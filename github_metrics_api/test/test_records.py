@@ -0,0 +1,118 @@
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.formatters import format_repo_info, format_repo_issues
+from github_metrics_api.records import Commit, Issue, Repo, User, WorkflowRun
+
+from .helpers import mock_response
+
+REPO = {
+    "id": 1,
+    "name": "hello",
+    "full_name": "octo/hello",
+    "owner": {"login": "octo", "id": 7, "type": "User", "avatar_url": "https://a"},
+    "description": None,
+    "language": "Python",
+    "stargazers_count": 10,
+    "forks_count": 2,
+    "open_issues_count": 3,
+    "watchers_count": 10,
+    "subscribers_count": 4,
+    "created_at": "2020-01-01T00:00:00Z",
+    "updated_at": "2021-01-01T00:00:00Z",
+    "hooks_url": "https://api.github.com/repos/octo/hello/hooks",
+    "permissions": {"admin": False},
+}
+
+ISSUE = {
+    "number": 5,
+    "title": "Bug",
+    "state": "open",
+    "user": {"login": "octo"},
+    "comments": 1,
+    "created_at": "2023-01-02T03:04:05Z",
+    "pull_request": {"url": "https://api.github.com/repos/octo/hello/pulls/5"},
+    "labels_url": "https://api.github.com/repos/octo/hello/issues/5/labels{/name}",
+}
+
+
+def test_repo_record_keeps_known_fields():
+    repo = Repo.from_dict(REPO)
+    assert repo.name == "hello"
+    assert repo.owner == User.from_dict({"login": "octo", "id": 7, "type": "User"})
+    assert repo.owner.login == "octo"
+    assert repo.pushed_at is None
+    assert not hasattr(repo, "__dict__")
+    assert not hasattr(repo, "hooks_url")
+    assert repo["stargazers_count"] == 10
+    assert repo.get("language") == "Python"
+    with pytest.raises(KeyError):
+        repo["hooks_url"]
+
+
+def test_records_work_with_formatters():
+    assert format_repo_info(Repo.from_dict(REPO)) == format_repo_info(REPO)
+    issues = [Issue.from_dict(ISSUE)]
+    assert format_repo_issues(issues) == format_repo_issues([ISSUE])
+    assert issues[0].pull_request is True
+
+
+def test_record_field_projection():
+    repo = Repo.from_dict(REPO, fields=["name", "stargazers_count"])
+    assert repo.to_dict()["name"] == "hello"
+    assert repo.stargazers_count == 10
+    assert repo.language is None
+    with pytest.raises(ValueError, match="hooks_url"):
+        Repo.from_dict(REPO, fields=["name", "hooks_url"])
+
+
+def test_commit_record_flattens_git_data():
+    commit = Commit.from_dict(
+        {
+            "sha": "abc",
+            "commit": {
+                "message": "Fix",
+                "author": {"name": "Octo", "email": "o@x", "date": "2023-01-01"},
+            },
+            "author": None,
+        }
+    )
+    assert (commit.sha, commit.message, commit.author_name) == ("abc", "Fix", "Octo")
+    assert commit.date == "2023-01-01"
+    assert commit.author is None
+
+
+def test_record_pickles():
+    repo = Repo.from_dict(REPO)
+    assert pickle.loads(pickle.dumps(repo)) == repo
+
+
+def test_api_as_records():
+    api = GitHubMetricsAPI(access_token="test_token")
+    with patch.object(api.session, "request") as mock_request:
+        mock_request.return_value = mock_response(payload=[REPO, REPO])
+        repos = api.list_user_repos("octo", as_records=True)
+        assert [type(repo) for repo in repos] == [Repo, Repo]
+
+        mock_request.return_value = mock_response(payload=REPO)
+        assert api.get_repo("octo", "hello", as_records=True) == Repo.from_dict(REPO)
+
+        mock_request.return_value = mock_response(
+            payload={"total_count": 1, "items": [ISSUE]}
+        )
+        results = api.search_issues("bug", fields=["number", "title"])
+        assert results["items"] == [{"number": 5, "title": "Bug"}]
+
+        mock_request.return_value = mock_response(
+            payload={
+                "total_count": 1,
+                "workflow_runs": [{"id": 9, "status": "completed"}],
+            }
+        )
+        runs = list(
+            api.iter_workflow_runs("octo", "hello", as_records=True, fields=["id"])
+        )
+        assert runs == [WorkflowRun.from_dict({"id": 9})]
@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.errors import ServerError
+from github_metrics_api.retry import RetryPolicy, retry_after
+
+from .helpers import mock_response
+
+
+@pytest.fixture
+def api():
+    return GitHubMetricsAPI(
+        access_token="test_token", retry=RetryPolicy(max_attempts=3, jitter=False)
+    )
+
+
+def test_retry_after_parsing():
+    assert retry_after({"Retry-After": "12"}) == 12.0
+    assert retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert retry_after({}) is None
+
+
+def test_exponential_backoff_is_capped():
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+    assert [policy.delay(attempt) for attempt in (1, 2, 3, 4)] == [1, 2, 4, 5]
+
+
+def test_transient_server_error_is_retried(api):
+    with patch.object(
+        api.session,
+        "request",
+        side_effect=[
+            mock_response(502),
+            mock_response(503),
+            mock_response(200, payload={"id": 1}),
+        ],
+    ), patch("github_metrics_api.api.time.sleep") as mock_sleep:
+        assert api.get_repo("test_owner", "test_repo") == {"id": 1}
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0]
+    assert api.retry.stats() == {
+        "retries": 2,
+        "gave_up": 0,
+        "retries_by_reason": {"502": 1, "503": 1},
+    }
+
+
+def test_gives_up_after_max_attempts(api):
+    with patch.object(api.session, "request", return_value=mock_response(503)), patch(
+        "github_metrics_api.api.time.sleep"
+    ):
+        with pytest.raises(ServerError):
+            api.get_repo("test_owner", "test_repo")
+
+    assert api.retry.stats()["gave_up"] == 1
+
+
+def test_secondary_rate_limit_honours_retry_after(api):
+    limited = mock_response(403, headers={"Retry-After": "60"})
+    with patch.object(
+        api.session, "request", side_effect=[limited, mock_response(200, payload=[])]
+    ), patch("github_metrics_api.api.time.sleep") as mock_sleep:
+        assert api.search_issues("bug") == []
+
+    mock_sleep.assert_called_once_with(60.0)
+
+
+def test_connection_error_is_retried(api):
+    with patch.object(
+        api.session,
+        "request",
+        side_effect=[requests.ConnectionError(), mock_response(200, payload={"id": 1})],
+    ), patch("github_metrics_api.api.time.sleep"):
+        assert api.get_repo("test_owner", "test_repo") == {"id": 1}
+
+    assert api.retry.stats()["retries_by_reason"] == {"ConnectionError": 1}
+
+
+def test_deadline_stops_retries():
+    api = GitHubMetricsAPI(
+        access_token="test_token",
+        retry=RetryPolicy(max_attempts=5, backoff=10, jitter=False, deadline=5),
+    )
+    with patch.object(api.session, "request", return_value=mock_response(502)) as mock:
+        with pytest.raises(ServerError):
+            api.get_repo("test_owner", "test_repo")
+
+    assert mock.call_count == 1
+
+
+def test_attempts_time_out_within_the_deadline():
+    api = GitHubMetricsAPI(
+        access_token="test_token",
+        retry=RetryPolicy(backoff=1, jitter=False, deadline=10, timeout=8),
+    )
+    now = [100.0]
+
+    def request(method, url, **kwargs):
+        now[0] += kwargs["timeout"]  # the attempt hangs until it times out
+        raise requests.Timeout()
+
+    with patch.object(
+        api.session, "request", side_effect=request
+    ) as mock_request, patch("time.monotonic", lambda: now[0]), patch(
+        "time.sleep", lambda delay: now.__setitem__(0, now[0] + delay)
+    ):
+        with pytest.raises(requests.Timeout):
+            api.get_repo("test_owner", "test_repo")
+
+    # 8s attempt, 1s wait, then only the 1s left before the deadline.
+    assert [c.kwargs["timeout"] for c in mock_request.call_args_list] == [8, 1.0]
+    assert now[0] - 100.0 == 10.0
@@ -0,0 +1,163 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.cache import ResponseCache
+from github_metrics_api.metrics import MetricsCollector
+from github_metrics_api.server import create_server, serve
+from github_metrics_api.webhooks import sign
+
+from .helpers import mock_response
+
+REPO = {
+    "name": "hello",
+    "owner": {"login": "octo"},
+    "description": None,
+    "stargazers_count": 1,
+    "forks_count": 2,
+    "open_issues_count": 3,
+    "subscribers_count": 4,
+    "language": "Python",
+    "created_at": "2020-01-01T00:00:00Z",
+    "updated_at": "2021-01-01T00:00:00Z",
+}
+
+
+@pytest.fixture
+def api():
+    api = GitHubMetricsAPI(
+        access_token="t", cache=ResponseCache(), hooks=[MetricsCollector()]
+    )
+    with patch.object(api.session, "request") as request:
+        request.return_value = mock_response(200, REPO)
+        yield api
+
+
+@pytest.fixture
+def server(api):
+    server = create_server(port=0, api=api, log_requests=False)
+    thread = threading.Thread(target=serve, args=(server, False))
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(5)
+
+
+def get(server, path):
+    try:
+        with urllib.request.urlopen(server.url + path, timeout=5) as reply:
+            return reply.status, reply.headers["Content-Type"], reply.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers["Content-Type"], e.read().decode()
+
+
+def test_commands_share_one_cached_client(server, api):
+    status, content_type, body = get(server, "/repos/octo/hello/stats")
+    assert (status, content_type) == (200, "application/json")
+    assert json.loads(body) == {"stars": 1, "forks": 2, "open_issues": 3, "watchers": 4}
+    assert json.loads(get(server, "/repos/octo/hello")[2])["name"] == "hello"
+    api.session.request.assert_called_once()
+
+    stats = json.loads(get(server, "/stats")[2])
+    assert stats["cache"]["hits"] == 1
+    status, content_type, metrics = get(server, "/metrics")
+    assert content_type.startswith("text/plain")
+    assert 'github_api_requests_total{endpoint="repos/{owner}/{repo}"' in metrics
+
+
+def test_pretty_format(server):
+    status, content_type, body = get(server, "/repos/octo/hello?format=pretty")
+    assert content_type == "text/plain; charset=utf-8"
+    assert body.startswith("Repository Information:\nName: hello")
+
+
+def test_errors_are_json(server, api):
+    api.session.request.return_value = mock_response(404)
+    status, _, body = get(server, "/users/ghost")
+    assert status == 404
+    assert json.loads(body)["error"]["code"] == "NOT_FOUND"
+    assert get(server, "/nowhere")[0] == 404
+    status, _, body = get(server, "/repos/octo/hello/bogus")
+    assert status == 400
+    assert json.loads(body)["error"]["code"] == "INVALID_COMMAND"
+    assert get(server, "/search/repos")[0] == 400
+
+
+def test_unexpected_failures_answer_500(server):
+    # A repository payload cannot be formatted as a user.
+    status, _, body = get(server, "/users/octo?format=pretty")
+    assert status == 500
+    assert json.loads(body)["error"]["code"] == "INTERNAL_ERROR"
+
+
+def test_shutdown_finishes_in_flight_requests(api):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_request(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return mock_response(200, REPO)
+
+    api.session.request.side_effect = slow_request
+    server = create_server(port=0, api=api, log_requests=False)
+    thread = threading.Thread(target=serve, args=(server, False))
+    thread.start()
+    result = {}
+    client = threading.Thread(
+        target=lambda: result.update(reply=get(server, "/repos/octo/hello/stats"))
+    )
+    client.start()
+    assert started.wait(5)
+
+    server.shutdown()
+    release.set()
+    thread.join(5)
+    client.join(5)
+    assert not thread.is_alive()
+    assert result["reply"][0] == 200
+
+
+def test_webhooks_update_the_shared_cache(api):
+    server = create_server(port=0, api=api, webhook_secret="secret", log_requests=False)
+    thread = threading.Thread(target=serve, args=(server, False))
+    thread.start()
+    try:
+        get(server, "/repos/octo/hello")
+        body = json.dumps(
+            {
+                "action": "created",
+                "repository": {"full_name": "octo/hello", "stargazers_count": 2},
+            }
+        ).encode()
+
+        def post(signature, body=body):
+            request = urllib.request.Request(
+                server.url + "/webhooks",
+                data=body,
+                headers={"X-GitHub-Event": "star", "X-Hub-Signature-256": signature},
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=5) as reply:
+                    return reply.status, json.loads(reply.read())
+            except urllib.error.HTTPError as e:
+                return e.code, json.loads(e.read())
+
+        status, result = post("sha256=bad")
+        assert (status, result["error"]["code"]) == (401, "INVALID_SIGNATURE")
+        status, result = post(sign("secret", body))
+        assert (status, result["updated"]) == (200, 1)
+        unnamed = b'{"repository": {}}'
+        status, result = post(sign("secret", unnamed), unnamed)
+        assert (status, result["error"]["code"]) == (400, "INVALID_PAYLOAD")
+        stats = json.loads(get(server, "/repos/octo/hello/stats")[2])
+        assert stats["stars"] == 2
+        api.session.request.assert_called_once()
+        assert json.loads(get(server, "/stats")[2])["webhooks"]["deliveries"] == 1
+    finally:
+        server.shutdown()
+        thread.join(5)
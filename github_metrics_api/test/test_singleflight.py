@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.singleflight import AsyncSingleFlight, SingleFlight
+
+from .helpers import mock_response
+
+# Set by the tests to let the shared call finish.
+release = threading.Event()
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_concurrently(flight, callers, func, key="k"):
+    with ThreadPoolExecutor(callers) as executor:
+        futures = [executor.submit(flight.do, key, func) for _ in range(callers)]
+        wait_for(lambda: flight.stats()["coalesced"] == callers - 1)
+        release.set()
+        return futures
+
+
+@pytest.fixture(autouse=True)
+def reset_release():
+    release.clear()
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def func():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 1}
+
+    futures = run_concurrently(flight, 5, func)
+    results = [future.result() for future in futures]
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    # Nothing is remembered once the call has finished.
+    assert flight.do("k", lambda: 2) == 2
+
+
+def test_callers_share_the_exception():
+    flight = SingleFlight()
+
+    def func():
+        release.wait(5)
+        raise ValueError("boom")
+
+    futures = run_concurrently(flight, 3, func)
+    for future in futures:
+        with pytest.raises(ValueError, match="boom"):
+            future.result()
+
+
+def test_api_coalesces_identical_gets():
+    api = GitHubMetricsAPI(access_token="t", coalesce=True)
+    response = mock_response(payload={"name": "hello"})
+
+    def request(*args, **kwargs):
+        release.wait(5)
+        return response
+
+    with patch.object(api.session, "request", side_effect=request) as mock_request:
+        with ThreadPoolExecutor(4) as executor:
+            futures = [executor.submit(api.get_repo, "octo", "hello") for _ in range(4)]
+            other = executor.submit(api.get_repo, "octo", "other")
+            wait_for(lambda: api.singleflight.stats()["coalesced"] == 3)
+            release.set()
+        assert all(future.result() == {"name": "hello"} for future in futures)
+        other.result()
+    assert mock_request.call_count == 2
+
+
+def test_async_callers_share_one_task():
+    async def main():
+        flight = AsyncSingleFlight()
+        calls = []
+        gate = asyncio.Event()
+
+        async def func():
+            calls.append(1)
+            await gate.wait()
+            return "value"
+
+        waiters = [asyncio.ensure_future(flight.do("k", func)) for _ in range(3)]
+        await asyncio.sleep(0)
+        # Cancelling one caller does not cancel the shared call.
+        waiters[0].cancel()
+        gate.set()
+        results = await asyncio.gather(*waiters[1:])
+        assert results == ["value", "value"]
+        assert len(calls) == 1
+        assert flight.stats() == {"calls": 1, "coalesced": 2, "in_flight": 0}
+
+    asyncio.run(main())
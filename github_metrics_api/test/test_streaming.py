@@ -0,0 +1,102 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.ratelimit import RateLimiter
+from github_metrics_api.retry import RetryPolicy
+from github_metrics_api.streaming import iter_json_array
+
+from .helpers import mock_response
+
+
+def chunked(document, size):
+    data = json.dumps(document).encode()
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+ITEMS = [
+    {"number": 1, "title": "naïve ünïcode"},
+    12345,
+    [1.5, None, True],
+    "text",
+    {"nested": {"deep": [1, 2, {"x": "]"}]}},
+]
+
+
+@pytest.mark.parametrize("size", [1, 3, 16, 4096])
+def test_iter_json_array_any_chunking(size):
+    assert list(iter_json_array(chunked(ITEMS, size))) == ITEMS
+
+
+def test_iter_json_array_numbers_split_across_chunks():
+    numbers = [1.5e3, -2, 0.25, 7e-05, 12345]
+    assert list(iter_json_array(chunked(numbers, 1))) == numbers
+    assert list(iter_json_array([b"[1", b".5e3,2]"])) == [1500.0, 2]
+    assert list(iter_json_array([b"[1", b"e", b"3]"])) == [1000.0]
+
+
+def test_iter_json_array_member():
+    document = {"total_count": 5, "incomplete_results": False, "items": ITEMS}
+    assert list(iter_json_array(chunked(document, 7), key="items")) == ITEMS
+
+
+def test_iter_json_array_empty_and_missing():
+    assert list(iter_json_array([b" [ ] "])) == []
+    assert list(iter_json_array([b'{"total_count": 0}'], key="items")) == []
+
+
+def test_iter_json_array_is_lazy():
+    def chunks():
+        yield b'[{"a": 1}, '
+        raise AssertionError("read past the first element")
+
+    assert next(iter_json_array(chunks())) == {"a": 1}
+
+
+def test_iter_json_array_rejects_truncated_input():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([b'[{"a": 1}, {"b"']))
+
+
+def test_iter_search_issues_stream():
+    api = GitHubMetricsAPI(access_token="test_token")
+    with patch.object(api.session, "request") as mock_request:
+        response = mock_response()
+        response.iter_content.return_value = chunked(
+            {"total_count": 5, "items": ITEMS}, 8
+        )
+        mock_request.return_value = response
+
+        assert list(api.iter_search_issues("bug", stream=True)) == ITEMS
+
+        mock_request.assert_called_once_with(
+            "GET",
+            "https://api.github.com/search/issues",
+            params={"q": "bug", "sort": None, "order": None, "per_page": 100},
+            json=None,
+            stream=True,
+        )
+        response.json.assert_not_called()
+        response.close.assert_called_once()
+
+
+def test_discarded_streamed_responses_are_closed():
+    api = GitHubMetricsAPI(
+        access_token="test_token",
+        retry=RetryPolicy(jitter=False),
+        rate_limiter=RateLimiter(clock=lambda: 1000.0),
+    )
+    failed = mock_response(502)
+    limited = mock_response(
+        403, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1010"}
+    )
+    ok = mock_response()
+    ok.iter_content.return_value = [b"[1, 2]"]
+    with patch.object(api.session, "request", side_effect=[failed, limited, ok]), patch(
+        "time.sleep"
+    ):
+        assert list(api.iter_repo_issues("o", "r", stream=True)) == [1, 2]
+    failed.close.assert_called_once()
+    limited.close.assert_called_once()
@@ -0,0 +1,148 @@
+import json
+from unittest.mock import Mock
+
+from github_metrics_api.sync import (
+    SyncState,
+    sync_commits,
+    sync_issues,
+    sync_repo,
+    sync_workflow_runs,
+)
+
+
+def commit(sha, date):
+    return {"sha": sha, "commit": {"committer": {"date": date}}}
+
+
+def test_sync_state_roundtrip(tmp_path):
+    path = tmp_path / "state.json"
+    state = SyncState(str(path))
+    assert state.get("o", "r", "commits") is None
+    state.set("o", "r", "commits", {"since": "2024-01-01T00:00:00Z", "seen": ["a"]})
+    state.save()
+    assert json.loads(path.read_text())["o/r"]["commits"]["seen"] == ["a"]
+    assert list(tmp_path.iterdir()) == [path]
+
+    reloaded = SyncState(str(path))
+    assert reloaded.get("o", "r", "commits")["since"] == "2024-01-01T00:00:00Z"
+    reloaded.reset("o", "r")
+    assert reloaded.get("o", "r", "commits") is None
+
+
+def test_sync_commits_uses_and_advances_mark(tmp_path):
+    state = SyncState(str(tmp_path / "state.json"))
+    api = Mock()
+    api.iter_commits.return_value = iter(
+        [commit("c", "2024-01-03T00:00:00Z"), commit("b", "2024-01-02T00:00:00Z")]
+    )
+    assert [c["sha"] for c in sync_commits(api, state, "o", "r")] == ["c", "b"]
+    api.iter_commits.assert_called_once_with("o", "r", since=None)
+    assert state.get("o", "r", "commits") == {
+        "since": "2024-01-03T00:00:00Z",
+        "seen": ["c"],
+    }
+
+    # ``since`` includes the boundary, so the newest commit is returned again.
+    api.iter_commits.reset_mock()
+    api.iter_commits.return_value = iter(
+        [commit("d", "2024-01-04T00:00:00Z"), commit("c", "2024-01-03T00:00:00Z")]
+    )
+    assert [c["sha"] for c in sync_commits(api, state, "o", "r")] == ["d"]
+    api.iter_commits.assert_called_once_with("o", "r", since="2024-01-03T00:00:00Z")
+
+
+def test_sync_issues_requests_updated_order(tmp_path):
+    state = SyncState(str(tmp_path / "state.json"))
+    state.set("o", "r", "issues", {"since": "2024-01-01T00:00:00Z", "seen": [1]})
+    api = Mock()
+    api.iter_repo_issues.return_value = iter(
+        [
+            {"id": 1, "updated_at": "2024-01-01T00:00:00Z"},
+            {"id": 2, "updated_at": "2024-01-01T00:00:00Z"},
+            {"id": 3, "updated_at": "2024-01-05T00:00:00Z"},
+        ]
+    )
+    assert [i["id"] for i in sync_issues(api, state, "o", "r")] == [2, 3]
+    api.iter_repo_issues.assert_called_once_with(
+        "o",
+        "r",
+        state="all",
+        since="2024-01-01T00:00:00Z",
+        sort="updated",
+        direction="asc",
+    )
+    assert state.get("o", "r", "issues")["since"] == "2024-01-05T00:00:00Z"
+
+
+def test_sync_mark_not_advanced_when_interrupted(tmp_path):
+    state = SyncState(str(tmp_path / "state.json"))
+    api = Mock()
+    api.iter_commits.return_value = iter([commit("c", "2024-01-03T00:00:00Z")])
+    items = sync_commits(api, state, "o", "r")
+    next(items)
+    items.close()
+    assert state.get("o", "r", "commits") is None
+
+
+def test_sync_workflow_runs_holds_mark_at_unfinished_run(tmp_path):
+    state = SyncState(str(tmp_path / "state.json"))
+    api = Mock()
+    api.iter_workflow_runs.return_value = iter(
+        [
+            {"id": 3, "created_at": "2024-01-03T00:00:00Z", "status": "completed"},
+            {"id": 2, "created_at": "2024-01-02T00:00:00Z", "status": "in_progress"},
+            {"id": 1, "created_at": "2024-01-01T00:00:00Z", "status": "completed"},
+        ]
+    )
+    assert len(list(sync_workflow_runs(api, state, "o", "r"))) == 3
+    assert state.get("o", "r", "workflow_runs") == {
+        "since": "2024-01-02T00:00:00Z",
+        "until": "2024-01-03T00:00:00Z",
+        "seen": [3],
+    }
+
+    # Only the run that was in progress is yielded again.
+    api.iter_workflow_runs.return_value = iter(
+        [
+            {"id": 4, "created_at": "2024-01-04T00:00:00Z", "status": "completed"},
+            {"id": 3, "created_at": "2024-01-03T00:00:00Z", "status": "completed"},
+            {"id": 2, "created_at": "2024-01-02T00:00:00Z", "status": "completed"},
+        ]
+    )
+    runs = list(sync_workflow_runs(api, state, "o", "r"))
+    assert [run["id"] for run in runs] == [4, 2]
+    api.iter_workflow_runs.assert_called_with(
+        "o", "r", created=">=2024-01-02T00:00:00Z"
+    )
+    assert state.get("o", "r", "workflow_runs") == {
+        "since": "2024-01-04T00:00:00Z",
+        "seen": [4],
+    }
+
+
+def test_sync_repo_saves_state(tmp_path):
+    path = tmp_path / "state.json"
+    state = SyncState(str(path))
+    api = Mock()
+    api.iter_commits.return_value = iter([commit("a", "2024-01-01T00:00:00Z")])
+    api.iter_repo_issues.return_value = iter([])
+    api.iter_workflow_runs.return_value = iter([])
+    changes = list(sync_repo(api, state, "o", "r"))
+    assert [resource for resource, _ in changes] == ["commits"]
+    assert json.loads(path.read_text())["o/r"]["commits"]["seen"] == ["a"]
+
+
+def test_list_commits_since_param():
+    from github_metrics_api.api import GitHubMetricsAPI
+
+    api = GitHubMetricsAPI(access_token="test_token")
+    api._make_request = Mock(return_value=[])
+    api.list_commits("o", "r", since="2024-01-01T00:00:00Z")
+    api._make_request.assert_called_once_with(
+        "GET", "repos/o/r/commits", params={"since": "2024-01-01T00:00:00Z"}
+    )
+    api._make_request.reset_mock()
+    api.list_repo_issues("o", "r")
+    api._make_request.assert_called_once_with(
+        "GET", "repos/o/r/issues", params={"state": "open"}
+    )
@@ -0,0 +1,126 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from github_metrics_api.timeseries import (
+    CodeFrequency,
+    CommitActivity,
+    ContributorStats,
+    PunchCard,
+)
+
+WEEK = 604800
+ACTIVITY = [
+    {
+        "week": 1000 + i * WEEK,
+        "total": sum(range(i, i + 7)),
+        "days": list(range(i, i + 7)),
+    }
+    for i in range(6)
+]
+STATS = [
+    {
+        "author": {"login": "alice"},
+        "total": 6,
+        "weeks": [
+            {"w": 1000, "a": 10, "d": 5, "c": 1},
+            {"w": 1000 + WEEK, "a": 0, "d": 0, "c": 5},
+        ],
+    },
+    {
+        "author": {"login": "bob"},
+        "total": 3,
+        "weeks": [
+            {"w": 1000, "a": 4, "d": 0, "c": 3},
+            {"w": 1000 + WEEK, "a": 0, "d": 8, "c": 0},
+        ],
+    },
+]
+
+
+def test_commit_activity_aggregations():
+    activity = CommitActivity.from_payload(ACTIVITY)
+    assert len(activity) == 6
+    assert activity.totals.tolist() == [week["total"] for week in ACTIVITY]
+    assert activity.window_sum() == sum(week["total"] for week in ACTIVITY)
+    assert (
+        activity.window_sum(start=1000 + 4 * WEEK)
+        == ACTIVITY[4]["total"] + ACTIVITY[5]["total"]
+    )
+    assert activity.window_sum("days", end=1000).tolist() == list(range(7))
+    totals = [week["total"] for week in ACTIVITY]
+    expected = [sum(totals[i : i + 4]) / 4 for i in range(3)]
+    assert activity.rolling_mean(window=4).tolist() == pytest.approx(expected)
+    assert activity.rolling_mean(window=10).size == 0
+    assert activity.by_weekday().tolist() == [sum(range(d, d + 6)) for d in range(7)]
+
+
+def test_commit_activity_combine_aligns_weeks():
+    first = CommitActivity.from_payload(ACTIVITY[:4])
+    second = CommitActivity.from_payload(ACTIVITY[2:])
+    combined = CommitActivity.combine([first, second])
+    assert combined.weeks.tolist() == [week["week"] for week in ACTIVITY]
+    assert combined.totals.tolist() == [
+        week["total"] * (2 if 2 <= i < 4 else 1) for i, week in enumerate(ACTIVITY)
+    ]
+    assert len(CommitActivity.combine([])) == 0
+
+
+def test_code_frequency():
+    frequency = CodeFrequency.from_payload([[1000, 100, -20], [1000 + WEEK, 0, -5]])
+    assert frequency.deletions.tolist() == [20, 5]
+    assert frequency.churn.tolist() == [120, 5]
+    assert frequency.net.tolist() == [80, -5]
+    assert frequency.churn_ratio() == pytest.approx(0.25)
+    assert np.isnan(frequency.churn_ratio(start=1000 + WEEK))
+    assert frequency.weekly_churn_ratio()[0] == pytest.approx(0.2)
+    combined = CodeFrequency.combine([frequency, frequency])
+    assert combined.additions.tolist() == [200, 0]
+    assert combined.deletions.tolist() == [40, 10]
+
+
+def test_contributor_stats():
+    stats = ContributorStats.from_payload(STATS)
+    assert stats.logins == ["alice", "bob"]
+    assert stats.commits.tolist() == [[1, 5], [3, 0]]
+    assert stats.totals.tolist() == [6, 3]
+    assert stats.top(1) == [("alice", 6)]
+    assert stats.top(2, start=1000, end=1000) == [("bob", 3), ("alice", 1)]
+    assert stats.top(5, column="deletions") == [("bob", 8), ("alice", 5)]
+    assert stats.churn_ratio().tolist() == pytest.approx([0.5, 2.0])
+    assert stats.rolling_mean("commits", 2).tolist() == [[3.0], [1.5]]
+
+
+def test_contributor_stats_combine_by_login():
+    other = ContributorStats.from_payload(
+        [
+            {
+                "author": {"login": "carol"},
+                "total": 2,
+                "weeks": [{"w": 1000 + 2 * WEEK, "a": 1, "d": 1, "c": 2}],
+            },
+            {
+                "author": {"login": "alice"},
+                "total": 1,
+                "weeks": [{"w": 1000, "a": 1, "d": 0, "c": 1}],
+            },
+        ]
+    )
+    combined = ContributorStats.combine([ContributorStats.from_payload(STATS), other])
+    assert combined.logins == ["alice", "bob", "carol"]
+    assert combined.weeks.tolist() == [1000, 1000 + WEEK, 1000 + 2 * WEEK]
+    assert combined.commits.tolist() == [[2, 5, 0], [3, 0, 0], [0, 0, 2]]
+
+
+def test_punch_card():
+    payload = [[day, hour, day * 24 + hour] for day in range(7) for hour in range(24)]
+    card = PunchCard.from_payload(payload)
+    assert card.matrix.shape == (7, 24)
+    assert card.matrix[2, 5] == 53
+    assert card.busiest(2) == [("Sat", 23, 167), ("Sat", 22, 166)]
+    assert json.dumps(card.busiest(1)) == '[["Sat", 23, 167]]'
+    combined = PunchCard.combine([card, card])
+    assert combined.by_weekday().tolist() == (card.by_weekday() * 2).tolist()
+    assert combined.by_hour().sum() == 2 * sum(range(168))
@@ -0,0 +1,77 @@
+from unittest.mock import patch, Mock
+
+import pytest
+
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.errors import AuthenticationError, RateLimitExceededError
+from github_metrics_api.tokens import TokenPool
+
+from .helpers import mock_response
+
+
+def quota(remaining, reset=2000):
+    return {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset)}
+
+
+def test_acquire_prefers_most_remaining_quota():
+    pool = TokenPool(["a", "b", "c"], clock=lambda: 1000)
+    a, b, c = pool.credentials
+    pool.update(a, quota(100))
+    pool.update(b, quota(4000))
+    pool.update(c, quota(10))
+    assert pool.acquire() is b
+
+
+def test_unknown_quota_is_tried_first():
+    pool = TokenPool(["a", "b"], clock=lambda: 1000)
+    pool.update(pool.credentials[0], quota(4000))
+    assert pool.acquire() is pool.credentials[1]
+
+
+def test_exhausted_tokens_are_benched_until_reset():
+    clock = Mock(return_value=1000)
+    pool = TokenPool(["a", "b"], clock=clock)
+    a, b = pool.credentials
+    pool.update(a, quota(0))
+    pool.bench(a)
+    pool.update(b, quota(0))
+    pool.bench(b)
+    with pytest.raises(RateLimitExceededError):
+        pool.acquire()
+
+    clock.return_value = 2001
+    assert pool.acquire() in (a, b)
+
+
+def test_request_moves_to_next_token_on_401_and_exhaustion():
+    api = GitHubMetricsAPI(
+        access_token=None, token_pool=TokenPool(["a", "b", "c"], clock=lambda: 1000)
+    )
+    sent_with = []
+
+    def fake_request(method, url, params=None, json=None, headers=None):
+        token = headers["Authorization"]
+        sent_with.append(token)
+        if token == "token a":
+            return mock_response(401, headers=quota(5000))
+        if token == "token b":
+            return mock_response(403, headers=quota(0))
+        return mock_response(200, {"login": "octocat"}, quota(4999))
+
+    with patch.object(api.session, "request", side_effect=fake_request):
+        assert api.get_user("octocat") == {"login": "octocat"}
+        assert api.get_user("octocat") == {"login": "octocat"}
+
+    assert sent_with == ["token a", "token b", "token c", "token c"]
+    stats = api.token_pool.stats()
+    assert stats["token0"]["invalid"]
+    assert stats["token1"]["benched"] == ["core"]
+
+
+def test_all_tokens_rejected():
+    api = GitHubMetricsAPI(access_token=None, token_pool=TokenPool(["a", "b"]))
+    with patch.object(
+        api.session, "request", return_value=mock_response(401, headers=quota(60))
+    ):
+        with pytest.raises(AuthenticationError):
+            api.get_user("octocat")
@@ -0,0 +1,200 @@
+from unittest.mock import Mock
+
+import pytest
+
+from github_metrics_api.api import BatchResult
+from github_metrics_api.errors import AcceptedError, GitHubAPIError, NotFoundError
+from github_metrics_api.warehouse import Warehouse
+
+REPO = {
+    "id": 1,
+    "name": "hello",
+    "full_name": "octo/hello",
+    "owner": {"login": "octo"},
+    "description": "Hi",
+    "language": "Python",
+    "stargazers_count": 10,
+    "forks_count": 2,
+    "open_issues_count": 3,
+    "watchers_count": 10,
+    "subscribers_count": 4,
+    "created_at": "2020-01-01T00:00:00Z",
+    "updated_at": "2021-01-01T00:00:00Z",
+    "pushed_at": "2021-01-02T00:00:00Z",
+}
+
+ISSUES = [
+    {
+        "id": 11,
+        "number": 1,
+        "title": "Old",
+        "state": "closed",
+        "user": {"login": "a"},
+        "comments": 0,
+        "created_at": "2023-01-01T00:00:00Z",
+        "updated_at": "2023-01-02T00:00:00Z",
+        "closed_at": "2023-01-02T00:00:00Z",
+    },
+    {
+        "id": 12,
+        "number": 2,
+        "title": "New",
+        "state": "open",
+        "user": {"login": "b"},
+        "comments": 3,
+        "created_at": "2023-02-01T00:00:00Z",
+        "updated_at": "2023-02-01T00:00:00Z",
+        "closed_at": None,
+        "pull_request": {"url": "..."},
+    },
+]
+
+COMMITS = [
+    {
+        "sha": "abc",
+        "commit": {
+            "message": "Fix",
+            "author": {"name": "A", "email": "a@x", "date": "2023-01-01T00:00:00Z"},
+            "committer": {"date": "2023-01-01T00:00:00Z"},
+        },
+        "author": {"login": "a"},
+    }
+]
+
+CONTRIBUTORS = [
+    {
+        "author": {"login": "b"},
+        "total": 5,
+        "weeks": [
+            {"w": 0, "a": 1, "d": 0, "c": 2},
+            {"w": 604800, "a": 5, "d": 1, "c": 3},
+        ],
+    },
+    {"author": {"login": "a"}, "total": 1, "weeks": [{"w": 0, "a": 1, "d": 1, "c": 1}]},
+]
+
+
+@pytest.fixture
+def warehouse():
+    with Warehouse() as warehouse:
+        yield warehouse
+
+
+def test_repo_roundtrip(warehouse):
+    warehouse.store_repo("octo", "hello", REPO)
+    repo = warehouse.get_repo("Octo", "Hello")
+    assert repo["owner"] == {"login": "octo"}
+    assert repo["stargazers_count"] == 10
+    assert warehouse.get_repo_stats("octo", "hello") == {
+        "stars": 10,
+        "forks": 2,
+        "open_issues": 3,
+        "watchers": 4,
+    }
+    with pytest.raises(NotFoundError):
+        warehouse.get_repo("octo", "missing")
+
+
+def test_issues_upsert_and_filter(warehouse):
+    assert warehouse.store_issues("octo", "hello", iter(ISSUES)) == 2
+    updated = dict(ISSUES[0], state="open", title="Reopened")
+    warehouse.store_issues("octo", "hello", [updated])
+    open_issues = warehouse.list_repo_issues("octo", "hello")
+    assert [issue["title"] for issue in open_issues] == ["New", "Reopened"]
+    assert open_issues[0]["pull_request"] == {}
+    assert len(warehouse.list_repo_issues("octo", "hello", state="closed")) == 0
+    assert len(warehouse.list_repo_issues("octo", "hello", state="all")) == 2
+
+
+def test_failed_batch_rolls_back(warehouse):
+    def issues():
+        yield ISSUES[0]
+        raise GitHubAPIError("boom", code="X")
+
+    with pytest.raises(GitHubAPIError):
+        warehouse.store_issues("octo", "hello", issues())
+    with pytest.raises(NotFoundError):
+        warehouse.list_repo_issues("octo", "hello")
+
+
+def test_rows_are_read_before_locking(warehouse):
+    def issues():
+        # A slow crawl must not block other readers and writers.
+        assert not warehouse._lock.locked()
+        assert not warehouse.conn.in_transaction
+        yield from ISSUES
+
+    assert warehouse.store_issues("octo", "hello", issues()) == len(ISSUES)
+
+
+def test_statistics_roundtrip(warehouse):
+    activity = [{"days": [0, 1, 2, 3, 4, 5, 6], "total": 21, "week": 0}]
+    frequency = [[0, 10, -4], [604800, 3, 0]]
+    punch_card = [[0, 0, 5], [6, 23, 1]]
+    participation = {"all": [3, 4], "owner": [1, 0]}
+    warehouse.store_commit_activity("octo", "hello", activity)
+    warehouse.store_code_frequency("octo", "hello", frequency)
+    warehouse.store_punch_card("octo", "hello", punch_card)
+    warehouse.store_weekly_commits("octo", "hello", participation)
+    warehouse.store_contributor_stats("octo", "hello", CONTRIBUTORS)
+    warehouse.store_commits("octo", "hello", COMMITS)
+    warehouse.store_languages("octo", "hello", {"C": 10, "Python": 30})
+
+    assert warehouse.get_commit_activity("octo", "hello") == activity
+    assert warehouse.get_code_frequency("octo", "hello") == frequency
+    assert warehouse.get_punch_card("octo", "hello") == punch_card
+    assert warehouse.get_weekly_commits("octo", "hello") == participation
+    assert warehouse.get_contributor_stats("octo", "hello") == CONTRIBUTORS[::-1]
+    assert warehouse.list_commits("octo", "hello") == COMMITS
+    assert warehouse.list_repo_languages("octo", "hello") == {"Python": 30, "C": 10}
+    assert set(warehouse.fetched_at("octo", "hello")) >= {"commits", "punch_card"}
+
+
+def test_unsupported_methods_raise_api_errors(warehouse):
+    with pytest.raises(GitHubAPIError, match="not available"):
+        warehouse.get_repo_readme("octo", "hello")
+
+
+def test_ingest(warehouse):
+    api = Mock()
+    api.get_repo.return_value = REPO
+    api.list_repo_languages.return_value = {"Python": 30}
+    api.iter_repo_issues.return_value = iter(ISSUES)
+    api.iter_pull_requests.side_effect = GitHubAPIError("nope", code="X")
+    api.iter_commits.return_value = iter(COMMITS)
+    api.warm_stats.return_value = iter(
+        [
+            BatchResult(0, ("octo", "hello", "get_punch_card"), [[0, 1, 2]], None),
+            BatchResult(
+                1, ("octo", "hello", "get_commit_activity"), None, AcceptedError()
+            ),
+        ]
+    )
+    result = warehouse.ingest(
+        api,
+        "octo",
+        "hello",
+        resources=[
+            "repo",
+            "languages",
+            "issues",
+            "pulls",
+            "commits",
+            "punch_card",
+            "commit_activity",
+        ],
+        max_items=50,
+    )
+    assert result["stored"] == {
+        "repo": 1,
+        "languages": 1,
+        "issues": 2,
+        "commits": 1,
+        "punch_card": 1,
+    }
+    assert set(result["errors"]) == {"pulls", "commit_activity"}
+    api.iter_commits.assert_called_once_with("octo", "hello", max_items=50)
+    api.warm_stats.assert_called_once_with(
+        [("octo", "hello")], stats=("get_punch_card", "get_commit_activity")
+    )
+    assert warehouse.get_punch_card("octo", "hello") == [[0, 1, 2]]
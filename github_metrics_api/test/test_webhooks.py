@@ -0,0 +1,145 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from github_metrics_api.api import GitHubMetricsAPI
+from github_metrics_api.cache import ResponseCache
+from github_metrics_api.errors import InvalidSignatureError
+from github_metrics_api.webhooks import WebhookReceiver, sign
+
+from .helpers import mock_response
+
+SECRET = "It's a Secret to Everybody"
+REPOSITORY = {
+    "full_name": "octo/hello",
+    "stargazers_count": 11,
+    "watchers_count": 11,
+    "forks_count": 2,
+    "open_issues_count": 4,
+}
+
+
+@pytest.fixture
+def api():
+    api = GitHubMetricsAPI(access_token="t", cache=ResponseCache())
+    with patch.object(api.session, "request") as request:
+        yield api
+
+
+def fill(api, endpoint, payload):
+    api.session.request.return_value = mock_response(payload=payload)
+    return api._make_request("GET", endpoint)
+
+
+def deliver(receiver, event, payload):
+    body = json.dumps(payload).encode()
+    return receiver.handle(event, body, sign(SECRET, body))
+
+
+def test_signature_is_verified(api):
+    receiver = WebhookReceiver(SECRET, api.cache)
+    body = b'{"zen": "Keep it logically awesome."}'
+    # The example from GitHub's webhook documentation.
+    assert sign(SECRET, b"Hello, World!") == (
+        "sha256=757107ea0eb2509fc211221cce984b8a37570b6d7586c22c46f4379c8b043e17"
+    )
+    assert receiver.handle("ping", body, sign(SECRET, body))["repository"] is None
+    with pytest.raises(InvalidSignatureError):
+        receiver.handle("ping", body, sign("wrong", body))
+    with pytest.raises(InvalidSignatureError):
+        receiver.handle("ping", body, None)
+    assert receiver.stats()["rejected"] == 2
+
+
+def test_star_updates_cached_repository_counts(api):
+    fill(api, "repos/octo/hello", {"name": "hello", "stargazers_count": 10})
+    receiver = WebhookReceiver(SECRET, api.cache)
+    result = deliver(receiver, "star", {"action": "created", "repository": REPOSITORY})
+    assert result["updated"] == 1
+    assert api.get_repo("octo", "hello") == {
+        "name": "hello",
+        "stargazers_count": 11,
+        "watchers_count": 11,
+        "forks_count": 2,
+        "open_issues_count": 4,
+    }
+    assert api.session.request.call_count == 1
+
+
+def test_issue_event_updates_counts_and_drops_listings(api):
+    fill(api, "repos/octo/hello", {"name": "hello", "open_issues_count": 5})
+    fill(api, "repos/octo/hello/issues", [{"number": 7, "state": "open"}])
+    fill(api, "repos/octo/hello/languages", {"C": 1})
+    receiver = WebhookReceiver(SECRET, api.cache)
+    issue = {"number": 7, "state": "closed"}
+    result = deliver(
+        receiver,
+        "issues",
+        {"action": "closed", "issue": issue, "repository": REPOSITORY},
+    )
+    assert (result["updated"], result["invalidated"]) == (1, 1)
+    assert api.get_repo("octo", "hello")["open_issues_count"] == 4
+    assert api._make_request("GET", "repos/octo/hello/languages") == {"C": 1}
+    assert api.session.request.call_count == 3
+
+
+def test_pull_request_event_replaces_pull_request(api):
+    fill(api, "repos/octo/hello/pulls/8", {"number": 8, "merged": False})
+    fill(api, "repos/octo/hello/pulls", [{"number": 8}])
+    fill(api, "repos/octo/hello/issues", [{"number": 8}])
+    receiver = WebhookReceiver(SECRET, api.cache)
+    pull = {"number": 8, "merged": True}
+    result = deliver(
+        receiver,
+        "pull_request",
+        {"action": "closed", "pull_request": pull, "repository": REPOSITORY},
+    )
+    assert (result["updated"], result["invalidated"]) == (1, 2)
+    assert api.get_pull_request("octo", "hello", 8) == pull
+    assert api.session.request.call_count == 3
+
+    result = deliver(
+        receiver,
+        "pull_request",
+        {"action": "transferred", "pull_request": pull, "repository": REPOSITORY},
+    )
+    assert result["invalidated"] == 1
+    assert len(api.cache) == 0
+
+
+def test_push_and_workflow_run_drop_stale_responses(api):
+    fill(api, "repos/octo/hello", {"name": "hello"})
+    fill(api, "repos/octo/hello/stats/punch_card", [[0, 0, 1]])
+    fill(api, "repos/octo/hello/issues", [])
+    fill(api, "repos/octo/hello/actions/runs", {"workflow_runs": []})
+    receiver = WebhookReceiver(SECRET, api.cache)
+
+    assert deliver(receiver, "push", {"repository": REPOSITORY})["invalidated"] == 2
+    result = deliver(
+        receiver, "workflow_run", {"action": "completed", "repository": REPOSITORY}
+    )
+    assert result["invalidated"] == 1
+    assert len(api.cache) == 1  # the issue listing
+
+
+def test_other_deliveries_are_ignored(api):
+    receiver = WebhookReceiver(SECRET, api.cache)
+    assert deliver(receiver, "gollum", {"repository": REPOSITORY})["repository"] is None
+    assert receiver.stats()["ignored"] == 1
+    body = b"[1]"
+    with pytest.raises(ValueError):
+        receiver.handle("push", body, sign(SECRET, body))
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"repository": {"name": "hello"}},
+        {"pull_request": {"title": "no number"}, "repository": REPOSITORY},
+    ],
+)
+def test_incomplete_payloads_are_rejected(api, payload):
+    receiver = WebhookReceiver(SECRET, api.cache)
+    with pytest.raises(ValueError):
+        deliver(receiver, "pull_request", payload)
@@ -0,0 +1,297 @@
+"""Columnar views of the ``/stats/*`` payloads for vectorized aggregation.
+
+Each class converts one repository's payload into NumPy arrays indexed by
+week, and ``combine`` rolls many repositories up into one series aligned on
+the union of their weeks. Week bounds (``start``/``end``) are Unix timestamps
+of week starts, as in the payloads, and are inclusive.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+DAYS = ("Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "github_metrics_api.timeseries requires numpy: "
+            "pip install github_metrics_api[timeseries]"
+        )
+
+
+def _window(weeks, start=None, end=None):
+    """Return the slice of the sorted ``weeks`` that falls in [start, end]."""
+    lo = 0 if start is None else int(np.searchsorted(weeks, start, side="left"))
+    hi = len(weeks) if end is None else int(np.searchsorted(weeks, end, side="right"))
+    return slice(lo, hi)
+
+
+def _rolling_mean(values, window, axis=0):
+    """Mean over trailing ``window`` weeks along ``axis`` ('valid' part only)."""
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    values = np.moveaxis(np.asarray(values, dtype=float), axis, -1)
+    if values.shape[-1] < window:
+        means = np.empty(values.shape[:-1] + (0,))
+    else:
+        sums = np.cumsum(values, axis=-1)
+        sums = np.concatenate([np.zeros(values.shape[:-1] + (1,)), sums], axis=-1)
+        means = (sums[..., window:] - sums[..., :-window]) / window
+    return np.moveaxis(means, -1, axis)
+
+
+def _ratio(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    return np.divide(numerator, denominator, out=out, where=denominator != 0)
+
+
+def _align(series):
+    """Return the union of the weeks of ``series`` and each one's positions in it."""
+    weeks = np.unique(np.concatenate([s.weeks for s in series]))
+    return weeks, [np.searchsorted(weeks, s.weeks) for s in series]
+
+
+class _Weekly:
+    """Common behaviour of the per-week series."""
+
+    columns = ()
+    # Axis of the column arrays that runs over weeks.
+    week_axis = 0
+
+    def __len__(self):
+        return len(self.weeks)
+
+    def window_sum(self, column, start=None, end=None):
+        """Return the total of ``column`` over the weeks in [start, end]."""
+        values = getattr(self, column)
+        index = [slice(None)] * values.ndim
+        index[self.week_axis] = _window(self.weeks, start, end)
+        return values[tuple(index)].sum(axis=self.week_axis)
+
+    def rolling_mean(self, column, window):
+        """Return the trailing ``window``-week mean of ``column``.
+
+        The result starts at week ``window - 1``; ``self.weeks[window - 1:]``
+        gives its timestamps.
+        """
+        return _rolling_mean(getattr(self, column), window, self.week_axis)
+
+    @classmethod
+    def combine(cls, series):
+        """Sum several repositories' series, aligned on their weeks."""
+        _require_numpy()
+        series = list(series)
+        if not series:
+            return cls.from_payload([])
+        weeks, positions = _align(series)
+        columns = {}
+        for column in cls.columns:
+            first = getattr(series[0], column)
+            total = np.zeros((len(weeks),) + first.shape[1:], dtype=first.dtype)
+            for item, index in zip(series, positions):
+                np.add.at(total, index, getattr(item, column))
+            columns[column] = total
+        return cls(weeks, **columns)
+
+
+class CommitActivity(_Weekly):
+    """Weekly commit counts from ``get_commit_activity``.
+
+    ``days`` is a ``(weeks, 7)`` matrix of commits per weekday (Sunday
+    first) and ``totals`` the commits per week.
+    """
+
+    columns = ("days",)
+
+    def __init__(self, weeks, days):
+        _require_numpy()
+        self.weeks = np.asarray(weeks, dtype=np.int64)
+        self.days = np.asarray(days, dtype=np.int64).reshape(len(self.weeks), 7)
+
+    @classmethod
+    def from_payload(cls, activity):
+        _require_numpy()
+        activity = activity or []
+        return cls(
+            [week["week"] for week in activity], [week["days"] for week in activity]
+        )
+
+    @property
+    def totals(self):
+        return self.days.sum(axis=1)
+
+    def window_sum(self, column="totals", start=None, end=None):
+        return super().window_sum(column, start, end)
+
+    def rolling_mean(self, column="totals", window=4):
+        return super().rolling_mean(column, window)
+
+    def by_weekday(self, start=None, end=None):
+        """Return the commits per weekday (Sunday first) over [start, end]."""
+        return self.days[_window(self.weeks, start, end)].sum(axis=0)
+
+
+class CodeFrequency(_Weekly):
+    """Weekly additions and deletions from ``get_code_frequency``.
+
+    GitHub reports deletions as negative numbers; here both columns hold
+    line counts, so ``deletions`` is non-negative.
+    """
+
+    columns = ("additions", "deletions")
+
+    def __init__(self, weeks, additions, deletions):
+        _require_numpy()
+        self.weeks = np.asarray(weeks, dtype=np.int64)
+        self.additions = np.asarray(additions, dtype=np.int64)
+        self.deletions = np.abs(np.asarray(deletions, dtype=np.int64))
+
+    @classmethod
+    def from_payload(cls, frequency):
+        _require_numpy()
+        data = np.asarray(frequency or [], dtype=np.int64).reshape(-1, 3)
+        return cls(data[:, 0], data[:, 1], data[:, 2])
+
+    @property
+    def churn(self):
+        """Lines touched per week (additions plus deletions)."""
+        return self.additions + self.deletions
+
+    @property
+    def net(self):
+        return self.additions - self.deletions
+
+    def churn_ratio(self, start=None, end=None):
+        """Return deletions per added line over [start, end] (NaN without additions)."""
+        window = _window(self.weeks, start, end)
+        return float(_ratio(self.deletions[window].sum(), self.additions[window].sum()))
+
+    def weekly_churn_ratio(self):
+        """Return deletions per added line for every week (NaN without additions)."""
+        return _ratio(self.deletions, self.additions)
+
+
+class ContributorStats(_Weekly):
+    """Per-contributor weekly activity from ``get_contributor_stats``.
+
+    ``commits``, ``additions`` and ``deletions`` are ``(contributors, weeks)``
+    matrices; row ``i`` belongs to ``logins[i]``.
+    """
+
+    columns = ("commits", "additions", "deletions")
+    week_axis = 1
+
+    def __init__(self, logins, weeks, commits, additions, deletions):
+        _require_numpy()
+        self.logins = list(logins)
+        self.weeks = np.asarray(weeks, dtype=np.int64)
+        shape = (len(self.logins), len(self.weeks))
+        self.commits = np.asarray(commits, dtype=np.int64).reshape(shape)
+        self.additions = np.asarray(additions, dtype=np.int64).reshape(shape)
+        self.deletions = np.asarray(deletions, dtype=np.int64).reshape(shape)
+
+    @classmethod
+    def from_payload(cls, stats):
+        _require_numpy()
+        stats = stats or []
+        logins = [
+            (contributor.get("author") or {}).get("login") for contributor in stats
+        ]
+        weeks = np.unique(
+            np.array(
+                [week["w"] for contributor in stats for week in contributor["weeks"]],
+                dtype=np.int64,
+            )
+        )
+        shape = (len(stats), len(weeks))
+        matrices = {name: np.zeros(shape, dtype=np.int64) for name in "cad"}
+        for row, contributor in enumerate(stats):
+            index = np.searchsorted(weeks, [week["w"] for week in contributor["weeks"]])
+            for name, matrix in matrices.items():
+                matrix[row, index] = [week[name] for week in contributor["weeks"]]
+        return cls(logins, weeks, matrices["c"], matrices["a"], matrices["d"])
+
+    @property
+    def totals(self):
+        """Commits per contributor."""
+        return self.commits.sum(axis=1)
+
+    def top(self, n=10, column="commits", start=None, end=None):
+        """Return the ``n`` contributors with most ``column`` over [start, end].
+
+        Returns ``(login, value)`` pairs, largest first.
+        """
+        values = self.window_sum(column, start, end)
+        order = np.argsort(-values, kind="stable")[:n]
+        return [(self.logins[i], int(values[i])) for i in order]
+
+    def churn_ratio(self, start=None, end=None):
+        """Return deletions per added line for each contributor over [start, end]."""
+        return _ratio(
+            self.window_sum("deletions", start, end),
+            self.window_sum("additions", start, end),
+        )
+
+    @classmethod
+    def combine(cls, series):
+        """Sum several repositories' stats by login, aligned on their weeks."""
+        _require_numpy()
+        series = list(series)
+        if not series:
+            return cls.from_payload([])
+        weeks, positions = _align(series)
+        logins = list(dict.fromkeys(login for s in series for login in s.logins))
+        rows = {login: row for row, login in enumerate(logins)}
+        columns = {}
+        for column in cls.columns:
+            total = np.zeros((len(logins), len(weeks)), dtype=np.int64)
+            for item, index in zip(series, positions):
+                row_index = [rows[login] for login in item.logins]
+                np.add.at(total, np.ix_(row_index, index), getattr(item, column))
+            columns[column] = total
+        return cls(logins, weeks, **columns)
+
+
+class PunchCard:
+    """Commits per weekday and hour from ``get_punch_card`` as a 7x24 matrix.
+
+    Rows are weekdays (Sunday first) and columns hours (UTC).
+    """
+
+    def __init__(self, matrix):
+        _require_numpy()
+        self.matrix = np.asarray(matrix, dtype=np.int64).reshape(7, 24)
+
+    @classmethod
+    def from_payload(cls, punch_card):
+        _require_numpy()
+        matrix = np.zeros((7, 24), dtype=np.int64)
+        data = np.asarray(punch_card or [], dtype=np.int64).reshape(-1, 3)
+        np.add.at(matrix, (data[:, 0], data[:, 1]), data[:, 2])
+        return cls(matrix)
+
+    @classmethod
+    def combine(cls, cards):
+        """Sum the punch cards of several repositories."""
+        _require_numpy()
+        matrices = [card.matrix for card in cards]
+        if not matrices:
+            return cls(np.zeros((7, 24), dtype=np.int64))
+        return cls(np.sum(matrices, axis=0))
+
+    def by_weekday(self):
+        return self.matrix.sum(axis=1)
+
+    def by_hour(self):
+        return self.matrix.sum(axis=0)
+
+    def busiest(self, n=5):
+        """Return the ``n`` busiest ``(weekday, hour, commits)`` slots."""
+        flat = self.matrix.ravel()
+        order = np.argsort(-flat, kind="stable")[:n]
+        return [(DAYS[i // 24], int(i % 24), int(flat[i])) for i in order]
@@ -0,0 +1,131 @@
+import threading
+import time
+
+from .errors import AuthenticationError, RateLimitExceededError
+
+
+class Credential:
+    """One access token of a :class:`TokenPool` and its known quota."""
+
+    def __init__(self, token, key):
+        self.token = token
+        self.key = key
+        self.headers = {"Authorization": f"token {token}"}
+        self.invalid = False
+        self.requests = 0
+        # resource -> [remaining, reset]
+        self.quota = {}
+        # resource -> time until which the credential is benched
+        self.benched_until = {}
+
+    def __repr__(self):
+        return f"Credential({self.key!r})"
+
+
+class TokenPool:
+    """Spreads requests across several access tokens.
+
+    Each request is sent with the credential that has the most remaining
+    quota for its resource (credentials whose quota is still unknown are
+    tried first). A credential is benched until its reset when its quota is
+    exhausted, and for good when GitHub rejects it with 401.
+    """
+
+    def __init__(self, tokens, clock=time.time):
+        self.credentials = [
+            Credential(token, f"token{index}") for index, token in enumerate(tokens)
+        ]
+        if not self.credentials:
+            raise ValueError("TokenPool needs at least one token")
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def acquire(self, resource="core"):
+        """Return the credential to use for the next request on ``resource``."""
+        with self._lock:
+            now = self.clock()
+            best, best_remaining = None, -1
+            for credential in self.credentials:
+                if credential.invalid:
+                    continue
+                if credential.benched_until.get(resource, 0) > now:
+                    continue
+                remaining, reset = credential.quota.get(resource, (None, None))
+                if remaining is None or reset <= now:
+                    remaining = float("inf")
+                if remaining > best_remaining:
+                    best, best_remaining = credential, remaining
+            if best is None:
+                if all(credential.invalid for credential in self.credentials):
+                    raise AuthenticationError("All GitHub tokens were rejected")
+                raise RateLimitExceededError(
+                    "GitHub API rate limit exceeded for every token"
+                )
+            quota = best.quota.get(resource)
+            if quota is not None and quota[0] > 0:
+                quota[0] -= 1
+            best.requests += 1
+            return best
+
+    def update(self, credential, headers, resource="core"):
+        """Feed the ``X-RateLimit-*`` headers of a response into ``credential``."""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        resource = headers.get("X-RateLimit-Resource") or resource
+        with self._lock:
+            credential.quota[resource] = [
+                int(headers["X-RateLimit-Remaining"]),
+                float(headers.get("X-RateLimit-Reset", 0)),
+            ]
+
+    def bench(self, credential, resource="core"):
+        """Take ``credential`` out of rotation until its quota resets."""
+        with self._lock:
+            now = self.clock()
+            reset = credential.quota.get(resource, (0, 0))[1]
+            # Without a known reset time, try again after GitHub's hour window.
+            credential.benched_until[resource] = (
+                max(reset, now + 1) if reset else now + 3600
+            )
+
+    def revoke(self, credential):
+        """Take ``credential`` out of rotation for good (e.g. after a 401)."""
+        with self._lock:
+            credential.invalid = True
+
+    def reset_delay(self, resource="core"):
+        """Return the seconds until the first benched credential is usable."""
+        with self._lock:
+            now = self.clock()
+            resets = [
+                credential.benched_until.get(resource, now)
+                for credential in self.credentials
+                if not credential.invalid
+            ]
+            if not resets:
+                raise AuthenticationError("All GitHub tokens were rejected")
+            return max(min(resets) - now, 0.0) + 1.0
+
+    def stats(self):
+        """Return the known quota and state of every credential."""
+        with self._lock:
+            now = self.clock()
+            return {
+                credential.key: {
+                    "requests": credential.requests,
+                    "invalid": credential.invalid,
+                    "benched": sorted(
+                        resource
+                        for resource, until in credential.benched_until.items()
+                        if until > now
+                    ),
+                    "remaining": {
+                        resource: quota[0]
+                        for resource, quota in credential.quota.items()
+                    },
+                }
+                for credential in self.credentials
+            }
@@ -0,0 +1,611 @@
+import json
+import sqlite3
+import threading
+import time
+from itertools import islice
+
+import requests
+
+from .errors import GitHubAPIError, NotFoundError
+
+# Rows written per executemany call; a whole store_* call is one transaction.
+BATCH_SIZE = 500
+
+# Resources fetched by :meth:`Warehouse.ingest`, by default all of them.
+RESOURCES = (
+    "repo",
+    "languages",
+    "issues",
+    "pulls",
+    "commits",
+    "commit_activity",
+    "code_frequency",
+    "contributor_stats",
+    "weekly_commits",
+    "punch_card",
+)
+
+STATS_RESOURCES = {
+    "commit_activity": "get_commit_activity",
+    "code_frequency": "get_code_frequency",
+    "contributor_stats": "get_contributor_stats",
+    "weekly_commits": "get_weekly_commits",
+    "punch_card": "get_punch_card",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    name TEXT NOT NULL COLLATE NOCASE,
+    id INTEGER,
+    full_name TEXT,
+    description TEXT,
+    language TEXT,
+    stargazers_count INTEGER,
+    forks_count INTEGER,
+    open_issues_count INTEGER,
+    watchers_count INTEGER,
+    subscribers_count INTEGER,
+    created_at TEXT,
+    updated_at TEXT,
+    pushed_at TEXT,
+    PRIMARY KEY (owner, name)
+);
+CREATE TABLE IF NOT EXISTS languages (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    language TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    PRIMARY KEY (owner, repo, language)
+);
+CREATE TABLE IF NOT EXISTS issues (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    number INTEGER NOT NULL,
+    id INTEGER,
+    title TEXT,
+    state TEXT,
+    user_login TEXT,
+    comments INTEGER,
+    is_pull_request INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT,
+    closed_at TEXT,
+    PRIMARY KEY (owner, repo, number)
+);
+CREATE INDEX IF NOT EXISTS issues_state ON issues (owner, repo, state, created_at);
+CREATE TABLE IF NOT EXISTS pull_requests (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    number INTEGER NOT NULL,
+    id INTEGER,
+    title TEXT,
+    state TEXT,
+    user_login TEXT,
+    draft INTEGER,
+    created_at TEXT,
+    updated_at TEXT,
+    closed_at TEXT,
+    merged_at TEXT,
+    PRIMARY KEY (owner, repo, number)
+);
+CREATE INDEX IF NOT EXISTS pull_requests_state
+    ON pull_requests (owner, repo, state, created_at);
+CREATE TABLE IF NOT EXISTS commits (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    sha TEXT NOT NULL,
+    message TEXT,
+    author_login TEXT,
+    author_name TEXT,
+    author_email TEXT,
+    authored_at TEXT,
+    committed_at TEXT,
+    PRIMARY KEY (owner, repo, sha)
+);
+CREATE INDEX IF NOT EXISTS commits_date ON commits (owner, repo, committed_at);
+CREATE TABLE IF NOT EXISTS commit_activity (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    week INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    days TEXT NOT NULL,
+    PRIMARY KEY (owner, repo, week)
+);
+CREATE TABLE IF NOT EXISTS code_frequency (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    week INTEGER NOT NULL,
+    additions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL,
+    PRIMARY KEY (owner, repo, week)
+);
+CREATE TABLE IF NOT EXISTS contributor_weeks (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    login TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    commits INTEGER NOT NULL,
+    additions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL,
+    PRIMARY KEY (owner, repo, login, week)
+);
+CREATE TABLE IF NOT EXISTS participation (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    position INTEGER NOT NULL,
+    all_commits INTEGER NOT NULL,
+    owner_commits INTEGER NOT NULL,
+    PRIMARY KEY (owner, repo, position)
+);
+CREATE TABLE IF NOT EXISTS punch_card (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    day INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    commits INTEGER NOT NULL,
+    PRIMARY KEY (owner, repo, day, hour)
+);
+CREATE TABLE IF NOT EXISTS fetches (
+    owner TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL COLLATE NOCASE,
+    resource TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (owner, repo, resource)
+);
+"""
+
+
+def _login(user):
+    return user["login"] if user else None
+
+
+def _message(error):
+    return getattr(error, "message", None) or str(error)
+
+
+class Warehouse:
+    """Local SQLite store of normalized API results.
+
+    ``store_*`` methods upsert decoded payloads in one transaction each;
+    :meth:`ingest` fetches a repository's data through an API client and
+    stores it. The read methods mirror :class:`GitHubMetricsAPI` (same
+    names and result shapes), so a warehouse can answer the same queries
+    offline. Data that was never stored raises :class:`NotFoundError`.
+    """
+
+    def __init__(self, path=":memory:", clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock, self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, name):
+        # API methods without an offline counterpart fail like API errors.
+        if name.startswith(("get_", "list_", "search_")):
+
+            def unavailable(*args, **kwargs):
+                raise GitHubAPIError(
+                    f"{name} is not available from the warehouse", code="NOT_STORED"
+                )
+
+            return unavailable
+        raise AttributeError(name)
+
+    # Writing
+    def _write(self, owner, repo, resource, sql, rows, replace=None):
+        """Upsert ``rows`` in batches within one transaction; return the count.
+
+        ``rows`` may be lazy (e.g. built from ``iter_*`` pages), so they are
+        read in full before the lock and the write transaction are taken.
+        """
+        rows = iter(rows)
+        batches = []
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            batches.append(batch)
+        count = 0
+        with self._lock, self.conn:
+            if replace is not None:
+                self.conn.execute(
+                    f"DELETE FROM {replace} WHERE owner = ? AND repo = ?", (owner, repo)
+                )
+            for batch in batches:
+                self.conn.executemany(sql, batch)
+                count += len(batch)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO fetches VALUES (?, ?, ?, ?)",
+                (owner, repo, resource, self.clock()),
+            )
+        return count
+
+    def store_repo(self, owner, repo, data):
+        row = (
+            owner,
+            repo,
+            data.get("id"),
+            data.get("full_name"),
+            data.get("description"),
+            data.get("language"),
+            data.get("stargazers_count"),
+            data.get("forks_count"),
+            data.get("open_issues_count"),
+            data.get("watchers_count"),
+            data.get("subscribers_count"),
+            data.get("created_at"),
+            data.get("updated_at"),
+            data.get("pushed_at"),
+        )
+        sql = f"INSERT OR REPLACE INTO repos VALUES ({', '.join('?' * len(row))})"
+        return self._write(owner, repo, "repo", sql, [row])
+
+    def store_languages(self, owner, repo, languages):
+        rows = ((owner, repo, name, size) for name, size in languages.items())
+        sql = "INSERT INTO languages VALUES (?, ?, ?, ?)"
+        return self._write(owner, repo, "languages", sql, rows, replace="languages")
+
+    def store_issues(self, owner, repo, issues):
+        rows = (
+            (
+                owner,
+                repo,
+                issue["number"],
+                issue.get("id"),
+                issue.get("title"),
+                issue.get("state"),
+                _login(issue.get("user")),
+                issue.get("comments"),
+                int(issue.get("pull_request") is not None),
+                issue.get("created_at"),
+                issue.get("updated_at"),
+                issue.get("closed_at"),
+            )
+            for issue in issues
+        )
+        sql = (
+            "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        return self._write(owner, repo, "issues", sql, rows)
+
+    def store_pull_requests(self, owner, repo, pulls):
+        rows = (
+            (
+                owner,
+                repo,
+                pull["number"],
+                pull.get("id"),
+                pull.get("title"),
+                pull.get("state"),
+                _login(pull.get("user")),
+                pull.get("draft"),
+                pull.get("created_at"),
+                pull.get("updated_at"),
+                pull.get("closed_at"),
+                pull.get("merged_at"),
+            )
+            for pull in pulls
+        )
+        sql = (
+            "INSERT OR REPLACE INTO pull_requests "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        return self._write(owner, repo, "pulls", sql, rows)
+
+    def store_commits(self, owner, repo, commits):
+        def row(commit):
+            git = commit.get("commit") or {}
+            author = git.get("author") or {}
+            committer = git.get("committer") or {}
+            return (
+                owner,
+                repo,
+                commit["sha"],
+                git.get("message"),
+                _login(commit.get("author")),
+                author.get("name"),
+                author.get("email"),
+                author.get("date"),
+                committer.get("date"),
+            )
+
+        sql = "INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        return self._write(owner, repo, "commits", sql, map(row, commits))
+
+    def store_commit_activity(self, owner, repo, activity):
+        rows = (
+            (owner, repo, week["week"], week["total"], json.dumps(week["days"]))
+            for week in activity or []
+        )
+        sql = "INSERT OR REPLACE INTO commit_activity VALUES (?, ?, ?, ?, ?)"
+        return self._write(owner, repo, "commit_activity", sql, rows)
+
+    def store_code_frequency(self, owner, repo, frequency):
+        rows = (
+            (owner, repo, week, additions, abs(deletions))
+            for week, additions, deletions in frequency or []
+        )
+        sql = "INSERT OR REPLACE INTO code_frequency VALUES (?, ?, ?, ?, ?)"
+        return self._write(owner, repo, "code_frequency", sql, rows)
+
+    def store_contributor_stats(self, owner, repo, stats):
+        rows = (
+            (owner, repo, _login(c.get("author")), w["w"], w["c"], w["a"], w["d"])
+            for c in stats or []
+            if c.get("author")
+            for w in c["weeks"]
+        )
+        sql = "INSERT OR REPLACE INTO contributor_weeks VALUES (?, ?, ?, ?, ?, ?, ?)"
+        return self._write(owner, repo, "contributor_stats", sql, rows)
+
+    def store_weekly_commits(self, owner, repo, participation):
+        participation = participation or {"all": [], "owner": []}
+        rows = (
+            (owner, repo, position, total, own)
+            for position, (total, own) in enumerate(
+                zip(participation["all"], participation["owner"])
+            )
+        )
+        sql = "INSERT INTO participation VALUES (?, ?, ?, ?, ?)"
+        return self._write(
+            owner, repo, "weekly_commits", sql, rows, replace="participation"
+        )
+
+    def store_punch_card(self, owner, repo, punch_card):
+        rows = (
+            (owner, repo, day, hour, count) for day, hour, count in punch_card or []
+        )
+        sql = "INSERT OR REPLACE INTO punch_card VALUES (?, ?, ?, ?, ?)"
+        return self._write(owner, repo, "punch_card", sql, rows)
+
+    def ingest(self, api, owner, repo, resources=RESOURCES, max_items=None):
+        """Fetch ``resources`` of ``owner/repo`` through ``api`` and store them.
+
+        Issues, pull requests and commits are paged through (up to
+        ``max_items`` each); statistics still being computed are polled with
+        ``api.warm_stats``. Returns the number of rows stored per resource
+        and the error message of each resource that could not be fetched; a
+        failed resource keeps its previously stored rows.
+        """
+        stored, errors = {}, {}
+        fetchers = {
+            "repo": lambda: self.store_repo(owner, repo, api.get_repo(owner, repo)),
+            "languages": lambda: self.store_languages(
+                owner, repo, api.list_repo_languages(owner, repo)
+            ),
+            "issues": lambda: self.store_issues(
+                owner,
+                repo,
+                api.iter_repo_issues(owner, repo, state="all", max_items=max_items),
+            ),
+            "pulls": lambda: self.store_pull_requests(
+                owner,
+                repo,
+                api.iter_pull_requests(owner, repo, state="all", max_items=max_items),
+            ),
+            "commits": lambda: self.store_commits(
+                owner, repo, api.iter_commits(owner, repo, max_items=max_items)
+            ),
+        }
+        for resource in resources:
+            if resource not in fetchers:
+                continue
+            try:
+                stored[resource] = fetchers[resource]()
+            except (GitHubAPIError, requests.RequestException) as e:
+                errors[resource] = _message(e)
+
+        stats = {STATS_RESOURCES[r]: r for r in resources if r in STATS_RESOURCES}
+        if stats:
+            for result in api.warm_stats([(owner, repo)], stats=tuple(stats)):
+                resource = stats[result.call[2]]
+                if result.error is not None:
+                    errors[resource] = _message(result.error)
+                else:
+                    store = getattr(self, f"store_{resource}")
+                    stored[resource] = store(owner, repo, result.value)
+        return {"stored": stored, "errors": errors}
+
+    # Reading
+    def _query(self, sql, params):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _require(self, owner, repo, resource):
+        rows = self._query(
+            "SELECT 1 FROM fetches WHERE owner = ? AND repo = ? AND resource = ?",
+            (owner, repo, resource),
+        )
+        if not rows:
+            raise NotFoundError(f"No {resource} stored for {owner}/{repo}")
+
+    def fetched_at(self, owner, repo):
+        """Return when each resource of ``owner/repo`` was last stored."""
+        rows = self._query(
+            "SELECT resource, fetched_at FROM fetches WHERE owner = ? AND repo = ?",
+            (owner, repo),
+        )
+        return {row["resource"]: row["fetched_at"] for row in rows}
+
+    def get_repo(self, owner, repo):
+        rows = self._query(
+            "SELECT * FROM repos WHERE owner = ? AND name = ?", (owner, repo)
+        )
+        if not rows:
+            raise NotFoundError(f"No repo stored for {owner}/{repo}")
+        data = dict(rows[0])
+        data["owner"] = {"login": data["owner"]}
+        return data
+
+    def get_repo_stats(self, owner, repo):
+        data = self.get_repo(owner, repo)
+        return {
+            "stars": data["stargazers_count"],
+            "forks": data["forks_count"],
+            "open_issues": data["open_issues_count"],
+            "watchers": data["subscribers_count"],
+        }
+
+    def list_repo_languages(self, owner, repo):
+        self._require(owner, repo, "languages")
+        rows = self._query(
+            "SELECT language, bytes FROM languages WHERE owner = ? AND repo = ? "
+            "ORDER BY bytes DESC",
+            (owner, repo),
+        )
+        return {row["language"]: row["bytes"] for row in rows}
+
+    def list_repo_issues(self, owner, repo, state="open"):
+        self._require(owner, repo, "issues")
+        rows = self._query(
+            "SELECT * FROM issues WHERE owner = ? AND repo = ? "
+            "AND (? = 'all' OR state = ?) ORDER BY created_at DESC, number DESC",
+            (owner, repo, state, state),
+        )
+        issues = []
+        for row in rows:
+            issue = {
+                key: row[key]
+                for key in (
+                    "id",
+                    "number",
+                    "title",
+                    "state",
+                    "comments",
+                    "created_at",
+                    "updated_at",
+                    "closed_at",
+                )
+            }
+            issue["user"] = {"login": row["user_login"]}
+            if row["is_pull_request"]:
+                issue["pull_request"] = {}
+            issues.append(issue)
+        return issues
+
+    def list_pull_requests(self, owner, repo, state="open"):
+        self._require(owner, repo, "pulls")
+        rows = self._query(
+            "SELECT * FROM pull_requests WHERE owner = ? AND repo = ? "
+            "AND (? = 'all' OR state = ?) ORDER BY created_at DESC, number DESC",
+            (owner, repo, state, state),
+        )
+        pulls = []
+        for row in rows:
+            pull = dict(row)
+            del pull["owner"], pull["repo"]
+            pull["draft"] = bool(pull["draft"])
+            pull["user"] = {"login": pull.pop("user_login")}
+            pulls.append(pull)
+        return pulls
+
+    def list_commits(self, owner, repo, since=None):
+        self._require(owner, repo, "commits")
+        rows = self._query(
+            "SELECT * FROM commits WHERE owner = ? AND repo = ? "
+            "AND (? IS NULL OR committed_at >= ?) ORDER BY committed_at DESC",
+            (owner, repo, since, since),
+        )
+        return [
+            {
+                "sha": row["sha"],
+                "commit": {
+                    "message": row["message"],
+                    "author": {
+                        "name": row["author_name"],
+                        "email": row["author_email"],
+                        "date": row["authored_at"],
+                    },
+                    "committer": {"date": row["committed_at"]},
+                },
+                "author": (
+                    {"login": row["author_login"]} if row["author_login"] else None
+                ),
+            }
+            for row in rows
+        ]
+
+    def get_commit_activity(self, owner, repo):
+        """Return the last 52 stored weeks, as GitHub does."""
+        self._require(owner, repo, "commit_activity")
+        rows = self._query(
+            "SELECT week, total, days FROM commit_activity WHERE owner = ? AND repo = ? "
+            "ORDER BY week DESC LIMIT 52",
+            (owner, repo),
+        )
+        return [
+            {
+                "days": json.loads(row["days"]),
+                "total": row["total"],
+                "week": row["week"],
+            }
+            for row in reversed(rows)
+        ]
+
+    def get_code_frequency(self, owner, repo):
+        self._require(owner, repo, "code_frequency")
+        rows = self._query(
+            "SELECT week, additions, deletions FROM code_frequency "
+            "WHERE owner = ? AND repo = ? ORDER BY week",
+            (owner, repo),
+        )
+        return [[row["week"], row["additions"], -row["deletions"]] for row in rows]
+
+    def get_contributor_stats(self, owner, repo):
+        self._require(owner, repo, "contributor_stats")
+        rows = self._query(
+            "SELECT login, week, commits, additions, deletions FROM contributor_weeks "
+            "WHERE owner = ? AND repo = ? ORDER BY login, week",
+            (owner, repo),
+        )
+        stats = {}
+        for row in rows:
+            contributor = stats.setdefault(
+                row["login"],
+                {"author": {"login": row["login"]}, "total": 0, "weeks": []},
+            )
+            contributor["total"] += row["commits"]
+            contributor["weeks"].append(
+                {
+                    "w": row["week"],
+                    "a": row["additions"],
+                    "d": row["deletions"],
+                    "c": row["commits"],
+                }
+            )
+        # GitHub lists contributors by ascending total commits.
+        return sorted(stats.values(), key=lambda contributor: contributor["total"])
+
+    def get_weekly_commits(self, owner, repo):
+        self._require(owner, repo, "weekly_commits")
+        rows = self._query(
+            "SELECT all_commits, owner_commits FROM participation "
+            "WHERE owner = ? AND repo = ? ORDER BY position",
+            (owner, repo),
+        )
+        return {
+            "all": [row["all_commits"] for row in rows],
+            "owner": [row["owner_commits"] for row in rows],
+        }
+
+    def get_punch_card(self, owner, repo):
+        self._require(owner, repo, "punch_card")
+        rows = self._query(
+            "SELECT day, hour, commits FROM punch_card WHERE owner = ? AND repo = ? "
+            "ORDER BY day, hour",
+            (owner, repo),
+        )
+        return [[row["day"], row["hour"], row["commits"]] for row in rows]
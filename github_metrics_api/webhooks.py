@@ -0,0 +1,164 @@
+import hashlib
+import hmac
+import json
+import threading
+
+from .errors import InvalidSignatureError
+
+# Repository counters that webhook payloads carry in their ``repository``.
+REPO_COUNTS = ("stargazers_count", "watchers_count", "forks_count", "open_issues_count")
+
+STATS_TEMPLATES = {
+    "repos/{owner}/{repo}/stats/commit_activity",
+    "repos/{owner}/{repo}/stats/code_frequency",
+    "repos/{owner}/{repo}/stats/contributors",
+    "repos/{owner}/{repo}/stats/participation",
+    "repos/{owner}/{repo}/stats/punch_card",
+}
+
+# Endpoint families made stale by each event. Repository counters and single
+# issues and pull requests are updated in place instead (see handle).
+STALE_TEMPLATES = {
+    "push": {
+        "repos/{owner}/{repo}",
+        "repos/{owner}/{repo}/commits",
+        "repos/{owner}/{repo}/contributors",
+        "repos/{owner}/{repo}/languages",
+        "repos/{owner}/{repo}/readme",
+        "repos/{owner}/{repo}/pulls",
+    }
+    | STATS_TEMPLATES,
+    "issues": {"repos/{owner}/{repo}/issues"},
+    "pull_request": {
+        "repos/{owner}/{repo}/pulls",
+        "repos/{owner}/{repo}/issues",
+    },
+    "workflow_run": {"repos/{owner}/{repo}/actions/runs"},
+    "star": set(),
+    "watch": set(),
+    "fork": set(),
+}
+
+# Payload key and endpoint of the single item an event describes. Single
+# issues are never fetched by the client, so only pull requests are cached.
+ITEM_KEYS = {"pull_request": "pull_request"}
+ITEM_TEMPLATES = {"pull_request": "repos/{owner}/{repo}/pulls/{pull_number}"}
+
+
+def sign(secret, body):
+    """Return the ``X-Hub-Signature-256`` value GitHub sends for ``body``."""
+    if isinstance(secret, str):
+        secret = secret.encode()
+    return "sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+def _replace_body(body):
+    # Values are shared between callers, so swap in a new page.
+    return lambda page: page._replace(body=body)
+
+
+def _update_counts(counts):
+    return lambda page: page._replace(body={**page.body, **counts})
+
+
+class WebhookReceiver:
+    """Keep a :class:`~github_metrics_api.cache.ResponseCache` fresh from webhooks.
+
+    Each delivery is verified against the webhook ``secret`` with the
+    ``X-Hub-Signature-256`` HMAC. Then it updates the cache:
+
+    - Repository counters (stars, watchers, forks, open issues) in cached
+      repository responses are refreshed in place from the payload.
+    - A cached pull request is replaced by the payload's.
+    - Responses the event makes stale are dropped (see ``STALE_TEMPLATES``).
+
+    This way polling can be reduced to an occasional safety sweep.
+    """
+
+    def __init__(self, secret, cache):
+        if not secret:
+            raise ValueError("a webhook secret is required")
+        self.secret = secret.encode() if isinstance(secret, str) else secret
+        self.cache = cache
+        self._lock = threading.Lock()
+        self.deliveries = 0
+        self.rejected = 0
+        self.ignored = 0
+        self.invalidated = 0
+        self.updated = 0
+
+    def verify(self, body, signature):
+        """Raise InvalidSignatureError unless ``signature`` signs ``body``."""
+        if not signature or not hmac.compare_digest(sign(self.secret, body), signature):
+            with self._lock:
+                self.rejected += 1
+            raise InvalidSignatureError()
+
+    def handle(self, event, body, signature):
+        """Verify and apply one delivery; return what it changed as a dict.
+
+        ``event`` is the ``X-GitHub-Event`` header, ``body`` the raw request
+        body (bytes) and ``signature`` the ``X-Hub-Signature-256`` header.
+        Raises ValueError for a body that is not a JSON object or lacks the
+        fields the event needs.
+        """
+        self.verify(body, signature)
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("webhook payload must be a JSON object")
+        result = {
+            "event": event,
+            "action": payload.get("action"),
+            "repository": None,
+            "invalidated": 0,
+            "updated": 0,
+        }
+        repository = payload.get("repository")
+        if event not in STALE_TEMPLATES or not isinstance(repository, dict):
+            with self._lock:
+                self.deliveries += 1
+                self.ignored += 1
+            return result
+
+        full_name = repository.get("full_name")
+        if not isinstance(full_name, str) or "/" not in full_name:
+            raise ValueError("webhook repository has no full_name")
+        owner, repo = full_name.split("/", 1)
+        base = f"repos/{owner}/{repo}"
+        result["repository"] = f"{owner}/{repo}"
+        updated = invalidated = 0
+
+        if event != "push":
+            counts = {key: repository[key] for key in REPO_COUNTS if key in repository}
+            if counts:
+                updated += self.cache.update(base, _update_counts(counts))
+        item = payload.get(ITEM_KEYS.get(event))
+        if isinstance(item, dict):
+            template = ITEM_TEMPLATES[event]
+            if payload.get("action") in ("deleted", "transferred"):
+                invalidated += self.cache.invalidate(owner, repo, {template})
+            else:
+                number = item.get("number")
+                if number is None:
+                    raise ValueError(f"webhook {ITEM_KEYS[event]} has no number")
+                endpoint = template.format(owner=owner, repo=repo, pull_number=number)
+                updated += self.cache.update(endpoint, _replace_body(item))
+        invalidated += self.cache.invalidate(owner, repo, STALE_TEMPLATES[event])
+
+        result["updated"], result["invalidated"] = updated, invalidated
+        with self._lock:
+            self.deliveries += 1
+            self.updated += updated
+            self.invalidated += invalidated
+        return result
+
+    def stats(self):
+        """Return delivery, rejection and cache change counters as a dict."""
+        with self._lock:
+            return {
+                "deliveries": self.deliveries,
+                "rejected": self.rejected,
+                "ignored": self.ignored,
+                "invalidated": self.invalidated,
+                "updated": self.updated,
+            }
@@ -19,16 +19,19 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=[
         "requests>=2.25.1",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.7"],
+        "timeseries": ["numpy>=1.17"],
+    },
     entry_points={
         "console_scripts": [
             "github-metrics=github_metrics_api.cli:main",